@@ -0,0 +1,109 @@
+"""
+Full-year advance tax benchmark for the 44ADA installment scheduler.
+
+Generates a year of invoices for many contractors (each bills monthly on
+its own day of the month, some partly in cash), streams them in date
+order through ``AdvanceTaxScheduler`` with the standard four due dates
+and reports throughput and peak memory. The invoices are generated lazily,
+so memory grows with contractors, not invoices. With ``--projection
+to-date`` every sampled estimate must equal the paise backend's
+``calculate_freelancer_tax`` on the receipts booked so far; in every
+mode installments must add up to what each contractor has paid.
+
+Usage:
+    python -m benchmarks.advance_tax_year --contractors 200000
+"""
+import argparse
+import random
+import resource
+import sys
+import time
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+from benchmarks.distributions import freelancer_receipts_lakhs
+from calculator.advance_tax import (AdvanceTaxScheduler, InstallmentSchedule, Invoice, LimitCrossing,
+                                    Projection)
+from calculator.engine import TaxRegime
+from calculator.money import lakhs_to_paise
+
+FISCAL_YEAR = 2024
+BILLING_DAYS = 28
+# Sampling stride of the estimate check
+CHECK_EVERY = 50
+
+
+def invoice_stream(contractors: int, seed: int = 29) -> Iterator[Invoice]:
+    """Yield a date-ordered year of monthly invoices for a synthetic contractor pool."""
+    annual = [lakhs_to_paise(amount) for amount in freelancer_receipts_lakhs(contractors, seed)]
+    generator = random.Random(seed)
+    regimes = [TaxRegime.OLD if generator.random() < 0.2 else TaxRegime.NEW for _ in range(contractors)]
+    cash_share = [0.1 if generator.random() < 0.1 else 0.0 for _ in range(contractors)]
+    by_day: list[list[int]] = [[] for _ in range(BILLING_DAYS)]
+    for index in range(contractors):
+        by_day[generator.randrange(BILLING_DAYS)].append(index)
+
+    for month in range(12):
+        first = date(FISCAL_YEAR + (month >= 9), (month + 3) % 12 + 1, 1)
+        for day, indices in enumerate(by_day):
+            invoice_date = first + timedelta(days=day)
+            for index in indices:
+                amount = int(annual[index] / 12 * generator.uniform(0.6, 1.4))
+                yield Invoice(f"C{index}", invoice_date, amount, generator.random() < cash_share[index],
+                              regimes[index] if month == 0 else None)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns 1 when an estimate or a running total is wrong."""
+    parser = argparse.ArgumentParser(description="Time a year of 44ADA invoices through the advance tax "
+                                                 "scheduler.")
+    parser.add_argument("--contractors", type=int, default=200_000)
+    parser.add_argument("--projection", choices=[projection.value for projection in Projection],
+                        default=Projection.TO_DATE.value)
+    args = parser.parse_args(argv)
+
+    to_date = args.projection == Projection.TO_DATE.value
+    scheduler = AdvanceTaxScheduler(schedule=InstallmentSchedule.STANDARD,
+                                    projection=Projection(args.projection), fiscal_year=FISCAL_YEAR)
+    paise = scheduler.engine.paise
+    failures: list[str] = []
+    installments = crossings = invoices = 0
+    paid: dict[str, int] = {}
+
+    def count(stream: Iterator[Invoice]) -> Iterator[Invoice]:
+        nonlocal invoices
+        for invoice in stream:
+            invoices += 1
+            yield invoice
+
+    started = time.perf_counter()
+    for notice in scheduler.process_log(count(invoice_stream(args.contractors))):
+        if isinstance(notice, LimitCrossing):
+            crossings += 1
+            continue
+        installments += 1
+        paid[notice.contractor_id] = paid.get(notice.contractor_id, 0) + notice.installment_paise
+        if paid[notice.contractor_id] != notice.paid_paise:
+            failures.append(f"{notice.contractor_id}: installments do not add up to {notice.paid_paise}")
+        if to_date and installments % CHECK_EVERY == 0:
+            expected = paise.calculate_freelancer_tax(notice.receipts_paise, notice.regime)["tax"]
+            if expected != notice.estimated_tax_paise:
+                failures.append(f"{notice.contractor_id} on {notice.due_date}: estimate "
+                                f"{notice.estimated_tax_paise}, calculate_freelancer_tax {expected}")
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"Contractors: {scheduler.contractor_count:,}  Invoices: {invoices:,}  "
+          f"Installments: {installments:,}  Limit crossings: {crossings:,}")
+    print(f"Elapsed: {elapsed:.2f}s  Rate: {invoices / elapsed:,.0f} invoices/s  Peak RSS: {peak_mb:,.0f} MB")
+
+    if failures:
+        print(f"❌ {len(failures)} check(s) failed, first: {failures[0]}")
+        return 1
+    checked = " and sampled estimates match calculate_freelancer_tax" if to_date else ""
+    print(f"✅ Installments add up to what each contractor paid{checked}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
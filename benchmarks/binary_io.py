@@ -0,0 +1,86 @@
+"""
+End-to-end throughput of CSV versus memory-mapped binary payroll files.
+
+Generates a synthetic payroll as a binary column file, converts it to CSV,
+then times both pipelines from input file to output file: the CSV batch
+runner (parse text, calculate, format text) and the binary runner (map
+columns, calculate through the paise batch path, write columns).
+
+Usage:
+    python -m benchmarks.binary_io --rows 50000000
+    python -m benchmarks.binary_io --rows 1000000 --keep /tmp/payroll
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from calculator.batch import BatchMode, process_stream
+from calculator.binary import CHUNK_ROWS, REGIME_CODES, payroll_writer, process_binary, write_csv
+from calculator.engine import TaxEngine, TaxRegime
+
+
+def generate_payroll(path: str, rows: int, seed: int = 42) -> None:
+    """Write a synthetic salary payroll file with a log-normal-ish income spread."""
+    generator = random.Random(seed)
+    with open(path, "wb") as stream, payroll_writer(stream) as writer:
+        for start in range(0, rows, CHUNK_ROWS):
+            count = min(CHUNK_ROWS, rows - start)
+            # Whole paise of a two-decimal amount in lakhs, as in benchmarks.parallel_scaling
+            gross = [int(min(999.0, round(generator.lognormvariate(2.5, 0.7), 2)) * 100) * 100_000
+                     for _ in range(count)]
+            regimes = [REGIME_CODES[TaxRegime.OLD if generator.random() < 0.3 else TaxRegime.NEW]
+                       for _ in range(count)]
+            writer.extend([range(start, start + count), gross, regimes, bytes(count)])
+
+
+def _megabytes(path: str) -> float:
+    """ :return file size in MB """
+    return os.path.getsize(path) / 1e6
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run both pipelines and print a throughput table; returns 1 when they disagree on the row count."""
+    parser = argparse.ArgumentParser(description="Compare CSV and binary end-to-end batch throughput.")
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--keep", metavar="DIR", help="Write the files to DIR instead of a temporary directory")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="tax-bench-") as workdir:
+        workdir = args.keep or workdir
+        os.makedirs(workdir, exist_ok=True)
+        payroll_bin, payroll_csv = os.path.join(workdir, "payroll.bin"), os.path.join(workdir, "payroll.csv")
+        results_bin, results_csv = os.path.join(workdir, "results.bin"), os.path.join(workdir, "results.csv")
+
+        print(f"Generating {args.rows:,} rows...")
+        generate_payroll(payroll_bin, args.rows)
+        started = time.perf_counter()
+        with open(payroll_csv, "w", newline="", encoding="utf-8") as sink:
+            write_csv(payroll_bin, sink)
+        print(f"Converted to CSV in {time.perf_counter() - started:.2f}s")
+
+        engine = TaxEngine(cache_size=0)
+        with open(payroll_csv, newline="", encoding="utf-8") as source, \
+                open(results_csv, "w", newline="", encoding="utf-8") as sink:
+            csv_stats = process_stream(source, sink, BatchMode.SALARY, TaxRegime.NEW, "csv", "csv", engine)
+        with open(results_bin, "wb") as sink:
+            binary_stats = process_binary(payroll_bin, sink, engine)
+
+        print(f"\n{'Format':<8} {'Seconds':>10} {'Rows/sec':>14} {'Input MB':>10} {'Output MB':>10} {'Speedup':>9}")
+        for name, stats, paths in (("csv", csv_stats, (payroll_csv, results_csv)),
+                                   ("binary", binary_stats, (payroll_bin, results_bin))):
+            speedup = csv_stats.elapsed_seconds / stats.elapsed_seconds
+            print(f"{name:<8} {stats.elapsed_seconds:>10.2f} {stats.rows_per_second:>14,.0f} "
+                  f"{_megabytes(paths[0]):>10.1f} {_megabytes(paths[1]):>10.1f} {speedup:>8.2f}x")
+
+    if csv_stats.rows != binary_stats.rows or csv_stats.skipped:
+        print(f"❌ CSV processed {csv_stats.rows:,} rows ({csv_stats.skipped:,} skipped), "
+              f"binary {binary_stats.rows:,}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
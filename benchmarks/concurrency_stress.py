@@ -0,0 +1,126 @@
+"""
+Concurrency stress test for the shared tax engine.
+
+Computes reference results single-threaded on a private engine, then lets
+many threads hammer one shared ``TaxEngine`` with a random mix of regimes,
+entry points and amounts (small cache, so entries are constantly evicted
+and recomputed). Every answer is checked against the reference; the run
+fails if any thread sees a wrong or missing result.
+
+Usage:
+    python -m benchmarks.concurrency_stress --threads 32 --calls 20000
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from benchmarks.distributions import (
+    freelancer_receipts_lakhs,
+    gross_salaries_lakhs,
+    monthly_take_home_targets,
+    salary_bands_lakhs,
+)
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import lakhs_to_paise
+
+Operation = tuple[str, Any, TaxRegime]
+
+
+def _dispatch(engine: TaxEngine) -> dict[str, Callable[[Any, TaxRegime], Any]]:
+    """ :return entry points of engine by operation name """
+    return {
+        "net_salary": engine.calculate_net_salary,
+        "freelancer_tax": engine.calculate_freelancer_tax,
+        "gross_for_take_home": engine.find_gross_salary_for_target_take_home,
+        "paise_net_salary": engine.paise.calculate_net_salary,
+        "paise_freelancer_tax": engine.paise.calculate_freelancer_tax,
+    }
+
+
+def build_operations(count: int, seed: int) -> list[Operation]:
+    """Build a shuffled mix of operations over both regimes."""
+    generator = random.Random(seed)
+    salaries = gross_salaries_lakhs(max(1, count // 4)) + salary_bands_lakhs(max(1, count // 4))
+    receipts = freelancer_receipts_lakhs(max(1, count // 4))
+    targets = monthly_take_home_targets(max(1, count // 20))
+
+    operations: list[Operation] = []
+    for _ in range(count):
+        regime = generator.choice(list(TaxRegime))
+        name = generator.choice(["net_salary", "freelancer_tax", "gross_for_take_home",
+                                 "paise_net_salary", "paise_freelancer_tax"])
+        if name == "gross_for_take_home":
+            amount = generator.choice(targets)
+        elif name == "net_salary":
+            amount = generator.choice(salaries)
+        elif name == "freelancer_tax":
+            amount = generator.choice(receipts)
+        elif name == "paise_net_salary":
+            amount = lakhs_to_paise(generator.choice(salaries))
+        else:
+            amount = lakhs_to_paise(generator.choice(receipts))
+        operations.append((name, amount, regime))
+    return operations
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the stress test; returns 1 when any thread saw a wrong result."""
+    parser = argparse.ArgumentParser(description="Stress a shared TaxEngine from many threads.")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=20_000, help="Distinct operations in the mix")
+    parser.add_argument("--rounds", type=int, default=4, help="Times every thread replays the whole mix")
+    parser.add_argument("--cache-size", type=int, default=64,
+                        help="Shared result cache size; small values force constant eviction")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    operations = build_operations(args.calls, args.seed)
+
+    reference_calls = _dispatch(TaxEngine(cache_size=0))
+    expected = [reference_calls[name](amount, regime) for name, amount, regime in operations]
+
+    shared = TaxEngine(cache_size=args.cache_size)
+    shared_calls = _dispatch(shared)
+    failures: list[str] = []
+    failures_lock = threading.Lock()
+    start_barrier = threading.Barrier(args.threads)
+
+    def worker(index: int) -> int:
+        generator = random.Random(args.seed + index)
+        order = list(range(len(operations)))
+        start_barrier.wait()
+        for _ in range(args.rounds):
+            generator.shuffle(order)
+            for position in order:
+                name, amount, regime = operations[position]
+                result = shared_calls[name](amount, regime)
+                if result != expected[position]:
+                    with failures_lock:
+                        failures.append(f"thread {index}: {name}({amount}, {regime.value})")
+        return len(order) * args.rounds
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        total_calls = sum(pool.map(worker, range(args.threads)))
+    elapsed = time.perf_counter() - started
+
+    stats = shared.cache_stats
+    print(f"Threads: {args.threads}  Calls: {total_calls:,}  Elapsed: {elapsed:.2f}s  "
+          f"Rate: {total_calls / elapsed:,.0f} calls/s")
+    print(f"Cache: {stats.hits:,} hits, {stats.misses:,} misses, {stats.evictions:,} evictions "
+          f"({stats.hit_rate:.1%} hit rate)")
+
+    if failures:
+        print(f"❌ {len(failures)} mismatched result(s), first: {failures[0]}")
+        return 1
+    print("✅ Every concurrent result matched the single-threaded reference.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Realistic input distributions for the benchmarks."""
+import random
+from decimal import Decimal
+
+
+def gross_salaries_lakhs(count: int, seed: int = 7) -> list[Decimal]:
+    """
+    Sample annual gross salaries in lakhs.
+
+    Salaries are log-normal around ~12 lakhs with a long tail, clipped to the
+    0.1-1000 lakh range the menus accept, and rounded to the rupee.
+    """
+    generator = random.Random(seed)
+    return [
+        Decimal(str(round(min(1000.0, max(0.1, generator.lognormvariate(2.5, 0.75))), 5)))
+        for _ in range(count)
+    ]
+
+
+def freelancer_receipts_lakhs(count: int, seed: int = 11) -> list[Decimal]:
+    """Sample annual freelancer receipts in lakhs (log-normal around ~20 lakhs)."""
+    generator = random.Random(seed)
+    return [
+        Decimal(str(round(min(1000.0, max(0.1, generator.lognormvariate(3.0, 0.9))), 5)))
+        for _ in range(count)
+    ]
+
+
+def taxable_incomes(count: int, seed: int = 13) -> list[Decimal]:
+    """Sample taxable incomes in rupees, taken as 80% of a ``gross_salaries_lakhs`` sample."""
+    return [lakhs * Decimal('80000') for lakhs in gross_salaries_lakhs(count, seed)]
+
+
+def monthly_take_home_targets(count: int, seed: int = 17) -> list[Decimal]:
+    """Sample monthly take-home targets in lakhs (roughly 0.2-20 lakhs)."""
+    generator = random.Random(seed)
+    return [
+        Decimal(str(round(min(100.0, max(0.1, generator.lognormvariate(0.0, 0.8))), 4)))
+        for _ in range(count)
+    ]
+
+
+def salary_bands_lakhs(count: int, bands: int = 40, seed: int = 19) -> list[Decimal]:
+    """Sample salaries drawn from a small set of repeated bands, as an HR portal sees them."""
+    generator = random.Random(seed)
+    grid = gross_salaries_lakhs(bands, seed)
+    return [generator.choice(grid) for _ in range(count)]
@@ -0,0 +1,77 @@
+"""
+Lookup table benchmark for ``IncomeTaxCalculator.enable_grid_table``.
+
+Times building the default grid table, saving it and loading it back, then
+answers sampled net salary and freelancer queries from the table and from
+the engine, both on grid points (amounts rounded to 0.01 lakh, i.e. 1,000
+rupees) and between them (rupee-precise amounts, interpolated). Every
+table result must equal the engine's, and loading must be faster than
+building.
+
+Usage:
+    python -m benchmarks.grid_table --queries 200000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from itertools import product
+
+from benchmarks.distributions import freelancer_receipts_lakhs, gross_salaries_lakhs
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.grid import DEFAULT_GRID, GridTable
+
+
+def _timed(function, *args):
+    """ :return result of function and the seconds it took """
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns 1 when the table disagrees with the engine or loads slower than it builds."""
+    parser = argparse.ArgumentParser(description="Time the grid lookup table against the engine.")
+    parser.add_argument("--queries", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    engine = TaxEngine(cache_size=0)
+    with tempfile.TemporaryDirectory(prefix="tax-grid-") as directory:
+        path = GridTable.path_for(engine, DEFAULT_GRID, directory)
+        table, build_seconds = _timed(GridTable.build, engine, DEFAULT_GRID)
+        _, save_seconds = _timed(table.save, path)
+        table, load_seconds = _timed(GridTable.load, path, engine, DEFAULT_GRID)
+    print(f"Grid: {DEFAULT_GRID.count:,} points x {len(engine.tax_slabs)} regimes  "
+          f"Build: {build_seconds:.3f}s  Save: {save_seconds:.3f}s  Load: {load_seconds:.3f}s")
+
+    failures: list[str] = []
+    print(f"\n{'Query':<30} {'Engine/s':>12} {'Table/s':>12} {'Fallbacks':>10} {'Speedup':>9}")
+    for name, sampled, lookup, compute in (
+            ("net_salary", gross_salaries_lakhs(args.queries), table.net_salary, engine.calculate_net_salary),
+            ("freelancer_tax", freelancer_receipts_lakhs(args.queries), table.freelancer_tax,
+             engine.calculate_freelancer_tax),
+    ):
+        for (placement, amounts), regime in product(
+                (("grid", [round(amount, 2) for amount in sampled]), ("between", sampled)), TaxRegime):
+            found, table_seconds = _timed(lambda: [lookup(amount, regime) for amount in amounts])
+            expected, engine_seconds = _timed(lambda: [compute(amount, regime) for amount in amounts])
+            fallbacks = found.count(None)
+            failures += [f"{name}({amount}, {regime.name})" for amount, result, reference
+                         in zip(amounts, found, expected)
+                         if result is not None and (result != reference or str(result.tax_lakhs)
+                                                    != str(reference.tax_lakhs))]
+            print(f"{f'{name}[{regime.value}, {placement}]':<30} {len(amounts) / engine_seconds:>12,.0f} "
+                  f"{len(amounts) / table_seconds:>12,.0f} {fallbacks:>10,} "
+                  f"{engine_seconds / table_seconds:>8.2f}x")
+
+    if load_seconds >= build_seconds:
+        failures.append(f"loading took {load_seconds:.3f}s, building {build_seconds:.3f}s")
+    if failures:
+        print(f"❌ {len(failures)} check(s) failed, first: {failures[0]}")
+        return 1
+    print("✅ Table results match the engine and loading beats rebuilding.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Batch gross salary solver benchmark for ``TaxEngine.solve_gross_salary_batch``.
+
+Solves a sample of monthly take-home targets per regime with the batch
+sweep and with a loop over the scalar analytic and bisection solvers. The
+batch must return exactly the analytic solver's gross salaries, and its
+monthly take-homes must stay within 0.01 lakh of the bisection solver's
+(bisection only converges on the rounded net salary, so its gross can
+drift further).
+
+Usage:
+    python -m benchmarks.inverse_batch --targets 100000
+"""
+import argparse
+import sys
+import time
+from decimal import Decimal
+
+from benchmarks.distributions import monthly_take_home_targets
+from calculator.engine import SolverMethod, TaxEngine, TaxRegime
+from calculator.money import PAISE_PER_LAKH
+
+TOLERANCE_LAKHS = Decimal('0.01')
+
+
+def _timed(function, *args):
+    """ :return result of function and the seconds it took """
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns 1 when the batch disagrees with a scalar solver."""
+    parser = argparse.ArgumentParser(description="Time the batch gross salary solver against the scalar loop.")
+    parser.add_argument("--targets", type=int, default=100_000)
+    parser.add_argument("--bisection-targets", type=int, default=5_000,
+                        help="Targets also solved by the (slower) bisection loop")
+    args = parser.parse_args(argv)
+
+    engine = TaxEngine(cache_size=0)
+    targets = monthly_take_home_targets(args.targets)
+    sampled = targets[:args.bisection_targets]
+    failures: list[str] = []
+
+    print(f"{'Regime':<8} {'Solver':<10} {'Targets':>9} {'Seconds':>9} {'Targets/sec':>13} {'Speedup':>9}")
+    for regime in TaxRegime:
+        columns, batch_seconds = _timed(engine.solve_gross_salary_batch, targets, regime)
+        gross, take_home = columns.column('gross_salary'), columns.column('monthly_take_home')
+        print(f"{regime.name:<8} {'batch':<10} {len(targets):>9,} {batch_seconds:>9.3f} "
+              f"{len(targets) / batch_seconds:>13,.0f} {'':>9}")
+
+        for method, amounts in ((SolverMethod.ANALYTIC, targets), (SolverMethod.BISECTION, sampled)):
+            solutions, seconds = _timed(
+                lambda: [engine.solve_gross_salary_for_target_take_home(target, regime, method)
+                         for target in amounts])
+            speedup = (seconds / len(amounts)) / (batch_seconds / len(targets))
+            print(f"{regime.name:<8} {method.value:<10} {len(amounts):>9,} {seconds:>9.3f} "
+                  f"{len(amounts) / seconds:>13,.0f} {speedup:>8.1f}x")
+
+            for target, solved, monthly, solution in zip(amounts, gross, take_home, solutions):
+                if method == SolverMethod.ANALYTIC:
+                    if solved != solution.gross_salary * 100:
+                        failures.append(f"{target} ({regime.name}): batch gross {solved} paise, "
+                                        f"analytic {solution.gross_salary} rupees")
+                elif abs(Decimal(monthly) / PAISE_PER_LAKH
+                         - solution.result.monthly_take_home_lakhs) > TOLERANCE_LAKHS:
+                    failures.append(f"{target} ({regime.name}): batch take-home {monthly} paise, "
+                                    f"bisection {solution.result.monthly_take_home_lakhs} lakhs")
+
+    if failures:
+        print(f"❌ {len(failures)} target(s) disagree, first: {failures[0]}")
+        return 1
+    print(f"✅ Batch matches the analytic solver exactly and bisection's take-home within {TOLERANCE_LAKHS} lakh.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
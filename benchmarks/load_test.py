@@ -0,0 +1,125 @@
+"""
+Load test for the HTTP tax service.
+
+Opens a number of keep-alive connections to a running service and fires
+requests from each as fast as responses come back, then reports throughput
+and p50/p90/p99 latency per endpoint.
+
+Usage:
+    python -m calculator.server --port 8080 &
+    python -m benchmarks.load_test --port 8080 --connections 32 --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from benchmarks.distributions import gross_salaries_lakhs, monthly_take_home_targets
+
+ENDPOINTS = ("/net-salary", "/freelancer-tax", "/gross-for-take-home", "/bulk")
+
+
+def _build_request(path: str, generator: random.Random, salaries: list, targets: list,
+                   bulk_size: int) -> bytes:
+    """Build one HTTP/1.1 request for an endpoint with a random payload."""
+    regime = generator.choice(["old", "new"])
+    if path == "/net-salary":
+        payload = {"gross_salary_lakhs": str(generator.choice(salaries)), "regime": regime}
+    elif path == "/freelancer-tax":
+        payload = {"gross_receipts_lakhs": str(generator.choice(salaries)), "regime": regime}
+    elif path == "/gross-for-take-home":
+        payload = {"target_monthly_take_home_lakhs": str(generator.choice(targets)), "regime": regime}
+    else:
+        payload = {"mode": "salary", "regime": regime,
+                   "amounts": [str(generator.choice(salaries)) for _ in range(bulk_size)]}
+    body = json.dumps(payload).encode("utf-8")
+    return (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    """Read one response and return its status code."""
+    status_line = await reader.readline()
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _client(host: str, port: int, jobs: asyncio.Queue,
+                  latencies: dict[str, list[float]], failures: list[int]) -> None:
+    """Send queued requests over one keep-alive connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                path, request = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies[path].append(time.perf_counter() - started)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """ :return percentile of samples (nearest rank) """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Generate the request mix, run all clients and print the report."""
+    generator = random.Random(args.seed)
+    salaries = gross_salaries_lakhs(1_000)
+    targets = monthly_take_home_targets(1_000)
+    weights = {"/net-salary": 0.5, "/freelancer-tax": 0.25, "/gross-for-take-home": 0.2, "/bulk": 0.05}
+
+    jobs: asyncio.Queue = asyncio.Queue()
+    for _ in range(args.requests):
+        path = generator.choices(ENDPOINTS, [weights[endpoint] for endpoint in ENDPOINTS])[0]
+        jobs.put_nowait((path, _build_request(path, generator, salaries, targets, args.bulk_size)))
+
+    latencies: dict[str, list[float]] = {path: [] for path in ENDPOINTS}
+    failures: list[int] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(args.host, args.port, jobs, latencies, failures) for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    completed = sum(len(samples) for samples in latencies.values())
+    print(f"{completed:,} requests over {args.connections} connections in {elapsed:.2f}s "
+          f"({completed / elapsed:,.0f} req/s), {len(failures)} failed")
+    print(f"\n{'Endpoint':<24} {'Count':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    everything = [sample for samples in latencies.values() for sample in samples]
+    for path, samples in [*latencies.items(), ("all", everything)]:
+        if samples:
+            print(f"{path:<24} {len(samples):>8,} {_percentile(samples, 50) * 1000:>9.2f} "
+                  f"{_percentile(samples, 90) * 1000:>9.2f} {_percentile(samples, 99) * 1000:>9.2f} "
+                  f"{statistics.fmean(samples) * 1000:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the HTTP tax service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--bulk-size", type=int, default=1_000, help="Amounts per /bulk request")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
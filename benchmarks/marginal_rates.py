@@ -0,0 +1,88 @@
+"""
+Marginal rate benchmark for ``TaxEngine.salary_marginal_rates_batch``.
+
+Compares three ways of getting marginal take-home rates for sampled
+salaries: the finite difference planning tools used (two net salary
+calculations per salary, a ₹1 lakh raise apart), the analytic batch and
+the analytic grid sweep. Checks that the analytic tax equals the paise
+backend's, that the analytic rate matches a one-rupee difference wherever
+no edge is that close, and counts the salaries for which the ₹1 lakh
+difference misstates the marginal rate because an edge (or the 87A
+cliff) lies within the raise.
+
+Usage:
+    python -m benchmarks.marginal_rates --salaries 200000
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.distributions import gross_salaries_lakhs
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import PAISE_PER_LAKH, lakhs_to_paise
+
+RAISE_PAISE = PAISE_PER_LAKH
+RUPEE_PAISE = 100
+
+
+def _timed(function, *args):
+    """ :return result of function and the seconds it took """
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns 1 when the analytic rates disagree with the paise backend."""
+    parser = argparse.ArgumentParser(description="Time analytic marginal rates against finite differences.")
+    parser.add_argument("--salaries", type=int, default=200_000)
+    parser.add_argument("--sweep-step", type=int, default=100, help="Grid spacing of the sweep, in rupees")
+    args = parser.parse_args(argv)
+
+    engine = TaxEngine(cache_size=0)
+    amounts = gross_salaries_lakhs(args.salaries)
+    salaries = [lakhs_to_paise(amount) for amount in amounts]
+    failures: list[str] = []
+
+    print(f"{'Regime':<8} {'Method':<20} {'Points':>10} {'Seconds':>9} {'Points/sec':>13} {'Misstated':>10}")
+    for regime in TaxRegime:
+        def finite_difference():
+            base = engine.calculate_net_salary_batch(amounts, regime).column('net_salary')
+            raised = engine.calculate_net_salary_batch([amount + 1 for amount in amounts], regime)
+            return [(after - before) / RAISE_PAISE for before, after in zip(base, raised.column('net_salary'))]
+
+        estimates, difference_seconds = _timed(finite_difference)
+        columns, batch_seconds = _timed(engine.salary_marginal_rates_batch, amounts, regime)
+        misstated = sum(1 for estimate, rate in zip(estimates, columns.marginal_take_home_rate)
+                        if abs(estimate - rate) > 1e-6)
+        sweep, sweep_seconds = _timed(engine.marginal_rates_sweep, 1, 200, regime, args.sweep_step)
+
+        for method, points, seconds, wrong in (
+                ("finite difference", len(salaries), difference_seconds, misstated),
+                ("analytic batch", len(salaries), batch_seconds, 0),
+                ("analytic sweep", len(sweep), sweep_seconds, 0),
+        ):
+            print(f"{regime.name:<8} {method:<20} {points:>10,} {seconds:>9.3f} {points / seconds:>13,.0f} "
+                  f"{wrong:>10,}")
+
+        expected_tax = engine.paise.calculate_net_salary_batch(salaries, regime).column('tax')
+        if columns.tax_paise != expected_tax:
+            failures.append(f"{regime.name}: analytic tax differs from the paise backend")
+        nudged = engine.paise.calculate_net_salary_batch([paise + RUPEE_PAISE for paise in salaries], regime)
+        for paise, tax, after, rate, distance in zip(salaries, columns.tax_paise, nudged.column('tax'),
+                                                     columns.marginal_tax_rate,
+                                                     columns.distance_to_next_edge_paise):
+            # Both taxes are rounded to the paisa, so a one-rupee difference is within a paisa of the rate
+            if (distance == -1 or distance > RUPEE_PAISE) and abs(after - tax - rate * RUPEE_PAISE) > 1:
+                failures.append(f"{regime.name} at {paise} paise: rate {rate}, one-rupee difference {after - tax}")
+                break
+
+    if failures:
+        print(f"❌ {len(failures)} check(s) failed, first: {failures[0]}")
+        return 1
+    print("✅ Analytic tax matches the paise backend, and rates match one-rupee differences away from edges.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Scaling benchmark for the parallel batch runner.
+
+Generates a synthetic salary file and times ``calculate_net_salary`` over it
+with an increasing number of worker processes. Speedup and efficiency are
+relative to a single-worker run, which is always timed first even when
+``--workers`` does not list 1.
+
+Usage:
+    python -m benchmarks.parallel_scaling --rows 10000000
+    python -m benchmarks.parallel_scaling --rows 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from calculator.batch import BatchMode
+from calculator.income_tax_calculator import TaxRegime
+from calculator.parallel import run_parallel
+
+
+def generate_dataset(path: str, rows: int, seed: int = 42) -> None:
+    """Write a synthetic salary CSV with a log-normal-ish income spread."""
+    generator = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        stream.write("id,gross_salary_lakhs,regime\n")
+        for row_id in range(rows):
+            gross_lakhs = min(999.0, round(generator.lognormvariate(2.5, 0.7), 2))
+            regime = "old" if generator.random() < 0.3 else "new"
+            stream.write(f"{row_id},{gross_lakhs},{regime}\n")
+
+
+def main() -> None:
+    """Run the scaling benchmark and print a speedup table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, 16, 32, os.cpu_count() or 1}))
+    parser.add_argument("--chunk-size", type=int, help="Shard size in bytes (default: sized from the file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tax-bench-") as workdir:
+        input_path = os.path.join(workdir, "payroll.csv")
+        print(f"Generating {args.rows:,} rows...")
+        generate_dataset(input_path, args.rows)
+
+        baseline: float | None = None
+        print(f"\n{'Workers':>8} {'Seconds':>10} {'Rows/sec':>14} {'Speedup':>9} {'Efficiency':>11}")
+        # A single-worker run is always timed first, so speedups are measured rather than extrapolated
+        for workers in sorted({1, *args.workers}):
+            with open(os.devnull, "w", newline="", encoding="utf-8") as sink:
+                stats = run_parallel(
+                    input_path, sink, BatchMode.SALARY, TaxRegime.NEW, "csv", "csv",
+                    workers=workers, chunk_size=args.chunk_size
+                )
+            if baseline is None:
+                baseline = stats.elapsed_seconds
+            speedup = baseline / stats.elapsed_seconds
+            print(f"{workers:>8} {stats.elapsed_seconds:>10.2f} {stats.rows_per_second:>14,.0f} "
+                  f"{speedup:>8.2f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Population totals benchmark for ``calculator.aggregate``.
+
+Builds a sample of gross salaries once, totals tax and net salary under
+several rule variants and both regimes from the curves, and times the
+same totals evaluated row by row through the paise backend. The curve
+totals must stay within half a paisa per employee of the per-row sums;
+the error of a ₹10,000-band histogram of the same salaries is reported.
+
+Usage:
+    python -m benchmarks.population_totals --employees 1000000
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.distributions import gross_salaries_lakhs
+from calculator.aggregate import PopulationEstimator, SalaryHistogram, WeightedSample, parse_variants
+from calculator.engine import TaxRegime
+from calculator.money import lakhs_to_paise
+
+BAND_PAISE = 10_000 * 100
+
+
+def _timed(function, *args):
+    """ :return result of function and the seconds it took """
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns 1 when curve totals disagree with per-row evaluation."""
+    parser = argparse.ArgumentParser(description="Time population totals against per-row evaluation.")
+    parser.add_argument("--employees", type=int, default=1_000_000)
+    parser.add_argument("--variant", action="append", default=[],
+                        help="Rule variants to compare (default: builtin, 2024-25 and 2025-26)")
+    args = parser.parse_args(argv)
+
+    variants = parse_variants(args.variant or ["builtin", "2024-25", "2025-26"])
+    salaries = [lakhs_to_paise(amount) for amount in gross_salaries_lakhs(args.employees)]
+    sample, sample_seconds = _timed(WeightedSample, salaries)
+    histogram, histogram_seconds = _timed(SalaryHistogram.from_amounts, salaries, BAND_PAISE)
+    by_sample, by_histogram = PopulationEstimator(sample), PopulationEstimator(histogram)
+    print(f"Binned {len(sample):,} salaries: sample {sample_seconds:.2f}s, "
+          f"{len(histogram):,}-band histogram {histogram_seconds:.2f}s")
+
+    tolerance = (sample.employees + 1) // 2
+    failures: list[str] = []
+    print(f"{'Variant':<10} {'Regime':<7} {'Curve ms':>9} {'Per-row s':>10} {'Speedup':>9} "
+          f"{'Diff (paise)':>13} {'Histogram error':>16}")
+    for name, engine in variants.items():
+        for regime in TaxRegime:
+            totals, curve_seconds = _timed(by_sample.totals, engine, regime, name)
+            exact, row_seconds = _timed(by_sample.exact_totals, engine, regime, name)
+            binned = by_histogram.totals(engine, regime, name)
+            difference = max(abs(totals.tax_paise - exact.tax_paise), abs(totals.net_paise - exact.net_paise))
+            error = (binned.tax_paise - exact.tax_paise) / exact.tax_paise if exact.tax_paise else 0.0
+            print(f"{name:<10} {regime.name:<7} {curve_seconds * 1000:>9.2f} {row_seconds:>10.2f} "
+                  f"{row_seconds / curve_seconds:>8,.0f}x {difference:>13,} {error:>15.4%}")
+            if difference > tolerance:
+                failures.append(f"{name} ({regime.name}): curve totals {difference} paise from per-row sums")
+
+    if failures:
+        print(f"❌ {len(failures)} total(s) disagree, first: {failures[0]}")
+        return 1
+    print(f"✅ Curve totals are within half a paisa per employee ({tolerance:,} paise) of per-row sums.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Benchmark suite for every calculator entry point.
+
+Times scalar calls, the gross-target solvers and bulk loops for both tax
+regimes, measures memory churn with ``tracemalloc`` and writes the results
+as JSON. A previous JSON file can be passed with ``--compare`` to fail the
+run when any case slows down by more than ``--threshold``.
+
+Usage:
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json --threshold 0.10
+    python -m benchmarks.run --quick --filter net_salary
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from fractions import Fraction
+from typing import Any
+
+from benchmarks.distributions import (
+    freelancer_receipts_lakhs,
+    gross_salaries_lakhs,
+    monthly_take_home_targets,
+    salary_bands_lakhs,
+    taxable_incomes,
+)
+from calculator.income_tax_calculator import IncomeTaxCalculator, SolverMethod, TaxRegime
+from calculator.instrumentation import instrumented
+from calculator.money import lakhs_to_paise
+
+# Number of single calls traced per case when measuring memory churn
+MEMORY_SAMPLE = 500
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkCase:
+    """
+    A named workload.
+
+    ``run`` processes all of ``inputs`` once; ``calls`` is how many logical
+    calculator calls that represents, so timings can be reported per call.
+    """
+
+    name: str
+    inputs: Sequence[Any]
+    run: Callable[[Sequence[Any]], Any]
+
+    @property
+    def calls(self) -> int:
+        """ :return logical calls per run """
+        return len(self.inputs)
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    """Timing and memory figures for one case."""
+
+    calls: int
+    repeats: int
+    median_ns_per_call: float
+    min_ns_per_call: float
+    peak_bytes_per_call: float
+    retained_bytes_per_call: float
+
+
+def _loop(method: Callable[..., Any], *args: Any) -> Callable[[Sequence[Any]], None]:
+    """Build a runner that calls method once per input."""
+    def run(inputs: Sequence[Any]) -> None:
+        for value in inputs:
+            method(value, *args)
+    return run
+
+
+def _instrumented(run: Callable[[Sequence[Any]], Any]) -> Callable[[Sequence[Any]], None]:
+    """Build a runner that records engine metrics while run executes."""
+    def run_instrumented(inputs: Sequence[Any]) -> None:
+        with instrumented():
+            run(inputs)
+    return run_instrumented
+
+
+def build_cases(size: int) -> list[BenchmarkCase]:
+    """
+    Build all benchmark cases.
+
+    Args:
+        size: Number of inputs for the scalar cases; solver and bulk cases scale from it
+    """
+    uncached = IncomeTaxCalculator(cache_size=0)
+    cached = IncomeTaxCalculator()
+
+    incomes = taxable_incomes(size)
+    salaries = gross_salaries_lakhs(size)
+    receipts = freelancer_receipts_lakhs(size)
+    bands = salary_bands_lakhs(size)
+    targets = monthly_take_home_targets(max(1, size // 10))
+    salaries_paise = [lakhs_to_paise(lakhs) for lakhs in salaries]
+    receipts_paise = [lakhs_to_paise(lakhs) for lakhs in receipts]
+
+    cases: list[BenchmarkCase] = []
+    for regime in TaxRegime:
+        suffix = f"[{regime.value}]"
+        cases += [
+            BenchmarkCase(f"calculate_tax{suffix}", incomes, _loop(uncached.calculate_tax, regime)),
+            BenchmarkCase(f"calculate_net_salary{suffix}", salaries,
+                          _loop(uncached.calculate_net_salary, regime)),
+            BenchmarkCase(f"calculate_net_salary_cached_bands{suffix}", bands,
+                          _loop(cached.calculate_net_salary, regime)),
+            BenchmarkCase(f"calculate_freelancer_tax{suffix}", receipts,
+                          _loop(uncached.calculate_freelancer_tax, regime)),
+            BenchmarkCase(f"paise_calculate_net_salary{suffix}", salaries_paise,
+                          _loop(uncached.paise.calculate_net_salary, regime)),
+            BenchmarkCase(f"paise_calculate_freelancer_tax{suffix}", receipts_paise,
+                          _loop(uncached.paise.calculate_freelancer_tax, regime)),
+            BenchmarkCase(f"find_gross_analytic{suffix}", targets,
+                          _loop(uncached.find_gross_salary_for_target_take_home, regime,
+                                SolverMethod.ANALYTIC)),
+            BenchmarkCase(f"find_gross_bisection{suffix}", targets,
+                          _loop(uncached.find_gross_salary_for_target_take_home, regime,
+                                SolverMethod.BISECTION)),
+            BenchmarkCase(f"bulk_calculate_tax_batch{suffix}", incomes,
+                          lambda inputs, regime=regime: uncached.calculate_tax_batch(inputs, regime)),
+            BenchmarkCase(f"bulk_net_salary_columns{suffix}", salaries_paise,
+                          lambda inputs, regime=regime: uncached.paise.calculate_net_salary_batch(inputs, regime)),
+        ]
+    cases += [
+        # Same workload as calculate_tax[old] with metrics recorded, to track the enabled overhead
+        BenchmarkCase("calculate_tax_instrumented[old]", incomes,
+                      _instrumented(_loop(uncached.calculate_tax, TaxRegime.OLD))),
+        BenchmarkCase("compare_regimes", salaries, _loop(uncached.compare_regimes)),
+        BenchmarkCase("crossover_preferred_regime", [Fraction(lakhs) * 100000 for lakhs in salaries],
+                      _loop(uncached.crossover_index.preferred_regime)),
+        # One call is a full 1-500 lakh sweep at 1,000-rupee steps (~50k grid points per regime)
+        BenchmarkCase("compare_regimes_sweep[1-500L/1k]", [(1, 500, 1000)],
+                      lambda inputs: [uncached.compare_regimes_sweep(*bounds) for bounds in inputs]),
+    ]
+    return cases
+
+
+def measure(case: BenchmarkCase, repeats: int) -> BenchmarkResult:
+    """
+    Time a case and measure its memory churn.
+
+    Timing takes the median and minimum over ``repeats`` runs. Memory is
+    measured separately under ``tracemalloc`` on a sample of single calls:
+    the traced peak above the pre-call size approximates the transient
+    allocation of each call, and growth that survives is reported as
+    retained bytes.
+    """
+    case.run(case.inputs)  # warm up caches and compiled tables
+
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter_ns()
+        case.run(case.inputs)
+        durations.append(time.perf_counter_ns() - started)
+
+    sample = case.inputs[:MEMORY_SAMPLE]
+    transient_peaks = 0
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for value in sample:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            case.run([value])
+            transient_peaks += tracemalloc.get_traced_memory()[1] - before
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        calls=case.calls,
+        repeats=repeats,
+        median_ns_per_call=statistics.median(durations) / case.calls,
+        min_ns_per_call=min(durations) / case.calls,
+        peak_bytes_per_call=transient_peaks / len(sample),
+        retained_bytes_per_call=(current - baseline) / len(sample),
+    )
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Compare two result documents.
+
+    Returns:
+        Names of cases whose median time per call grew by more than threshold
+    """
+    regressions = []
+    print(f"\n{'Case':<45} {'Baseline ns':>12} {'Current ns':>12} {'Change':>8}")
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            print(f"{name:<45} {'—':>12} {result['median_ns_per_call']:>12,.0f} {'new':>8}")
+            continue
+        change = result["median_ns_per_call"] / previous["median_ns_per_call"] - 1
+        marker = " ❌" if change > threshold else ""
+        print(f"{name:<45} {previous['median_ns_per_call']:>12,.0f} "
+              f"{result['median_ns_per_call']:>12,.0f} {change:>+8.1%}{marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite; returns 1 when a regression is detected."""
+    parser = argparse.ArgumentParser(description="Benchmark the income tax calculator.")
+    parser.add_argument("--size", type=int, default=20_000, help="Inputs per scalar case")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Small inputs and few repeats")
+    parser.add_argument("--filter", default="", help="Only run cases containing this text")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    size, repeats = (1_000, 2) if args.quick else (args.size, args.repeats)
+    cases = [case for case in build_cases(size) if args.filter in case.name]
+
+    results: dict[str, dict[str, Any]] = {}
+    print(f"{'Case':<45} {'Median ns':>12} {'Min ns':>12} {'Peak B':>10} {'Kept B':>8}")
+    for case in cases:
+        result = measure(case, repeats)
+        results[case.name] = asdict(result)
+        print(f"{case.name:<45} {result.median_ns_per_call:>12,.0f} {result.min_ns_per_call:>12,.0f} "
+              f"{result.peak_bytes_per_call:>10,.1f} {result.retained_bytes_per_call:>8,.1f}")
+
+    document = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "size": size,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(document, stream, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as stream:
+            regressions = compare(document, json.load(stream), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
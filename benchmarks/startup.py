@@ -0,0 +1,126 @@
+"""
+Startup-time benchmark for the command line.
+
+Runs every scenario in a fresh interpreter under ``python -X importtime``
+and sums the cumulative import time of the modules it loads on top of a
+bare interpreter. A scenario fails when its median import time is over
+budget, or when it loads a module it must not (for example the menus from
+a one-shot command), so lazy imports cannot silently regress.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeats 9 --budget-scale 2   # slower machines
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Repeated launches run from cached bytecode, so allow .pyc files to be written during the warm-up run
+_ENVIRONMENT = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+
+
+@dataclass(frozen=True, slots=True)
+class StartupScenario:
+    """A command whose startup is measured."""
+
+    name: str
+    argv: tuple[str, ...]
+    budget_ms: float
+    forbidden: tuple[str, ...] = ()
+
+
+# Exact curves are built on first use, so no scenario may import their modules
+_CURVES = ("calculator.crossover", "calculator.piecewise")
+
+# Budgets leave about 1.5-2x headroom over the medians of a loaded CI runner (60, 90 and 60 ms), so
+# they catch an eager import of a heavy module rather than scheduler noise
+SCENARIOS = (
+    StartupScenario("one-shot net", ("main.py", "net", "--regime", "new", "12.5"), 120,
+                    ("menus", "calculator.income_tax_calculator", "calculator.rulesets",
+                     "calculator.paise", "tomllib", *_CURVES)),
+    StartupScenario("one-shot net with year", ("main.py", "net", "12.5", "--assessment-year", "2025-26"), 150,
+                    ("menus", "calculator.income_tax_calculator", "calculator.paise", *_CURVES)),
+    StartupScenario("menu start", ("-c", "from menus.main_menu import MainMenu; MainMenu()"), 120,
+                    ("menus.salary_menu", "menus.freelancer_menu", "calculator.rulesets",
+                     "calculator.paise", "tomllib", *_CURVES)),
+)
+
+
+def import_times(argv: tuple[str, ...]) -> tuple[dict[str, int], float]:
+    """
+    Run argv under ``-X importtime``.
+
+    Returns:
+        Cumulative import time in microseconds of every top-level import by
+        module name (nested modules map to 0) and the wall time in seconds
+    """
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=ROOT, env=_ENVIRONMENT,
+                               capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - started
+
+    modules: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        # Nested imports are indented below the module that triggered them
+        top_level = not name[1:].startswith(" ")
+        modules[name.strip()] = int(cumulative) if top_level else 0
+    return modules, elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run every scenario; returns 1 when one is over budget or imports a forbidden module."""
+    parser = argparse.ArgumentParser(description="Measure command-line startup import time.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. 2 on a slow machine")
+    args = parser.parse_args(argv)
+
+    baseline, _ = import_times(("-c", "pass"))
+    failures: list[str] = []
+    print(f"{'Scenario':<26} {'Import ms':>10} {'Budget ms':>10} {'Wall ms':>9}  Slowest imports")
+    for scenario in SCENARIOS:
+        import_times(scenario.argv)  # Warm-up: writes bytecode caches
+        totals, walls = [], []
+        for _ in range(args.repeats):
+            modules, elapsed = import_times(scenario.argv)
+            added = {name: micros for name, micros in modules.items() if name not in baseline}
+            totals.append(sum(added.values()) / 1000)
+            walls.append(elapsed * 1000)
+
+        slowest = sorted(added, key=added.__getitem__, reverse=True)[:3]
+        budget = scenario.budget_ms * args.budget_scale
+        median = statistics.median(totals)
+        marker = " ❌" if median > budget else ""
+        print(f"{scenario.name:<26} {median:>10.1f} {budget:>10.0f} {statistics.median(walls):>9.1f}  "
+              f"{', '.join(slowest)}{marker}")
+
+        if median > budget:
+            failures.append(f"{scenario.name} took {median:.1f} ms (budget {budget:.0f} ms)")
+        loaded = [name for name in modules
+                  if any(name == prefix or name.startswith(prefix + ".") for prefix in scenario.forbidden)]
+        if loaded:
+            failures.append(f"{scenario.name} imported {', '.join(loaded)}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} startup check(s) failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\n✅ Every scenario is within budget and imports only what it needs.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
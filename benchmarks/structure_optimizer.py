@@ -0,0 +1,100 @@
+"""
+Salary structure optimizer benchmark.
+
+Optimizes a synthetic batch of offers (log-normal gross salaries, mixed
+regimes) under a wide policy, sequentially and across worker processes,
+and checks a sample against a brute-force grid scan of the policy space
+and against the ``Decimal`` engine.
+
+Usage:
+    python -m benchmarks.structure_optimizer --offers 100000 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+from fractions import Fraction
+from math import ceil, floor
+
+from benchmarks.distributions import gross_salaries_lakhs
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import PAISE_PER_LAKH, lakhs_to_paise, to_paise
+from calculator.structure import StructureOptimizer, StructurePolicy, optimize_offers
+
+POLICY = StructurePolicy(
+    basic_salary_ratio=(Decimal('0.3'), Decimal('0.7')),
+    hra_ratio=(Decimal('0.2'), Decimal('0.5')),
+    pf_ratio=(Decimal('0.05'), Decimal('0.2')),
+)
+SCAN_STEPS = 100
+PF_SCAN_STEPS = 20
+
+
+def grid_scan(optimizer: StructureOptimizer, gross: int, regime: TaxRegime) -> int:
+    """ :return best net salary in paise over a grid of basic and PF ratios (HRA at its maximum) """
+    policy, engine = optimizer.policy, optimizer.engine
+    basic_low, basic_high = map(Fraction, policy.basic_salary_ratio)
+    pf_low, pf_high = map(Fraction, policy.pf_ratio)
+    hra_ratio = Fraction(policy.hra_ratio[1])
+    standard_deduction = to_paise(engine.rules[regime].standard_deduction)
+    section_80c_limit = to_paise(engine.rules[regime].section_80c_limit)
+    best = None
+    for step in range(SCAN_STEPS + 1):
+        basic = floor(gross * (basic_low + (basic_high - basic_low) * step / SCAN_STEPS))
+        hra = floor(basic * hra_ratio)
+        for pf_step in range(PF_SCAN_STEPS + 1):
+            # Whole paise within the bounds, as the optimizer rounds them
+            pf_ratio = pf_low + (pf_high - pf_low) * pf_step / PF_SCAN_STEPS
+            pf = min(ceil(basic * pf_ratio), floor(basic * pf_high))
+            deductions = standard_deduction
+            if regime == TaxRegime.OLD:
+                deductions += hra + min(pf, section_80c_limit)
+            net = gross - 2 * pf - engine.paise.calculate_tax(gross - deductions, regime)
+            best = net if best is None or net > best else best
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns 1 when a sampled optimum loses to the grid scan or the engine disagrees."""
+    parser = argparse.ArgumentParser(description="Time the salary structure optimizer.")
+    parser.add_argument("--offers", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sample", type=int, default=200, help="Offers checked against the grid scan")
+    args = parser.parse_args(argv)
+
+    generator = random.Random(31)
+    offers = [(lakhs_to_paise(amount), TaxRegime.OLD if generator.random() < 0.5 else TaxRegime.NEW)
+              for amount in gross_salaries_lakhs(args.offers)]
+
+    print(f"{'Workers':>8} {'Seconds':>9} {'Offers/sec':>12}")
+    results = {}
+    for workers in sorted({1, args.workers}):
+        started = time.perf_counter()
+        results[workers] = list(optimize_offers(offers, POLICY, workers))
+        elapsed = time.perf_counter() - started
+        print(f"{workers:>8} {elapsed:>9.2f} {len(offers) / elapsed:>12,.0f}")
+    optima = results[1]
+    gains = sorted(optimum.gain_paise for optimum in optima)
+    print(f"Gain over the default structure: median ₹{gains[len(gains) // 2] / 100:,.2f}, "
+          f"max ₹{gains[-1] / 100:,.2f}")
+
+    failures = [] if results[1] == results[args.workers] else ["parallel results differ"]
+    optimizer = StructureOptimizer(TaxEngine(cache_size=0), POLICY)
+    for optimum in generator.sample(optima, min(args.sample, len(optima))):
+        scanned = grid_scan(optimizer, optimum.gross_salary_paise, optimum.regime)
+        engine_net = optimizer.result(optimum).net_salary_lakhs
+        if scanned > optimum.net_salary_paise:
+            failures.append(f"grid scan beats {optimum}")
+        if engine_net != round(Decimal(optimum.net_salary_paise) / PAISE_PER_LAKH, 2):
+            failures.append(f"engine computes {engine_net} lakhs for {optimum}")
+    if failures:
+        print(f"❌ {len(failures)} check(s) failed, first: {failures[0]}")
+        return 1
+    print("✅ No sampled offer is beaten by the grid scan, and the engine agrees on every net salary.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
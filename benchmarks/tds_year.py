@@ -0,0 +1,105 @@
+"""
+Full-year TDS benchmark for the monthly scheduler.
+
+Generates a payroll year for many employees (everyone joins in April, some
+get a revision with arrears in July, some a bonus in October), streams the
+event log through ``TdsScheduler`` and reports the time per month. Every
+employee's deductions must add up to their final projected tax, and the incremental schedule is checked against a naive
+scheduler that re-projects every employee every month.
+
+Usage:
+    python -m benchmarks.tds_year --employees 100000
+"""
+import argparse
+import random
+import sys
+import time
+from collections.abc import Iterator
+from decimal import Decimal
+
+from benchmarks.distributions import gross_salaries_lakhs
+from calculator.engine import TaxRegime
+from calculator.tds import FISCAL_MONTHS, EventKind, PayrollEvent, TdsScheduler
+
+REVISION_MONTH = 4  # July
+BONUS_MONTH = 7  # October
+
+
+def payroll_events(employees: int, seed: int = 23) -> Iterator[PayrollEvent]:
+    """Yield a month-ordered event log for a synthetic payroll."""
+    salaries = gross_salaries_lakhs(employees, seed)
+    generator = random.Random(seed)
+    regimes = [TaxRegime.OLD if generator.random() < 0.3 else TaxRegime.NEW for _ in range(employees)]
+
+    for index, salary in enumerate(salaries):
+        yield PayrollEvent(f"E{index}", 1, EventKind.SALARY, salary, regimes[index])
+    for index, salary in enumerate(salaries):
+        if index % 3 == 0:
+            revised = salary * Decimal('1.1')
+            yield PayrollEvent(f"E{index}", REVISION_MONTH, EventKind.SALARY, revised)
+            # Three months of back pay for the April-June revision
+            yield PayrollEvent(f"E{index}", REVISION_MONTH, EventKind.ARREARS, (revised - salary) / 4)
+    for index, salary in enumerate(salaries):
+        if index % 5 == 0:
+            yield PayrollEvent(f"E{index}", BONUS_MONTH, EventKind.BONUS, salary / 10)
+
+
+class _EagerScheduler(TdsScheduler):
+    """Reference scheduler that re-projects every employee every month."""
+
+    def close_month(self):
+        self._dirty.update(self._employees)
+        return super().close_month()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns 1 when a schedule does not settle or disagrees with the reference."""
+    parser = argparse.ArgumentParser(description="Time a full payroll year through the TDS scheduler.")
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--no-check", action="store_true", help="Skip the eager reference run")
+    args = parser.parse_args(argv)
+
+    scheduler = TdsScheduler()
+    month_seconds = [0.0] * len(FISCAL_MONTHS)
+    final_tax: dict[str, int] = {}
+    deductions, month = 0, 1
+    started = mark = time.perf_counter()
+    for deduction in scheduler.process_log(payroll_events(args.employees)):
+        deductions += 1
+        if deduction.month != month:
+            now = time.perf_counter()
+            month_seconds[month - 1], mark, month = now - mark, now, deduction.month
+        if deduction.month == len(FISCAL_MONTHS):
+            final_tax[deduction.employee_id] = deduction.projected_tax_paise
+    month_seconds[month - 1] = time.perf_counter() - mark
+    elapsed = time.perf_counter() - started
+
+    print(f"{'Month':>6} {'Seconds':>9}")
+    for name, seconds in zip(FISCAL_MONTHS, month_seconds):
+        print(f"{name:>6} {seconds:>9.3f}")
+    print(f"Employees: {args.employees:,}  Deductions: {deductions:,}  Elapsed: {elapsed:.2f}s  "
+          f"Rate: {deductions / elapsed:,.0f} deductions/s  Re-projections: {scheduler.projections:,}")
+
+    failures = [f"{employee_id} does not settle" for employee_id, tax in final_tax.items()
+                if sum(scheduler.schedule(employee_id)) != tax]
+
+    if not args.no_check:
+        reference = _EagerScheduler()
+        started = time.perf_counter()
+        expected = {(item.employee_id, item.month): item.tds_paise
+                    for item in reference.process_log(payroll_events(args.employees))}
+        print(f"Eager reference: {time.perf_counter() - started:.2f}s, "
+              f"{reference.projections:,} re-projections")
+        failures += [f"E{index} differs from the eager schedule" for index in range(args.employees)
+                     if scheduler.schedule(f"E{index}")
+                     != tuple(expected[f"E{index}", month] for month in range(1, len(FISCAL_MONTHS) + 1))]
+
+    if failures:
+        print(f"❌ {len(failures)} employee(s) failed, first: {failures[0]}")
+        return 1
+    print("✅ Every schedule settles to the projected tax and matches the eager reference.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+"""
+Advance tax installments for freelancers under Section 44ADA.
+
+Contractors are paid through invoices spread over the year, so their
+advance tax has to be estimated from the receipts booked so far. At each
+statutory due date the tax on the estimated year's receipts is worked out
+and the contractor owes the cumulative share due by that date, in whole
+rupees, less what earlier installments already asked for:
+
+    * ``InstallmentSchedule.PRESUMPTIVE``: 44ADA assessees pay everything
+      by 15 March (section 211(1)(b));
+    * ``InstallmentSchedule.STANDARD``: 15%, 45%, 75% and 100% by 15 June,
+      15 September, 15 December and 15 March.
+
+No advance tax is due while the estimate stays below ₹10,000 (section 208).
+
+``AdvanceTaxScheduler`` keeps running receipts, cash receipts and
+presumptive income per contractor in integer paise, so an invoice is a
+few additions and a due date is one integer tax evaluation per
+contractor: no deduction dictionary and no ``Decimal`` rounding. A
+date-ordered invoice stream is consumed in one pass, with memory bounded
+by the number of contractors rather than invoices. A contractor whose
+receipts pass the 44ADA limit (₹50 lakh, or ₹75 lakh while cash receipts
+stay within 5%) is flagged as the invoice arrives.
+
+Usage:
+    python -m calculator.advance_tax --schedule standard --output installments.csv invoices.csv
+    python -m calculator.advance_tax --assessment-year 2025-26 invoices.jsonl
+"""
+import argparse
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import IO, Any
+
+from calculator.batch import MalformedRow, RowWriter, _detect_format, read_rows
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import (PAISE_PER_LAKH, PAISE_PER_RUPEE, div_half_even, lakhs_to_paise, parse_amount_lakhs,
+                              paise_to_rupees)
+from calculator.rulesets import RuleSetError, engine_for, normalise_assessment_year
+
+# Section 208: no advance tax while the year's tax is below this
+ADVANCE_TAX_THRESHOLD_PAISE = 10_000 * PAISE_PER_RUPEE
+# Section 44ADA receipts limit, raised while cash receipts stay within the given share
+RECEIPTS_LIMIT_PAISE = 50 * PAISE_PER_LAKH
+RAISED_RECEIPTS_LIMIT_PAISE = 75 * PAISE_PER_LAKH
+CASH_RECEIPTS_PERCENT = 5
+
+
+class InstallmentSchedule(Enum):
+    """Enumeration for the advance tax due dates that apply."""
+    PRESUMPTIVE = "presumptive"
+    STANDARD = "standard"
+
+    @property
+    def due_dates(self) -> tuple[tuple[int, int, int], ...]:
+        """ :return (month, day, cumulative percent of the year's tax) per due date, in fiscal order """
+        if self == InstallmentSchedule.PRESUMPTIVE:
+            return (3, 15, 100),
+        return (6, 15, 15), (9, 15, 45), (12, 15, 75), (3, 15, 100)
+
+
+class Projection(Enum):
+    """Enumeration for how a due date estimates the year's receipts."""
+    RUN_RATE = "run-rate"  # Receipts so far scaled to the whole year by days elapsed
+    TO_DATE = "to-date"  # Receipts so far, as booked
+
+
+@dataclass(frozen=True, slots=True)
+class Invoice:
+    """A single invoice paid to a contractor."""
+
+    contractor_id: str
+    date: date
+    amount_paise: int
+    cash: bool = False
+    regime: TaxRegime | None = None  # Regime chosen by the contractor, if the invoice names one
+
+
+@dataclass(frozen=True, slots=True)
+class Installment:
+    """Advance tax asked of one contractor at one due date; all amounts in paise."""
+
+    contractor_id: str
+    due_date: date
+    regime: TaxRegime
+    receipts_paise: int
+    estimated_tax_paise: int
+    installment_paise: int
+    paid_paise: int
+    over_limit: bool
+
+
+@dataclass(frozen=True, slots=True)
+class LimitCrossing:
+    """A contractor's receipts passing the 44ADA limit with an invoice; amounts in paise."""
+
+    contractor_id: str
+    date: date
+    receipts_paise: int
+    limit_paise: int
+
+
+class _ContractorState:
+    """Year-to-date receipts of one contractor, in paise (presumptive income in ``1 / scale`` paise)."""
+
+    __slots__ = ("regime", "receipts", "cash_receipts", "presumptive_income", "paid", "over_limit")
+
+    def __init__(self, regime: TaxRegime) -> None:
+        self.regime = regime
+        self.receipts = 0
+        self.cash_receipts = 0
+        self.presumptive_income = 0
+        self.paid = 0
+        self.over_limit = False
+
+
+def fiscal_year_of(day: date) -> int:
+    """ :return calendar year in which the financial year containing day starts """
+    return day.year if day.month >= 4 else day.year - 1
+
+
+class AdvanceTaxScheduler:
+    """
+    Incremental advance tax installments for many contractors.
+
+    Feed invoices with ``apply`` and settle each due date with
+    ``close_due_date``, or stream a date-ordered invoice log through
+    ``process_log``.
+    """
+
+    def __init__(
+            self,
+            engine: TaxEngine | None = None,
+            default_regime: TaxRegime = TaxRegime.NEW,
+            schedule: InstallmentSchedule = InstallmentSchedule.PRESUMPTIVE,
+            projection: Projection = Projection.RUN_RATE,
+            fiscal_year: int | None = None
+    ) -> None:
+        """
+        Args:
+            engine: Engine holding the slab, cess and 44ADA rules (defaults to the built-in rules)
+            default_regime: Regime of contractors whose invoices do not name one
+            schedule: Due dates to settle
+            projection: How each due date estimates the year's receipts
+            fiscal_year: Year in which the financial year starts; taken from the first invoice when None
+        """
+        self.engine = engine or TaxEngine()
+        self.default_regime = default_regime
+        self.schedule = schedule
+        self.projection = projection
+        self.projections = 0  # Tax evaluations at due dates, for instrumentation
+        self._paise = self.engine.paise
+        self._presumptive_units = {regime: self._paise.presumptive_units(regime) for regime in TaxRegime}
+        self._contractors: dict[str, _ContractorState] = {}
+        self._next_due = 0
+        self._fiscal_year: int | None = None
+        self._due_dates: list[tuple[date, int]] = []
+        if fiscal_year is not None:
+            self._start_year(fiscal_year)
+
+    def _start_year(self, fiscal_year: int) -> None:
+        """Fix the financial year and its due dates."""
+        self._fiscal_year = fiscal_year
+        self._due_dates = [(date(fiscal_year + (month < 4), month, day), percent)
+                           for month, day, percent in self.schedule.due_dates]
+
+    @property
+    def fiscal_year(self) -> int | None:
+        """ :return year in which the financial year starts, or None before the first invoice """
+        return self._fiscal_year
+
+    @property
+    def contractor_count(self) -> int:
+        """ :return number of contractors seen so far """
+        return len(self._contractors)
+
+    @property
+    def next_due_date(self) -> date | None:
+        """ :return earliest due date not yet settled, or None once all are """
+        if self._next_due < len(self._due_dates):
+            return self._due_dates[self._next_due][0]
+        return None
+
+    def receipts(self, contractor_id: str) -> int:
+        """ :return receipts booked for contractor_id so far, in paise """
+        state = self._contractors.get(contractor_id)
+        if state is None:
+            raise KeyError(contractor_id)
+        return state.receipts
+
+    def apply(self, invoice: Invoice) -> LimitCrossing | None:
+        """
+        Book an invoice against its contractor's running totals.
+
+        Returns:
+            The crossing when this invoice takes the contractor past the 44ADA limit, else None
+
+        Raises:
+            ValueError: If the invoice is outside the financial year or dated on or before
+                a settled due date
+        """
+        if self._fiscal_year is None:
+            self._start_year(fiscal_year_of(invoice.date))
+        if fiscal_year_of(invoice.date) != self._fiscal_year:
+            raise ValueError(f"Invoice dated {invoice.date} is outside financial year "
+                             f"{self._fiscal_year}-{(self._fiscal_year + 1) % 100:02d}")
+        settled = self._due_dates[self._next_due - 1][0] if self._next_due else None
+        if settled is not None and invoice.date <= settled:
+            raise ValueError(f"Invoice dated {invoice.date} arrived after the {settled} installment "
+                             f"was settled")
+        amount = invoice.amount_paise
+
+        state = self._contractors.get(invoice.contractor_id)
+        if state is None:
+            state = self._contractors[invoice.contractor_id] = _ContractorState(
+                invoice.regime or self.default_regime)
+        elif invoice.regime is not None and invoice.regime != state.regime:
+            state.regime = invoice.regime
+            state.presumptive_income = state.receipts * self._presumptive_units[state.regime]
+
+        state.receipts += amount
+        state.presumptive_income += amount * self._presumptive_units[state.regime]
+        if invoice.cash:
+            state.cash_receipts += amount
+
+        if state.over_limit:
+            return None
+        low_cash = state.cash_receipts * 100 <= state.receipts * CASH_RECEIPTS_PERCENT
+        limit = RAISED_RECEIPTS_LIMIT_PAISE if low_cash else RECEIPTS_LIMIT_PAISE
+        if state.receipts <= limit:
+            return None
+        state.over_limit = True
+        return LimitCrossing(invoice.contractor_id, invoice.date, state.receipts, limit)
+
+    def close_due_date(self) -> Iterator[Installment]:
+        """
+        Settle the next due date for every contractor.
+
+        Installments are yielded one contractor at a time; the due date is
+        settled once the iterator is exhausted, so consume it fully.
+
+        Raises:
+            ValueError: If every due date is already settled or no invoice fixed the year
+        """
+        if self._fiscal_year is None:
+            raise ValueError("No financial year yet: pass fiscal_year or apply an invoice first")
+        if self._next_due >= len(self._due_dates):
+            raise ValueError("All due dates of the year are already settled")
+        due_date, percent = self._due_dates[self._next_due]
+
+        # Run-rate projection scales receipts to the year by the days elapsed up to the due date
+        year_start, year_end = date(self._fiscal_year, 4, 1), date(self._fiscal_year + 1, 3, 31)
+        elapsed_days = (due_date - year_start).days + 1
+        year_days = (year_end - year_start).days + 1
+        run_rate = self.projection == Projection.RUN_RATE
+        tax_on_presumptive = self._paise.freelancer_tax_on_presumptive
+        share_units = 100 * PAISE_PER_RUPEE
+
+        for contractor_id, state in self._contractors.items():
+            presumptive_income = state.presumptive_income
+            if run_rate:
+                presumptive_income = div_half_even(presumptive_income * year_days, elapsed_days)
+            tax = tax_on_presumptive(presumptive_income, state.regime)
+            self.projections += 1
+
+            # Cumulative share due by this date, in whole rupees, less what was already asked for
+            due = div_half_even(tax * percent, share_units) * PAISE_PER_RUPEE
+            installment = due - state.paid if tax >= ADVANCE_TAX_THRESHOLD_PAISE and due > state.paid else 0
+            state.paid += installment
+            yield Installment(contractor_id, due_date, state.regime, state.receipts, tax, installment,
+                              state.paid, state.over_limit)
+
+        self._next_due += 1
+
+    def process_log(self, invoices: Iterable[Invoice]) -> Iterator[Installment | LimitCrossing]:
+        """
+        Stream a date-ordered invoice log through the rest of the year.
+
+        A due date is settled as soon as an invoice dated after it arrives,
+        and every due date left is settled when the log ends.
+
+        Raises:
+            ValueError: If the log goes back to a settled due date or leaves the financial year
+        """
+        for invoice in invoices:
+            if self._fiscal_year is None:
+                self._start_year(fiscal_year_of(invoice.date))
+            next_due = self.next_due_date
+            while next_due is not None and invoice.date > next_due:
+                yield from self.close_due_date()
+                next_due = self.next_due_date
+            crossing = self.apply(invoice)
+            if crossing is not None:
+                yield crossing
+        while self._fiscal_year is not None and self._next_due < len(self._due_dates):
+            yield from self.close_due_date()
+
+
+def parse_invoice(row: dict[str, Any]) -> Invoice:
+    """
+    Build an invoice from an invoice-log row.
+
+    Rows need ``contractor_id``, ``date`` (YYYY-MM-DD) and a non-negative
+    ``amount_lakhs``, and may add ``cash`` (true/yes/1) and ``regime`` columns.
+
+    Raises:
+        ValueError: If the row could not be read, or a column is missing or invalid
+    """
+    if isinstance(row, MalformedRow):
+        raise ValueError(row.error)
+    for column in ("contractor_id", "date", "amount_lakhs"):
+        if not str(row.get(column) or "").strip():
+            raise ValueError(f"Missing column '{column}'")
+    amount = lakhs_to_paise(parse_amount_lakhs(row["amount_lakhs"]))
+
+    cash = str(row.get("cash") or "").strip().lower() in ("1", "true", "yes", "y")
+    regime = TaxRegime(str(row["regime"]).strip().lower()) if row.get("regime") else None
+    return Invoice(str(row["contractor_id"]).strip(), date.fromisoformat(str(row["date"]).strip()), amount,
+                   cash, regime)
+
+
+def notice_row(notice: Installment | LimitCrossing) -> dict[str, Any]:
+    """ :return output row for an installment or a limit crossing, amounts in rupees """
+    if isinstance(notice, LimitCrossing):
+        return {
+            "contractor_id": notice.contractor_id,
+            "date": notice.date.isoformat(),
+            "event": "receipts_limit_crossed",
+            "regime": "",
+            "receipts_rupees": paise_to_rupees(notice.receipts_paise),
+            "estimated_tax_rupees": "",
+            "installment_rupees": "",
+            "paid_rupees": "",
+            "over_limit": True,
+        }
+    return {
+        "contractor_id": notice.contractor_id,
+        "date": notice.due_date.isoformat(),
+        "event": "installment",
+        "regime": notice.regime.value,
+        "receipts_rupees": paise_to_rupees(notice.receipts_paise),
+        "estimated_tax_rupees": paise_to_rupees(notice.estimated_tax_paise),
+        "installment_rupees": paise_to_rupees(notice.installment_paise),
+        "paid_rupees": paise_to_rupees(notice.paid_paise),
+        "over_limit": notice.over_limit,
+    }
+
+
+def schedule_invoices(
+        scheduler: AdvanceTaxScheduler,
+        rows: Iterable[dict[str, Any]],
+        writer: RowWriter,
+        errors: IO[str] | None = None
+) -> int:
+    """
+    Stream invoice-log rows through a scheduler and write every installment and limit crossing.
+
+    Invalid rows are reported to ``errors`` (stderr by default) and skipped.
+
+    Returns:
+        Number of skipped rows
+    """
+    errors = errors or sys.stderr
+    skipped = 0
+
+    def invoices() -> Iterator[Invoice]:
+        nonlocal skipped
+        for line_number, row in enumerate(rows, start=1):
+            try:
+                yield parse_invoice(row)
+            except (ValueError, KeyError, AttributeError) as e:
+                skipped += 1
+                print(f"Invoice {line_number}: {e}", file=errors)
+
+    for notice in scheduler.process_log(invoices()):
+        writer.write(notice_row(notice))
+    return skipped
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m calculator.advance_tax``."""
+    parser = argparse.ArgumentParser(description="Advance tax installments from a 44ADA invoice log.")
+    parser.add_argument("input", help="Date-ordered CSV/JSONL invoice log ('-' for stdin)")
+    parser.add_argument("--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                        default=TaxRegime.NEW.value,
+                        help="Regime of contractors whose invoices do not name one")
+    parser.add_argument("--assessment-year",
+                        help="Use the shipped rules of this assessment year (and its financial year)")
+    parser.add_argument("--schedule", choices=[schedule.value for schedule in InstallmentSchedule],
+                        default=InstallmentSchedule.PRESUMPTIVE.value,
+                        help="Due dates: presumptive (all by 15 March) or standard (four installments)")
+    parser.add_argument("--projection", choices=[projection.value for projection in Projection],
+                        default=Projection.RUN_RATE.value,
+                        help="Estimate the year's receipts from the run rate or as booked so far")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or _detect_format(args.input)
+    output_format = args.output_format or (
+        _detect_format(args.output) if args.output != "-" else input_format
+    )
+    engine = fiscal_year = None
+    if args.assessment_year:
+        try:
+            assessment_year = normalise_assessment_year(args.assessment_year)
+            engine = engine_for(assessment_year)
+        except RuleSetError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        fiscal_year = int(assessment_year[:4]) - 1
+
+    scheduler = AdvanceTaxScheduler(engine, TaxRegime(args.regime), InstallmentSchedule(args.schedule),
+                                    Projection(args.projection), fiscal_year)
+    started = time.perf_counter()
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = RowWriter(sink, output_format)
+        if args.input == "-":
+            skipped = schedule_invoices(scheduler, read_rows(sys.stdin, input_format), writer)
+        else:
+            with open(args.input, newline="", encoding="utf-8") as source:
+                skipped = schedule_invoices(scheduler, read_rows(source, input_format), writer)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Scheduled {scheduler.contractor_count:,} contractors ({scheduler.projections:,} tax estimates, "
+          f"{skipped} invoices skipped) in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so enums match the ones used by other modules
+    from calculator import advance_tax
+    sys.exit(advance_tax.main())
@@ -0,0 +1,494 @@
+"""
+Population totals from a weighted sample or a histogram of gross amounts.
+
+Tax and net salary are exact piecewise-linear functions of the gross
+amount (``TaxEngine.salary_tax_curve``, ``net_salary_curve`` and
+``freelancer_tax_curve``). Summed over everyone in a segment, a linear
+piece only needs two numbers of the population: how many people earn
+inside it and what they earn in total. A distribution answers both for
+any gross range:
+
+    * ``WeightedSample`` sorts the amounts once and keeps running sums,
+      so its totals are the exact (unrounded) sum over every row;
+    * ``SalaryHistogram`` spreads each bin's count evenly across the bin
+      and integrates the curves over it.
+
+Totals for an engine then cost one bisect per curve segment, whatever the
+population size, so what-if variants of the slab, cess and deduction
+rules can be compared side by side. ``PopulationEstimator.exact_totals``
+recomputes a sample row by row through the paise backend for validation.
+
+Usage:
+    python -m calculator.aggregate payroll.csv --variant current=2025-26 --variant draft=draft.toml
+    python -m calculator.aggregate bins.csv --histogram --exact
+"""
+import argparse
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from fractions import Fraction
+from itertools import accumulate
+from math import ceil
+from operator import mul
+
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import (PAISE_PER_LAKH, PAISE_PER_RUPEE, div_half_even, lakhs_to_paise, paise_to_lakhs,
+                              parse_amount_lakhs)
+from calculator.piecewise import PiecewiseLinear
+
+# Rows per paise backend call in exact mode, to bound the size of the result columns
+_EXACT_CHUNK_ROWS = 1 << 18
+
+
+def _round_paise(amount: Fraction) -> int:
+    """ :return exact paise amount rounded half-even to the paisa """
+    return div_half_even(amount.numerator, amount.denominator)
+
+
+class WeightedSample:
+    """
+    Gross amounts with integer weights (employees per row), sorted once.
+
+    Running sums of weights and weighted amounts make the headcount and
+    total gross below any amount a single bisect.
+    """
+
+    __slots__ = ("amounts_paise", "weights", "_employees", "_gross")
+
+    def __init__(self, amounts_paise: Iterable[int], weights: Iterable[int] | None = None) -> None:
+        """
+        Args:
+            amounts_paise: Gross salaries or receipts in paise
+            weights: Employees each amount stands for; one each when None
+
+        Raises:
+            ValueError: If an amount or weight is negative, or the lengths differ
+        """
+        if weights is None:
+            self.amounts_paise = array('q', sorted(amounts_paise))
+            self.weights = array('q', [1]) * len(self.amounts_paise)
+        else:
+            amounts, weights = list(amounts_paise), list(weights)
+            if len(amounts) != len(weights):
+                raise ValueError(f"Got {len(amounts)} amounts but {len(weights)} weights")
+            pairs = sorted(zip(amounts, weights))
+            self.amounts_paise = array('q', (amount for amount, _ in pairs))
+            self.weights = array('q', (weight for _, weight in pairs))
+            if self.weights and min(self.weights) < 0:
+                raise ValueError("Weights cannot be negative")
+        if self.amounts_paise and self.amounts_paise[0] < 0:
+            raise ValueError("Gross amounts cannot be negative")
+
+        # Index i holds the employees and total gross of the first i rows
+        self._employees = array('q', accumulate(self.weights, initial=0))
+        try:
+            self._gross = array('q', accumulate(map(mul, self.amounts_paise, self.weights), initial=0))
+        except OverflowError:
+            raise ValueError("Total gross of the sample does not fit in 64-bit paise") from None
+
+    @classmethod
+    def from_lakhs(
+            cls,
+            amounts_lakhs: Iterable[Decimal | float | str],
+            weights: Iterable[int] | None = None
+    ) -> 'WeightedSample':
+        """ :return sample of amounts given in lakhs (rounded half-even to the paisa) """
+        return cls(map(lakhs_to_paise, amounts_lakhs), weights)
+
+    def __len__(self) -> int:
+        return len(self.amounts_paise)
+
+    @property
+    def employees(self) -> int:
+        """ :return total weight of the sample """
+        return self._employees[-1]
+
+    def cumulative(self, paise: Fraction) -> tuple[int, int]:
+        """ :return employees and their total gross (in paise) among amounts below paise """
+        index = bisect_left(self.amounts_paise, ceil(paise))
+        return self._employees[index], self._gross[index]
+
+    def total(self) -> tuple[int, int]:
+        """ :return employees and total gross (in paise) of the whole sample """
+        return self._employees[-1], self._gross[-1]
+
+
+class SalaryHistogram:
+    """
+    Employee counts per gross band, spread evenly within each band.
+
+    Totals integrate the curves over every band exactly, so they differ
+    from the population's true totals only by how far the people in a
+    band sit from an even spread.
+    """
+
+    __slots__ = ("edges_paise", "counts", "_employees", "_doubled_gross")
+
+    def __init__(self, edges_paise: Sequence[int], counts: Sequence[int]) -> None:
+        """
+        Args:
+            edges_paise: Increasing band edges in paise; band i is [edges[i], edges[i + 1])
+            counts: Employees per band, one fewer than the edges
+
+        Raises:
+            ValueError: If the edges do not increase, start below zero or do not match the counts
+        """
+        if len(edges_paise) != len(counts) + 1:
+            raise ValueError(f"{len(counts)} bands need {len(counts) + 1} edges, got {len(edges_paise)}")
+        if edges_paise[0] < 0:
+            raise ValueError("Band edges cannot be negative")
+        if any(lower >= upper for lower, upper in zip(edges_paise, edges_paise[1:])):
+            raise ValueError("Band edges must increase")
+        if any(count < 0 for count in counts):
+            raise ValueError("Band counts cannot be negative")
+        self.edges_paise = tuple(edges_paise)
+        self.counts = tuple(counts)
+        # Running totals at each edge; gross is doubled so a band's even spread stays an integer
+        self._employees = list(accumulate(self.counts, initial=0))
+        self._doubled_gross = list(accumulate(
+            (count * (lower + upper) for count, lower, upper in zip(self.counts, self.edges_paise,
+                                                                     self.edges_paise[1:])),
+            initial=0
+        ))
+
+    @classmethod
+    def from_amounts(cls, amounts_paise: Iterable[int], width_paise: int) -> 'SalaryHistogram':
+        """
+        Bin gross amounts into bands of equal width starting at zero.
+
+        Args:
+            amounts_paise: Non-negative gross amounts in paise
+            width_paise: Positive band width
+
+        Returns:
+            Histogram whose bands cover every amount
+        """
+        if width_paise <= 0:
+            raise ValueError("Band width must be positive")
+        counts: list[int] = []
+        for amount in amounts_paise:
+            if amount < 0:
+                raise ValueError("Gross amounts cannot be negative")
+            band = amount // width_paise
+            if band >= len(counts):
+                counts.extend([0] * (band + 1 - len(counts)))
+            counts[band] += 1
+        return cls(range(0, (len(counts) + 1) * width_paise, width_paise), counts)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def employees(self) -> int:
+        """ :return total count of the histogram """
+        return self._employees[-1]
+
+    def cumulative(self, paise: Fraction) -> tuple[Fraction, Fraction]:
+        """ :return employees and their total gross (in paise) below paise, under an even spread """
+        edges = self.edges_paise
+        band = bisect_right(edges, paise) - 1
+        if band < 0:
+            return Fraction(0), Fraction(0)
+        if band >= len(self.counts):
+            return Fraction(self._employees[-1]), Fraction(self._doubled_gross[-1], 2)
+        lower = edges[band]
+        share = Fraction(self.counts[band]) * (paise - lower) / (edges[band + 1] - lower)
+        return (self._employees[band] + share,
+                Fraction(self._doubled_gross[band], 2) + share * (lower + paise) / 2)
+
+    def total(self) -> tuple[int, Fraction]:
+        """ :return employees and total gross (in paise) of the whole histogram """
+        return self._employees[-1], Fraction(self._doubled_gross[-1], 2)
+
+
+@dataclass(frozen=True, slots=True)
+class PopulationTotals:
+    """Totals of one rule variant and regime over a population, in paise."""
+
+    variant: str
+    regime: TaxRegime
+    employees: int
+    gross_paise: int
+    tax_paise: int
+    # Net salary, or net income for freelancers
+    net_paise: int
+
+
+class PopulationEstimator:
+    """
+    Totals of tax and take-home over a salary or freelancer population.
+
+    Build it once per population; every ``totals`` call afterwards costs
+    a pass over the engine's curve segments, not over the employees.
+    """
+
+    __slots__ = ("distribution", "freelancer")
+
+    def __init__(self, distribution: WeightedSample | SalaryHistogram, freelancer: bool = False) -> None:
+        """
+        Args:
+            distribution: Gross salaries, or gross receipts when freelancer is True
+            freelancer: Total ``calculate_freelancer_tax`` instead of ``calculate_net_salary``
+        """
+        self.distribution = distribution
+        self.freelancer = freelancer
+
+    def _integrate(self, curve: PiecewiseLinear) -> Fraction:
+        """ :return sum of curve (rupees in, rupees out) over the distribution, in paise """
+        distribution = self.distribution
+        segments = curve.segments
+        total = Fraction(0)
+        employees, gross = distribution.cumulative(segments[0].start * PAISE_PER_RUPEE)
+        for segment, following in zip(segments, [*segments[1:], None]):
+            if following is None:
+                upper_employees, upper_gross = distribution.total()
+            else:
+                upper_employees, upper_gross = distribution.cumulative(following.start * PAISE_PER_RUPEE)
+            # The slope is per rupee of gross and gross is in paise; the intercept is in rupees
+            total += (segment.slope * (upper_gross - gross)
+                      + segment.intercept * PAISE_PER_RUPEE * (upper_employees - employees))
+            employees, gross = upper_employees, upper_gross
+        return total
+
+    def totals(self, engine: TaxEngine, regime: TaxRegime, variant: str = "default") -> PopulationTotals:
+        """
+        Total gross, tax and take-home of the population under one engine.
+
+        Args:
+            engine: Engine holding the rule variant
+            regime: Tax regime everyone is assessed under
+            variant: Name reported with the totals
+
+        Returns:
+            Exact totals rounded half-even to the paisa; for a sample, each
+            lies within half a paisa per employee of the sum of rounded
+            per-row results
+        """
+        employees, gross = self.distribution.total()
+        if self.freelancer:
+            tax = self._integrate(engine.freelancer_tax_curve(regime))
+            net = gross - tax
+        else:
+            tax = self._integrate(engine.salary_tax_curve(regime))
+            net = self._integrate(engine.net_salary_curve(regime))
+        return PopulationTotals(variant, regime, employees, _round_paise(Fraction(gross)), _round_paise(tax),
+                                _round_paise(net))
+
+    def compare(
+            self,
+            variants: Mapping[str, TaxEngine],
+            regimes: Iterable[TaxRegime] = tuple(TaxRegime)
+    ) -> list[PopulationTotals]:
+        """
+        Totals of every rule variant under every regime, side by side.
+
+        Args:
+            variants: Engines keyed by the name to report
+            regimes: Regimes to total each variant under
+
+        Returns:
+            One record per variant and regime, variants in mapping order
+        """
+        regimes = tuple(regimes)
+        return [self.totals(engine, regime, name) for name, engine in variants.items() for regime in regimes]
+
+    def exact_totals(
+            self,
+            engine: TaxEngine,
+            regime: TaxRegime,
+            variant: str = "default"
+    ) -> PopulationTotals:
+        """
+        Totals of a sample evaluated row by row, for validating ``totals``.
+
+        Every row goes through the engine's paise backend and its rounded
+        tax and take-home are summed with their weights.
+
+        Raises:
+            ValueError: If the distribution is a histogram, which has no rows
+        """
+        sample = self.distribution
+        if not isinstance(sample, WeightedSample):
+            raise ValueError("Exact totals need a weighted sample, not a histogram")
+        if self.freelancer:
+            calculate, tax_field, net_field = engine.paise.calculate_freelancer_tax_batch, "tax", "net_income"
+        else:
+            calculate, tax_field, net_field = engine.paise.calculate_net_salary_batch, "tax", "net_salary"
+
+        tax = net = 0
+        for offset in range(0, len(sample), _EXACT_CHUNK_ROWS):
+            amounts = sample.amounts_paise[offset:offset + _EXACT_CHUNK_ROWS]
+            weights = sample.weights[offset:offset + _EXACT_CHUNK_ROWS]
+            columns = calculate(amounts, regime)
+            tax += sum(map(mul, columns.column(tax_field), weights))
+            net += sum(map(mul, columns.column(net_field), weights))
+        employees, gross = sample.total()
+        return PopulationTotals(variant, regime, employees, gross, tax, net)
+
+
+def _variant_engine(source: str) -> TaxEngine:
+    """ :return engine of a variant source: "builtin", an assessment year or a rule set file """
+    from calculator.rulesets import engine_for, read_rule_set
+
+    if source == "builtin":
+        return TaxEngine()
+    if source.endswith((".toml", ".json")):
+        return read_rule_set(source).engine()
+    return engine_for(source)
+
+
+def parse_variants(specs: Sequence[str]) -> dict[str, TaxEngine]:
+    """
+    Build the engines of ``--variant`` options.
+
+    Args:
+        specs: ``NAME=SOURCE`` or ``SOURCE`` strings, where SOURCE is "builtin",
+            an assessment year such as 2025-26 or a TOML/JSON rule set file
+
+    Returns:
+        Engines keyed by variant name, in option order; the built-in rules when specs is empty
+    """
+    variants: dict[str, TaxEngine] = {}
+    for spec in specs or ["builtin"]:
+        name, _, source = spec.rpartition("=")
+        name = name or source
+        if name in variants:
+            raise ValueError(f"Variant '{name}' is given twice")
+        variants[name] = _variant_engine(source)
+    return variants
+
+
+def read_distribution(path: str, histogram: bool, freelancer: bool) -> WeightedSample | SalaryHistogram:
+    """
+    Read a population from a file.
+
+    Args:
+        path: Payroll ``.bin`` file, or CSV/JSONL rows: either an amount column
+            (``gross_salary_lakhs`` or ``gross_receipts_lakhs``) with an optional
+            ``weight`` column, or ``lower_lakhs``, ``upper_lakhs`` and ``employees``
+            columns when histogram is True
+        histogram: Read bands instead of individual amounts
+        freelancer: Read gross receipts instead of gross salaries
+
+    Returns:
+        The sample or histogram
+
+    Raises:
+        ValueError: If a row has a missing or invalid column, naming the row
+    """
+    from calculator.batch import BatchMode, MalformedRow, _detect_format, read_rows
+
+    if path.endswith(".bin"):
+        if histogram:
+            raise ValueError("Binary payroll files hold employees, not histogram bands")
+        from calculator.binary import PAYROLL_KIND, ColumnFile
+
+        with ColumnFile(path, PAYROLL_KIND) as payroll:
+            gross, flags = payroll.column("gross_paise"), payroll.column("freelancer")
+            return WeightedSample([amount for amount, flag in zip(gross, flags) if flag == freelancer])
+
+    field = (BatchMode.FREELANCER if freelancer else BatchMode.SALARY).amount_column
+    with open(path, newline="", encoding="utf-8") as stream:
+        bands, amounts, weights = [], [], []
+        for row_number, row in enumerate(read_rows(stream, _detect_format(path)), start=1):
+            try:
+                if isinstance(row, MalformedRow):
+                    raise ValueError(row.error)
+                if histogram:
+                    bands.append((lakhs_to_paise(parse_amount_lakhs(row["lower_lakhs"])),
+                                  lakhs_to_paise(parse_amount_lakhs(row["upper_lakhs"])),
+                                  int(row["employees"])))
+                else:
+                    amounts.append(lakhs_to_paise(parse_amount_lakhs(row[field])))
+                    weights.append(int(row.get("weight") or 1))
+            except KeyError as e:
+                raise ValueError(f"{path} row {row_number}: missing column {e}") from None
+            except (ArithmeticError, ValueError) as e:
+                raise ValueError(f"{path} row {row_number}: {e}") from None
+
+    if histogram:
+        bands.sort()
+        if any(upper != lower for (_, upper, _), (lower, _, _) in zip(bands, bands[1:])):
+            raise ValueError(f"Histogram bands in {path} must be contiguous")
+        return SalaryHistogram([lower for lower, _, _ in bands[:1]] + [upper for _, upper, _ in bands],
+                               [count for _, _, count in bands])
+    return WeightedSample(amounts, weights)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for population totals."""
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.aggregate",
+        description="Total tax and take-home of a payroll population under one or more rule variants."
+    )
+    parser.add_argument("input", help="CSV/JSONL rows or a payroll .bin file")
+    parser.add_argument("--variant", action="append", default=[], metavar="[NAME=]SOURCE",
+                        help="Rules to total under: 'builtin', an assessment year or a rule set file "
+                             "(repeatable; default builtin)")
+    parser.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                        help="Only this regime (default: both)")
+    parser.add_argument("--freelancer", action="store_true",
+                        help="Total freelancer tax over gross receipts instead of salaries")
+    parser.add_argument("--histogram", action="store_true",
+                        help="Rows are bands: lower_lakhs, upper_lakhs, employees")
+    parser.add_argument("--exact", action="store_true",
+                        help="Also evaluate every row through the paise backend and report the difference")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m calculator.aggregate``."""
+    args = build_parser().parse_args(argv)
+    regimes = (TaxRegime(args.regime),) if args.regime else tuple(TaxRegime)
+    if args.exact and args.histogram:
+        print("❌ Exact totals need individual rows, not histogram bands", file=sys.stderr)
+        return 2
+
+    try:
+        started = time.perf_counter()
+        distribution = read_distribution(args.input, args.histogram, args.freelancer)
+        read_seconds = time.perf_counter() - started
+        variants = parse_variants(args.variant)
+    except (OSError, KeyError, ValueError, ArithmeticError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    estimator = PopulationEstimator(distribution, args.freelancer)
+    started = time.perf_counter()
+    totals = estimator.compare(variants, regimes)
+    total_seconds = time.perf_counter() - started
+
+    net_label = "Net income" if args.freelancer else "Net salary"
+    print(f"{'Variant':<16} {'Regime':<7} {'Employees':>12} {'Gross (lakh)':>16} {'Tax (lakh)':>14} "
+          f"{net_label + ' (lakh)':>20}")
+    for row in totals:
+        print(f"{row.variant:<16} {row.regime.name:<7} {row.employees:>12,} "
+              f"{paise_to_lakhs(row.gross_paise):>16,} {paise_to_lakhs(row.tax_paise):>14,} "
+              f"{paise_to_lakhs(row.net_paise):>20,}")
+    print(f"Read {distribution.employees:,} employees in {read_seconds:.2f}s; "
+          f"totalled {len(totals)} variant/regime pairs in {total_seconds * 1000:.1f}ms", file=sys.stderr)
+
+    if args.exact:
+        started = time.perf_counter()
+        # Each row's rounded amounts are within half a paisa of its exact share
+        tolerance = (distribution.employees + 1) // 2
+        worst = 0
+        for row in totals:
+            exact = estimator.exact_totals(variants[row.variant], row.regime, row.variant)
+            worst = max(worst, abs(exact.tax_paise - row.tax_paise), abs(exact.net_paise - row.net_paise))
+        print(f"Per-row check in {time.perf_counter() - started:.2f}s: largest difference "
+              f"{worst / PAISE_PER_LAKH:.5f} lakh (tolerance {tolerance / PAISE_PER_LAKH:.5f})",
+              file=sys.stderr)
+        if worst > tolerance:
+            print("❌ Binned totals disagree with per-row evaluation", file=sys.stderr)
+            return 1
+        print("✅ Binned totals match per-row evaluation", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
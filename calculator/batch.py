@@ -0,0 +1,337 @@
+"""
+Non-interactive batch runner for payroll files.
+
+Streams salary or freelancer rows from a CSV or JSONL file, calculates each
+row and writes the result immediately, so memory use stays constant no
+matter how large the input is.
+
+Usage:
+    python -m calculator.batch --regime new --output results.csv input.csv
+    python -m calculator.batch --mode freelancer input.jsonl
+    python -m calculator.batch --workers 8 --output results.csv input.csv
+    python -m calculator.batch --assessment-year 2025-26 --regime new input.csv
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import IO, Any
+
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import parse_amount_lakhs
+from calculator.results import FREELANCER_TAX_FIELDS, NET_SALARY_FIELDS
+from calculator.rulesets import engine_for, normalise_assessment_year
+
+# Largest and smallest shard of a parallel run; within those bounds shards are sized from the file
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+
+
+class BatchMode(Enum):
+    """Enumeration for the calculation applied to every row."""
+    SALARY = "salary"
+    FREELANCER = "freelancer"
+
+    @property
+    def amount_column(self) -> str:
+        """ :return input column holding the amount in lakhs """
+        return "gross_salary_lakhs" if self == BatchMode.SALARY else "gross_receipts_lakhs"
+
+    @property
+    def output_columns(self) -> list[str]:
+        """ :return CSV header of every output row: id, regime, assessment year and the results in lakhs """
+        fields = NET_SALARY_FIELDS if self == BatchMode.SALARY else FREELANCER_TAX_FIELDS
+        return ["id", "regime", "assessment_year", *(f"{name}_lakhs" for name in fields)]
+
+
+@dataclass(slots=True)
+class BatchStats:
+    """Counters collected while running a batch."""
+
+    rows: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """ :return processed rows per second """
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def _detect_format(path: str) -> str:
+    """Infer the file format from its extension."""
+    return "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+class MalformedRow(dict):
+    """
+    Empty row standing in for an input line that could not be parsed.
+
+    Yielded in place of the line so that readers report and skip it like
+    any other invalid row instead of stopping the stream.
+    """
+
+    def __init__(self, error: str) -> None:
+        super().__init__()
+        self.error = error
+
+
+def read_rows(
+        stream: Iterable[str],
+        file_format: str,
+        fieldnames: list[str] | None = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Lazily read rows from a CSV or JSONL stream.
+
+    Args:
+        stream: Open text stream or any iterable of lines
+        file_format: Either "csv" or "jsonl"
+        fieldnames: CSV header to use when the stream does not start with one
+
+    Yields:
+        One dictionary per input row; a ``MalformedRow`` for a JSONL line that is not a JSON object
+    """
+    if file_format == "csv":
+        yield from csv.DictReader(stream, fieldnames=fieldnames)
+        return
+
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line, parse_float=Decimal)
+        except json.JSONDecodeError as e:
+            yield MalformedRow(f"Invalid JSON: {e}")
+            continue
+        yield row if isinstance(row, dict) else MalformedRow("Expected a JSON object")
+
+
+class RowWriter:
+    """
+    Incremental CSV/JSONL writer.
+
+    The CSV header is ``fieldnames`` when given, else the first row's keys.
+    With fixed field names, columns a row lacks are written empty, so rows
+    may carry optional columns such as ``assessment_year``.
+    """
+
+    def __init__(
+            self,
+            stream: IO[str],
+            file_format: str,
+            write_header: bool = True,
+            fieldnames: list[str] | None = None
+    ) -> None:
+        self.stream = stream
+        self.file_format = file_format
+        self.write_header = write_header
+        self.fieldnames = fieldnames
+        self._csv_writer: csv.DictWriter | None = None
+
+    def write(self, row: dict[str, Any]) -> None:
+        """Write a single result row."""
+        if self.file_format == "jsonl":
+            self.stream.write(json.dumps(row, default=str) + "\n")
+            return
+
+        if self._csv_writer is None:
+            self._csv_writer = csv.DictWriter(self.stream, fieldnames=self.fieldnames or list(row), restval="")
+            if self.write_header:
+                self._csv_writer.writeheader()
+        self._csv_writer.writerow(row)
+
+
+def calculate_row(
+        calculator: TaxEngine,
+        row: dict[str, Any],
+        mode: BatchMode,
+        regime: TaxRegime,
+        assessment_year: str | None = None
+) -> dict[str, Any]:
+    """
+    Calculate a single input row.
+
+    An optional ``id`` column is carried through, an optional ``regime``
+    column ("old"/"new") overrides the batch regime for that row and an
+    optional ``assessment_year`` column (e.g. "2025-26") selects that
+    year's shipped rule set.
+
+    Args:
+        calculator: Tax engine to use for rows without an assessment year
+        row: Parsed input row
+        mode: Calculation to apply
+        regime: Default tax regime
+        assessment_year: Default assessment year (None uses calculator)
+
+    Returns:
+        Output row with the calculation results
+
+    Raises:
+        ValueError: If the row is malformed, is missing its amount or has an invalid value
+            (including amounts that are not finite, negative or above ``MAX_AMOUNT_LAKHS``)
+    """
+    if isinstance(row, MalformedRow):
+        raise ValueError(row.error)
+    if mode.amount_column not in row:
+        raise ValueError(f"Missing column '{mode.amount_column}'")
+    amount = parse_amount_lakhs(row[mode.amount_column])
+
+    row_regime = TaxRegime(str(row["regime"]).strip().lower()) if row.get("regime") else regime
+    row_year = str(row.get("assessment_year") or "").strip() or assessment_year
+    if row_year:
+        row_year = normalise_assessment_year(row_year)
+        calculator = engine_for(row_year)
+    if mode == BatchMode.SALARY:
+        result = calculator.calculate_net_salary(amount, row_regime)
+    else:
+        result = calculator.calculate_freelancer_tax(amount, row_regime)
+
+    output: dict[str, Any] = {"id": row.get("id"), "regime": row_regime.value}
+    if assessment_year or "assessment_year" in row:
+        output["assessment_year"] = row_year or ""
+    output.update(result)
+    return output
+
+
+def process_rows(
+        rows: Iterable[dict[str, Any]],
+        writer: RowWriter,
+        mode: BatchMode,
+        regime: TaxRegime,
+        calculator: TaxEngine | None = None,
+        errors: IO[str] | None = None,
+        label: str = "Row",
+        assessment_year: str | None = None
+) -> BatchStats:
+    """
+    Calculate every row and hand the results to writer as they are produced.
+
+    Invalid rows are reported on ``errors`` (stderr by default) and skipped.
+
+    Returns:
+        Statistics for the run
+    """
+    calculator = calculator or TaxEngine()
+    errors = errors or sys.stderr
+    stats = BatchStats()
+    started = time.perf_counter()
+
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            writer.write(calculate_row(calculator, row, mode, regime, assessment_year))
+        except ValueError as e:
+            stats.skipped += 1
+            print(f"{label} {row_number}: {e}", file=errors)
+            continue
+        stats.rows += 1
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def process_stream(
+        source: IO[str],
+        sink: IO[str],
+        mode: BatchMode,
+        regime: TaxRegime,
+        input_format: str,
+        output_format: str,
+        calculator: TaxEngine | None = None,
+        errors: IO[str] | None = None,
+        assessment_year: str | None = None
+) -> BatchStats:
+    """
+    Stream rows from source to sink, calculating each one.
+
+    Returns:
+        Statistics for the run
+    """
+    return process_rows(
+        read_rows(source, input_format), RowWriter(sink, output_format, fieldnames=mode.output_columns),
+        mode, regime, calculator, errors, assessment_year=assessment_year
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for the batch runner."""
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.batch",
+        description="Calculate tax for every row of a CSV or JSONL payroll file."
+    )
+    parser.add_argument("input", help="Input CSV or JSONL file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                        default=TaxRegime.OLD.value, help="Default tax regime")
+    parser.add_argument("--assessment-year",
+                        help="Use the shipped rules of this assessment year, e.g. 2025-26")
+    parser.add_argument("--mode", choices=[mode.value for mode in BatchMode],
+                        default=BatchMode.SALARY.value, help="Calculation to run per row")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"],
+                        help="Input format (inferred from the extension by default)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"],
+                        help="Output format (defaults to the input format)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; above 1 the input file is split into shards")
+    parser.add_argument("--chunk-size", type=int,
+                        help="Shard size in bytes for parallel runs (default: about four shards per worker, "
+                             "at most 32 MB)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m calculator.batch``."""
+    args = build_parser().parse_args(argv)
+    mode, regime = BatchMode(args.mode), TaxRegime(args.regime)
+    input_format = args.input_format or _detect_format(args.input)
+    output_format = args.output_format or (
+        _detect_format(args.output) if args.output != "-" else input_format
+    )
+
+    if args.assessment_year:
+        try:
+            args.assessment_year = normalise_assessment_year(args.assessment_year)
+            engine_for(args.assessment_year)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+
+    if args.workers > 1 and args.input == "-":
+        print("❌ Parallel runs need an input file, not stdin", file=sys.stderr)
+        return 2
+
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        if args.workers > 1:
+            # Imported here so the sequential path does not pay for multiprocessing
+            from calculator.parallel import run_parallel
+            stats = run_parallel(
+                args.input, sink, mode, regime, input_format, output_format,
+                workers=args.workers, chunk_size=args.chunk_size, assessment_year=args.assessment_year
+            )
+        elif args.input == "-":
+            stats = process_stream(sys.stdin, sink, mode, regime, input_format, output_format,
+                                   assessment_year=args.assessment_year)
+        else:
+            with open(args.input, newline="", encoding="utf-8") as source:
+                stats = process_stream(source, sink, mode, regime, input_format, output_format,
+                                       assessment_year=args.assessment_year)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"Processed {stats.rows} rows ({stats.skipped} skipped) in "
+          f"{stats.elapsed_seconds:.2f}s — {stats.rows_per_second:,.0f} rows/sec", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so enums match the ones used by worker processes
+    from calculator import batch
+    sys.exit(batch.main())
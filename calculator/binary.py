@@ -0,0 +1,556 @@
+"""
+Columnar binary format for payroll datasets and their results.
+
+A file is a fixed header, a column directory and one contiguous,
+8-byte-aligned block per column, all little-endian:
+
+    header     "TAXCOLS1", kind (16 bytes, e.g. "payroll"), version,
+               column count, row count                          48 bytes
+    directory  per column: name (32 bytes), typecode ("q" int64 or
+               "B" uint8), byte offset of its data              48 bytes each
+    data       column blocks in directory order
+
+Payroll files hold one record per employee (employee id, gross amount in
+paise, regime code, freelancer flag); result files hold the employee id,
+regime, freelancer flag and the amounts every calculation shares, in
+paise. ``ColumnFile`` memory-maps a file and hands out every column as a
+zero-copy ``memoryview`` (or NumPy array), so no text is parsed.
+``ColumnFileWriter`` spools columns to temporary files while rows arrive,
+keeping memory constant however large the dataset grows.
+
+Usage:
+    python -m calculator.binary from-csv payroll.csv payroll.bin --regime new
+    python -m calculator.binary run payroll.bin results.bin --assessment-year 2025-26
+    python -m calculator.binary to-csv results.bin --output results.csv
+"""
+import argparse
+import csv
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import IO, Any
+
+from calculator.batch import BatchMode, BatchStats, _detect_format, read_rows
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import PAISE_PER_LAKH, format_rupees, lakhs_to_paise
+from calculator.rulesets import engine_for, normalise_assessment_year
+
+MAGIC = b"TAXCOLS1"
+VERSION = 1
+PAYROLL_KIND = "payroll"
+RESULTS_KIND = "results"
+
+PAYROLL_SCHEMA = (("employee_id", "q"), ("gross_paise", "q"), ("regime", "B"), ("freelancer", "B"))
+# Amounts both calculations produce: gross salary or receipts, and net salary or net income
+RESULT_FIELDS = ("gross", "taxable_income", "tax", "net", "monthly_take_home")
+RESULTS_SCHEMA = (("employee_id", "q"), ("regime", "B"), ("freelancer", "B"),
+                  *((f"{name}_paise", "q") for name in RESULT_FIELDS))
+
+REGIME_CODES = {TaxRegime.OLD: 0, TaxRegime.NEW: 1}
+CHUNK_ROWS = 1 << 20
+
+_HEADER = struct.Struct("<8s16sIIQ8x")
+_COLUMN = struct.Struct("<32sc7xQ")
+_ALIGNMENT = 8
+_REGIMES = {code: regime for regime, code in REGIME_CODES.items()}
+# ResultColumns field names of the salary (0) and freelancer (1) calculations, in RESULT_FIELDS order
+_SOURCE_FIELDS = {
+    0: ("gross_salary", "taxable_income", "tax", "net_salary", "monthly_take_home"),
+    1: ("gross_receipts", "taxable_income", "tax", "net_income", "monthly_take_home"),
+}
+
+
+class BinaryFormatError(ValueError):
+    """Raised when a file is not a valid column file of the expected kind."""
+
+
+def _check_byte_order() -> None:
+    """Columns are mapped as native integers, so the host must be little-endian like the format."""
+    if sys.byteorder != "little":
+        raise BinaryFormatError("Column files can only be read and written on little-endian hosts")
+
+
+def _aligned(offset: int) -> int:
+    """ :return offset rounded up to the column alignment """
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class ColumnFileWriter:
+    """
+    Incremental writer of a column file.
+
+    Rows are buffered per column and spooled to temporary files every
+    ``spool_rows`` rows; ``close`` writes the header and directory and
+    concatenates the spooled columns into the output stream.
+    """
+
+    def __init__(
+            self,
+            stream: IO[bytes],
+            kind: str,
+            schema: Sequence[tuple[str, str]],
+            spool_rows: int = 1 << 16
+    ) -> None:
+        """
+        Args:
+            stream: Binary output stream; it is not closed
+            kind: File kind recorded in the header, e.g. ``PAYROLL_KIND``
+            schema: (name, typecode) of every column, typecodes "q" or "B"
+            spool_rows: Rows buffered in memory per column before spooling
+        """
+        _check_byte_order()
+        if any(typecode not in ("q", "B") for _, typecode in schema):
+            raise ValueError("Column typecodes must be 'q' or 'B'")
+        self.stream = stream
+        self.kind = kind
+        self.schema = tuple(schema)
+        self.spool_rows = spool_rows
+        self.rows = 0
+        self._pending = [array(typecode) for _, typecode in self.schema]
+        self._spools = [tempfile.TemporaryFile() for _ in self.schema]
+        self._closed = False
+
+    def __enter__(self) -> 'ColumnFileWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self._discard()
+
+    def append(self, *values: int) -> None:
+        """Add one row, one value per column in schema order."""
+        if len(values) != len(self.schema):
+            raise ValueError(f"Expected {len(self.schema)} values, got {len(values)}")
+        for pending, value in zip(self._pending, values):
+            pending.append(value)
+        self.rows += 1
+        if len(self._pending[0]) >= self.spool_rows:
+            self._spool()
+
+    def extend(self, columns: Sequence[Iterable[int]]) -> None:
+        """Add a chunk of rows given column by column, in schema order."""
+        if len(columns) != len(self.schema):
+            raise ValueError(f"Expected {len(self.schema)} columns, got {len(columns)}")
+        before = len(self._pending[0])
+        for pending, values in zip(self._pending, columns):
+            pending.extend(values)
+        added = len(self._pending[0]) - before
+        if any(len(pending) != before + added for pending in self._pending):
+            for pending in self._pending:
+                del pending[before:]
+            raise ValueError("Columns must all have the same length")
+        self.rows += added
+        if before + added >= self.spool_rows:
+            self._spool()
+
+    def _spool(self) -> None:
+        """Move the buffered values of every column to its temporary file."""
+        for pending, spool in zip(self._pending, self._spools):
+            pending.tofile(spool)
+            del pending[:]
+
+    def close(self) -> int:
+        """
+        Write the complete file to the stream.
+
+        Returns:
+            Number of rows written
+        """
+        if self._closed:
+            return self.rows
+        self._spool()
+        offset = _HEADER.size + _COLUMN.size * len(self.schema)
+        offsets = []
+        for _, typecode in self.schema:
+            offset = _aligned(offset)
+            offsets.append(offset)
+            offset += self.rows * array(typecode).itemsize
+
+        header = _HEADER.pack(MAGIC, self.kind.encode("ascii"), VERSION, len(self.schema), self.rows)
+        self.stream.write(header)
+        for (name, typecode), column_offset in zip(self.schema, offsets):
+            self.stream.write(_COLUMN.pack(name.encode("ascii"), typecode.encode("ascii"), column_offset))
+        position = _HEADER.size + _COLUMN.size * len(self.schema)
+        for spool, column_offset in zip(self._spools, offsets):
+            self.stream.write(bytes(column_offset - position))
+            spool.seek(0)
+            shutil.copyfileobj(spool, self.stream)
+            position = column_offset + spool.tell()
+        self._discard()
+        return self.rows
+
+    def _discard(self) -> None:
+        """Delete the temporary files."""
+        for spool in self._spools:
+            spool.close()
+        self._closed = True
+
+
+class ColumnFile:
+    """
+    Memory-mapped, read-only column file.
+
+    Views returned by ``column`` and ``to_numpy`` share the mapping; drop
+    them before closing the file (closing releases the ``memoryview`` s
+    this object handed out, but NumPy arrays must be gone by then).
+    """
+
+    def __init__(self, path: str, kind: str | None = None) -> None:
+        """
+        Args:
+            path: File to map
+            kind: Expected file kind; any kind is accepted when None
+
+        Raises:
+            BinaryFormatError: If the file is truncated, of another kind or not a column file
+        """
+        _check_byte_order()
+        self.path = path
+        with open(path, "rb") as stream:
+            size = os.fstat(stream.fileno()).st_size
+            if size < _HEADER.size:
+                raise BinaryFormatError(f"{path} is too short to be a column file")
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        try:
+            self._read_directory(size, kind)
+        except BinaryFormatError:
+            self._map.close()
+            raise
+
+    def _read_directory(self, size: int, kind: str | None) -> None:
+        """Parse and validate the header and column directory."""
+        magic, raw_kind, version, column_count, self.rows = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise BinaryFormatError(f"{self.path} is not a column file")
+        if version != VERSION:
+            raise BinaryFormatError(f"{self.path} has unsupported version {version}")
+        self.kind = raw_kind.rstrip(b"\0").decode("ascii")
+        if kind is not None and self.kind != kind:
+            raise BinaryFormatError(f"{self.path} holds {self.kind or 'unknown'} data, expected {kind}")
+        if _HEADER.size + _COLUMN.size * column_count > size:
+            raise BinaryFormatError(f"{self.path} is truncated")
+
+        self._columns: dict[str, tuple[str, int]] = {}
+        for index in range(column_count):
+            entry = _HEADER.size + _COLUMN.size * index
+            raw_name, raw_typecode, offset = _COLUMN.unpack_from(self._map, entry)
+            typecode = raw_typecode.decode("ascii")
+            if typecode not in ("q", "B"):
+                raise BinaryFormatError(f"{self.path} has a column of unknown type '{typecode}'")
+            if offset % _ALIGNMENT or offset + self.rows * array(typecode).itemsize > size:
+                raise BinaryFormatError(f"{self.path} is truncated")
+            self._columns[raw_name.rstrip(b"\0").decode("ascii")] = (typecode, offset)
+        self.schema = tuple((name, typecode) for name, (typecode, _) in self._columns.items())
+
+    def __enter__(self) -> 'ColumnFile':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> memoryview:
+        """ :return zero-copy view of a column, yielding Python ints """
+        typecode, offset = self._column(name)
+        raw = memoryview(self._map)[offset:offset + self.rows * array(typecode).itemsize]
+        view = raw.cast(typecode)
+        self._views += [raw, view]
+        return view
+
+    def to_numpy(self, name: str) -> Any:
+        """ :return zero-copy NumPy view of a column (requires NumPy) """
+        import numpy
+
+        typecode, offset = self._column(name)
+        return numpy.frombuffer(self._map, dtype="<i8" if typecode == "q" else "u1", count=self.rows,
+                                offset=offset)
+
+    def _column(self, name: str) -> tuple[str, int]:
+        """ :return typecode and offset of a column """
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"{self.path} has no column '{name}'") from None
+
+    def close(self) -> None:
+        """Release the handed-out views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._map.close()
+
+
+def payroll_writer(stream: IO[bytes]) -> ColumnFileWriter:
+    """ :return writer of a payroll file """
+    return ColumnFileWriter(stream, PAYROLL_KIND, PAYROLL_SCHEMA)
+
+
+def calculate_chunk(
+        engine: TaxEngine,
+        gross_paise: Sequence[int],
+        regimes: Sequence[int],
+        freelancer: Sequence[int]
+) -> list[array]:
+    """
+    Calculate a chunk of payroll records.
+
+    Records are grouped by regime and calculation, and every group goes
+    through the integer-paise batch path in one call. A homogeneous chunk
+    (the common case) is passed to it as the zero-copy column itself.
+
+    Returns:
+        One paise column per ``RESULT_FIELDS`` entry, in record order
+
+    Raises:
+        BinaryFormatError: If a record has an unknown regime code or freelancer flag
+    """
+    rows = len(gross_paise)
+    regime_bytes, flag_bytes = bytes(regimes), bytes(freelancer)
+    groups: dict[tuple[int, int], list[int] | None] = {}
+    if rows and regime_bytes.count(regime_bytes[0]) == rows and flag_bytes.count(flag_bytes[0]) == rows:
+        groups[regime_bytes[0], flag_bytes[0]] = None
+    else:
+        for index, key in enumerate(zip(regime_bytes, flag_bytes)):
+            groups.setdefault(key, []).append(index)
+
+    output = [array('q', bytes(8 * rows)) for _ in RESULT_FIELDS]
+    for (code, flag), indices in groups.items():
+        if code not in _REGIMES or flag not in _SOURCE_FIELDS:
+            raise BinaryFormatError(f"Invalid regime code {code} or freelancer flag {flag}")
+        calculate = (engine.paise.calculate_freelancer_tax_batch if flag
+                     else engine.paise.calculate_net_salary_batch)
+        amounts = gross_paise if indices is None else [gross_paise[index] for index in indices]
+        batch = calculate(amounts, _REGIMES[code])
+        for target, field in zip(output, _SOURCE_FIELDS[flag]):
+            if indices is None:
+                target[:] = batch.column(field)
+                continue
+            for index, value in zip(indices, batch.column(field)):
+                target[index] = value
+    return output
+
+
+def process_binary(
+        source_path: str,
+        sink: IO[bytes],
+        engine: TaxEngine | None = None,
+        chunk_rows: int = CHUNK_ROWS
+) -> BatchStats:
+    """
+    Calculate every record of a payroll file into a result file.
+
+    The payroll file is memory-mapped and processed ``chunk_rows`` records
+    at a time through zero-copy slices of its columns.
+
+    Args:
+        source_path: Payroll column file
+        sink: Binary stream receiving the result column file
+        engine: Tax engine to use (built-in rules by default)
+        chunk_rows: Records calculated per chunk
+
+    Returns:
+        Statistics for the run
+    """
+    engine = engine or TaxEngine()
+    stats = BatchStats()
+    started = time.perf_counter()
+    with ColumnFile(source_path, PAYROLL_KIND) as payroll:
+        writer = ColumnFileWriter(sink, RESULTS_KIND, RESULTS_SCHEMA)
+        with writer:
+            ids, gross, regimes, freelancer = (payroll.column(name) for name, _ in PAYROLL_SCHEMA)
+            for start in range(0, len(payroll), chunk_rows):
+                window = slice(start, start + chunk_rows)
+                results = calculate_chunk(engine, gross[window], regimes[window], freelancer[window])
+                writer.extend([ids[window], regimes[window], freelancer[window], *results])
+    stats.rows = writer.rows
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def payroll_record(row: dict[str, Any], regime: TaxRegime) -> tuple[int, int, int, int]:
+    """
+    Convert a batch input row to a payroll record.
+
+    The row needs an integer ``id`` and either a ``gross_salary_lakhs`` or,
+    for a freelancer, a ``gross_receipts_lakhs`` column; an optional
+    ``regime`` column overrides the default regime.
+
+    Returns:
+        Employee id, gross amount in paise, regime code and freelancer flag
+
+    Raises:
+        ValueError: If the row is incomplete or has an invalid value
+    """
+    try:
+        employee_id = int(str(row.get("id") or "").strip())
+    except ValueError:
+        raise ValueError(f"Employee id must be an integer, got '{row.get('id') or ''}'") from None
+
+    present = [mode for mode in BatchMode if str(row.get(mode.amount_column) or "").strip()]
+    if len(present) != 1:
+        raise ValueError("Exactly one of 'gross_salary_lakhs' and 'gross_receipts_lakhs' must be set")
+    raw_amount = str(row[present[0].amount_column]).strip()
+    try:
+        gross_paise = lakhs_to_paise(raw_amount)
+    except ArithmeticError:
+        raise ValueError(f"Invalid amount '{raw_amount}'") from None
+    if gross_paise < 0:
+        raise ValueError("Amount must not be negative")
+    if not (-2 ** 63 <= employee_id < 2 ** 63 and gross_paise < 2 ** 63):
+        raise ValueError("Employee id or amount is too large for the binary format")
+
+    row_regime = TaxRegime(row["regime"].strip().lower()) if row.get("regime") else regime
+    return employee_id, gross_paise, REGIME_CODES[row_regime], int(present[0] == BatchMode.FREELANCER)
+
+
+def rows_to_payroll(
+        rows: Iterable[dict[str, Any]],
+        sink: IO[bytes],
+        regime: TaxRegime,
+        errors: IO[str] | None = None
+) -> BatchStats:
+    """
+    Convert batch input rows (see ``payroll_record``) to a payroll file.
+
+    Invalid rows are reported on ``errors`` (stderr by default) and skipped.
+
+    Returns:
+        Statistics for the conversion
+    """
+    errors = errors or sys.stderr
+    stats = BatchStats()
+    started = time.perf_counter()
+    with payroll_writer(sink) as writer:
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                writer.append(*payroll_record(row, regime))
+            except ValueError as e:
+                stats.skipped += 1
+                print(f"Row {row_number}: {e}", file=errors)
+    stats.rows = writer.rows
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def _format_lakhs(paise: int) -> str:
+    """ :return non-negative paise as an exact amount in lakhs without trailing zeros """
+    lakhs, remainder = divmod(paise, PAISE_PER_LAKH)
+    return f"{lakhs}.{remainder:07d}".rstrip("0").rstrip(".")
+
+
+def write_csv(source_path: str, sink: IO[str]) -> int:
+    """
+    Convert a payroll or result file to CSV.
+
+    Payroll files become batch input rows (amounts in lakhs, exactly);
+    result files get one ``<field>_rupees`` column per amount.
+
+    Returns:
+        Number of rows written
+    """
+    writer = csv.writer(sink)
+    with ColumnFile(source_path) as data:
+        names = {code: regime.value for code, regime in _REGIMES.items()}
+        if data.kind == PAYROLL_KIND:
+            ids, gross, codes, freelancer = (data.column(name) for name, _ in PAYROLL_SCHEMA)
+            writer.writerow(["id", "regime", "gross_salary_lakhs", "gross_receipts_lakhs"])
+            writer.writerows(
+                (employee_id, names[code], "", _format_lakhs(amount)) if flag
+                else (employee_id, names[code], _format_lakhs(amount), "")
+                for employee_id, amount, code, flag in zip(ids, gross, codes, freelancer)
+            )
+        elif data.kind == RESULTS_KIND:
+            ids, codes, freelancer, *amounts = (data.column(name) for name, _ in RESULTS_SCHEMA)
+            writer.writerow(["id", "regime", "freelancer", *(f"{name}_rupees" for name in RESULT_FIELDS)])
+            writer.writerows(
+                (employee_id, names[code], flag, *map(format_rupees, values))
+                for employee_id, code, flag, *values in zip(ids, codes, freelancer, *amounts)
+            )
+        else:
+            raise BinaryFormatError(f"{source_path} holds {data.kind or 'unknown'} data, "
+                                    f"expected {PAYROLL_KIND} or {RESULTS_KIND}")
+        return len(data)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for the binary converters and runner."""
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.binary",
+        description="Convert payroll files to the binary column format and calculate them."
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    from_csv = commands.add_parser("from-csv",
+                                   help="Convert a CSV or JSONL payroll file to a payroll column file")
+    from_csv.add_argument("input", help="Input CSV or JSONL file ('-' for stdin)")
+    from_csv.add_argument("output", help="Payroll column file to write")
+    from_csv.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                          default=TaxRegime.OLD.value, help="Regime of rows without a regime column")
+    from_csv.add_argument("--input-format", choices=["csv", "jsonl"],
+                          help="Input format (inferred from the extension by default)")
+
+    run = commands.add_parser("run", help="Calculate a payroll column file into a result column file")
+    run.add_argument("input", help="Payroll column file")
+    run.add_argument("output", help="Result column file to write")
+    run.add_argument("--assessment-year", help="Use the shipped rules of this assessment year, e.g. 2025-26")
+    run.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Records calculated per chunk")
+
+    to_csv = commands.add_parser("to-csv", help="Convert a payroll or result column file to CSV")
+    to_csv.add_argument("input", help="Column file")
+    to_csv.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m calculator.binary``."""
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "from-csv":
+            stats = _from_csv(args)
+        elif args.command == "run":
+            engine = None
+            if args.assessment_year:
+                engine = engine_for(normalise_assessment_year(args.assessment_year))
+            with open(args.output, "wb") as sink:
+                stats = process_binary(args.input, sink, engine, args.chunk_rows)
+        else:
+            sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+            try:
+                write_csv(args.input, sink)
+            finally:
+                if sink is not sys.stdout:
+                    sink.close()
+            return 0
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    print(f"Processed {stats.rows} rows ({stats.skipped} skipped) in "
+          f"{stats.elapsed_seconds:.2f}s — {stats.rows_per_second:,.0f} rows/sec", file=sys.stderr)
+    return 0
+
+
+def _from_csv(args: argparse.Namespace) -> BatchStats:
+    """Run the ``from-csv`` command."""
+    input_format = args.input_format or _detect_format(args.input)
+    regime = TaxRegime(args.regime)
+    with open(args.output, "wb") as sink:
+        if args.input == "-":
+            return rows_to_payroll(read_rows(sys.stdin, input_format), sink, regime)
+        with open(args.input, newline="", encoding="utf-8") as source:
+            return rows_to_payroll(read_rows(source, input_format), sink, regime)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
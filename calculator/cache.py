@@ -0,0 +1,84 @@
+"""
+LRU result cache shared by the engines.
+
+``ResultCache`` memoises calculation results under a hashable key, evicts
+the least recently used entry beyond ``max_size`` and guards every access
+with a lock, so one cache can serve a shared engine across threads.
+``CacheStats`` is a read-only snapshot of its hit, miss and eviction
+counters, reported by ``TaxEngine.cache_stats``.
+"""
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Snapshot of result cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """ :return fraction of lookups served from the cache """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """
+    Bounded, thread-safe LRU cache for calculation results.
+
+    A ``max_size`` of 0 disables caching; every lookup is then a miss and
+    nothing is stored.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        if max_size < 0:
+            raise ValueError("Cache size cannot be negative")
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """ :return cached value for key, or None on a miss """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.max_size == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """ :return current counters """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              len(self._entries), self.max_size)
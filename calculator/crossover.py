@@ -0,0 +1,90 @@
+"""
+Crossover index between tax regimes.
+
+Every regime's net salary is an exact piecewise-linear function of gross
+salary (see ``TaxEngine.net_salary_curve``), so the incomes at which two
+regimes swap places are found by intersecting their segments rather than
+by scanning. ``CrossoverIndex`` does this once per configuration and
+answers lookups by bisection.
+"""
+from bisect import bisect_left, bisect_right
+from collections.abc import Hashable, Mapping
+from fractions import Fraction
+from itertools import combinations
+
+from calculator.cache import ResultCache
+from calculator.piecewise import PiecewiseLinear
+
+# Regimes are only used as keys, so the index does not depend on the engine module
+Regime = Hashable
+
+# Indexes shared by every engine built with the same slabs, cess and deduction rules
+_INDEX_CACHE = ResultCache(64)
+
+
+class CrossoverIndex:
+    """
+    Exact crossover points of a set of net salary curves.
+
+    All amounts are ``Fraction`` rupees. Lookups cost O(log n) in the
+    number of crossovers.
+    """
+
+    __slots__ = ("_pairs", "points", "_preferred")
+
+    def __init__(self, curves: Mapping[Regime, PiecewiseLinear]) -> None:
+        """
+        Args:
+            curves: Net salary curve per regime, in preference order for ties
+        """
+        self._pairs: dict[tuple[Regime, Regime], tuple[Fraction, ...]] = {}
+        for first, second in combinations(curves, 2):
+            crossings = tuple(curves[first].crossings(curves[second]))
+            self._pairs[first, second] = self._pairs[second, first] = crossings
+
+        # Every crossover of any pair; no two curves swap strictly between neighbours
+        self.points: tuple[Fraction, ...] = tuple(sorted(set().union(*self._pairs.values())))
+
+        # Best regime on [points[i - 1], points[i]), probed inside each interval
+        self._preferred: list[Regime] = []
+        starts = (Fraction(0), *self.points)
+        for index, start in enumerate(starts):
+            probe = (start + starts[index + 1]) / 2 if index + 1 < len(starts) else start + 1
+            values = {regime: curve.evaluate(probe) for regime, curve in curves.items()}
+            self._preferred.append(max(values, key=values.__getitem__))
+
+    @classmethod
+    def cached(cls, key: Hashable, curves: Mapping[Regime, PiecewiseLinear]) -> 'CrossoverIndex':
+        """
+        Return the index for a configuration, building it on first use.
+
+        Args:
+            key: Hashable fingerprint of the configuration the curves were built from
+            curves: Net salary curve per regime
+        """
+        index = _INDEX_CACHE.get(key)
+        if index is None:
+            index = cls(curves)
+            _INDEX_CACHE.put(key, index)
+        return index
+
+    def between(self, first: Regime, second: Regime) -> tuple[Fraction, ...]:
+        """ :return ascending gross salaries at which first and second swap places """
+        return self._pairs.get((first, second), ())
+
+    def in_range(self, low: Fraction, high: Fraction) -> tuple[Fraction, ...]:
+        """ :return crossovers of any pair of regimes with low <= point <= high """
+        return self.points[bisect_left(self.points, low):bisect_right(self.points, high)]
+
+    def nearest(self, gross_salary: Fraction, first: Regime, second: Regime) -> Fraction | None:
+        """ :return crossover of first and second closest to gross_salary, or None if they never swap """
+        points = self.between(first, second)
+        if not points:
+            return None
+        position = bisect_left(points, gross_salary)
+        candidates = points[max(0, position - 1):position + 1]
+        return min(candidates, key=lambda point: abs(point - gross_salary))
+
+    def preferred_regime(self, gross_salary: Fraction) -> Regime:
+        """ :return regime leaving the highest net salary at gross_salary (earliest on ties) """
+        return self._preferred[bisect_right(self.points, gross_salary)]
@@ -0,0 +1,1186 @@
+"""
+Immutable tax engine.
+
+``TaxEngine`` freezes slab tables, cess and deduction rules at construction
+and exposes pure calculations that take an explicit regime, so a single
+instance can be shared by any number of threads.
+"""
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, replace
+from enum import Enum
+from functools import lru_cache
+from decimal import Decimal
+from fractions import Fraction
+from types import MappingProxyType
+from typing import TYPE_CHECKING, TypeVar
+
+from calculator.cache import CacheStats, ResultCache
+from calculator.money import decimal_places, div_half_even, lakhs_to_paise, to_paise
+from calculator.results import FreelancerTaxResult, NetSalaryResult, ResultColumns
+
+if TYPE_CHECKING:
+    from calculator.crossover import CrossoverIndex
+    from calculator.marginal import MarginalRateColumns, MarginalRates, MarginalRateTable
+    from calculator.paise import PaiseTaxCalculator
+    from calculator.piecewise import LinearSegment, PiecewiseLinear
+
+# Salary structure and deduction limits shared by the forward and inverse calculations
+BASIC_SALARY_RATIO = Decimal('0.5')
+HRA_RATIO = Decimal('0.4')
+PF_RATIO = Decimal('0.12')
+STANDARD_DEDUCTION = Decimal('50000')
+SECTION_80C_LIMIT = Decimal('150000')
+REBATE_87A_LIMIT = Decimal('500000')
+
+# Section 44ADA presumptive taxation for freelancers
+PRESUMPTIVE_INCOME_RATIO = Decimal('0.5')
+SECTION_80D_SELF_LIMIT = Decimal('25000')
+FREELANCER_FIXED_DEDUCTIONS: dict[str, Decimal] = {
+    'section_80c': Decimal('150000'),
+    'section_80d_parents': Decimal('50000'),
+    'section_80d_health_checkup': Decimal('5000'),
+    'hra': Decimal('60000'),
+    'standard_deduction': Decimal('50000')
+}
+
+_ZERO = Decimal('0')
+
+_ResultT = TypeVar('_ResultT', NetSalaryResult, FreelancerTaxResult)
+
+
+class TaxRegime(Enum):
+    """Enumeration for different tax regimes."""
+    OLD = "old"
+    NEW = "new"
+
+
+class NumericBackend(Enum):
+    """Enumeration for the arithmetic used to produce results."""
+    DECIMAL = "decimal"
+    PAISE = "paise"
+
+
+class SolverMethod(Enum):
+    """Enumeration for gross salary solver strategies."""
+    ANALYTIC = "analytic"
+    BISECTION = "bisection"
+
+
+@dataclass(frozen=True, slots=True)
+class GrossSalarySolution:
+    """Outcome of solving for the gross salary behind a target take-home."""
+
+    gross_salary: Decimal
+    method: SolverMethod
+    evaluations: int
+    result: NetSalaryResult
+
+
+@dataclass(frozen=True, slots=True)
+class RegimeComparison:
+    """Net salary breakdowns of every regime for one gross salary."""
+
+    gross_salary_lakhs: Decimal
+    breakdowns: dict[TaxRegime, NetSalaryResult]
+    best_regime: TaxRegime
+    # How much more net salary the best regime leaves than the runner-up
+    delta_lakhs: Decimal
+    # Gross salary nearest to the input at which the best regime and the runner-up swap
+    breakeven_gross_lakhs: Decimal | None
+
+
+@dataclass(frozen=True, slots=True)
+class RegimeSweep:
+    """Net salary of every regime over an evenly spaced gross salary grid, in paise."""
+
+    gross_salary_paise: array
+    net_salary_paise: dict[TaxRegime, array]
+    # Every gross salary within the grid range at which two regimes swap
+    crossovers_lakhs: tuple[Decimal, ...]
+
+    def delta_paise(self, regime: TaxRegime, baseline: TaxRegime) -> array:
+        """ :return net salary under regime minus that under baseline, per grid point """
+        return array('q', map(int.__sub__, self.net_salary_paise[regime], self.net_salary_paise[baseline]))
+
+    def best_regimes(self) -> list[TaxRegime]:
+        """ :return regime with the highest net salary at each grid point (earliest on ties) """
+        regimes = list(self.net_salary_paise)
+        columns = [self.net_salary_paise[regime] for regime in regimes]
+        return [regimes[row.index(max(row))] for row in zip(*columns)]
+
+
+@dataclass(frozen=True, slots=True)
+class TaxSlab:
+    """Represents a tax slab with maximum income limit and tax rate."""
+
+    max_amount: Decimal
+    rate: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSlabTable:
+    """
+    Tax slabs compiled for direct lookup.
+
+    Stores the lower bound of every bracket, its rate and the cumulative
+    tax owed at that lower bound, so slab tax for any income is one bisect
+    plus one multiply.
+    """
+
+    lower_bounds: tuple[Decimal, ...]
+    rates: tuple[Decimal, ...]
+    cumulative_tax: tuple[Decimal, ...]
+
+    def slab_tax(self, income: Decimal) -> Decimal:
+        """ :return slab tax (before rebate and cess) on income """
+        bracket = bisect_right(self.lower_bounds, income) - 1
+        if bracket < 0:
+            return _ZERO
+        return self.cumulative_tax[bracket] + (income - self.lower_bounds[bracket]) * self.rates[bracket]
+
+
+@lru_cache(maxsize=None)
+def _compile_slabs(slabs: tuple[TaxSlab, ...]) -> CompiledSlabTable:
+    """Compile slabs once; identical slab tuples share a table across calculators."""
+    lower_bounds: list[Decimal] = []
+    rates: list[Decimal] = []
+    cumulative_tax: list[Decimal] = []
+    prev_max, owed = _ZERO, _ZERO
+
+    for slab in slabs:
+        lower_bounds.append(prev_max)
+        rates.append(slab.rate)
+        cumulative_tax.append(owed)
+        if slab.max_amount.is_infinite():
+            break
+        owed += (slab.max_amount - prev_max) * slab.rate
+        prev_max = slab.max_amount
+
+    return CompiledSlabTable(tuple(lower_bounds), tuple(rates), tuple(cumulative_tax))
+
+
+class TaxSlabCollection:
+    """Collection of tax slabs for a specific regime."""
+
+    def __init__(self, slabs: list[TaxSlab]) -> None:
+        self._slabs: tuple[TaxSlab, ...] = tuple(slabs)
+        self._compiled: CompiledSlabTable | None = None
+
+    @property
+    def slabs(self) -> tuple[TaxSlab, ...]:
+        """ :return slabs in ascending order (read-only; build a new collection to change them) """
+        return self._slabs
+
+    @property
+    def compiled(self) -> CompiledSlabTable:
+        """ :return compiled lookup table for these slabs """
+        if self._compiled is None:
+            self._compiled = _compile_slabs(self._slabs)
+        return self._compiled
+
+
+@dataclass(frozen=True, slots=True)
+class SalaryStructure:
+    """Split of a gross salary into basic salary, HRA and PF, shared by every regime."""
+
+    basic_salary_ratio: Decimal = BASIC_SALARY_RATIO
+    hra_ratio: Decimal = HRA_RATIO
+    pf_ratio: Decimal = PF_RATIO
+
+
+@dataclass(frozen=True, slots=True)
+class DeductionRules:
+    """Deduction limits, the 87A rebate threshold and 44ADA parameters of one regime."""
+
+    standard_deduction: Decimal = STANDARD_DEDUCTION
+    section_80c_limit: Decimal = SECTION_80C_LIMIT
+    rebate_87a_limit: Decimal = REBATE_87A_LIMIT
+    presumptive_income_ratio: Decimal = PRESUMPTIVE_INCOME_RATIO
+    section_80d_self_limit: Decimal = SECTION_80D_SELF_LIMIT
+    freelancer_fixed_deductions: tuple[tuple[str, Decimal], ...] = tuple(FREELANCER_FIXED_DEDUCTIONS.items())
+
+
+DEFAULT_CESS_PERCENTAGE = Decimal('0.04')
+DEFAULT_DEDUCTION_RULES = DeductionRules()
+DEFAULT_SALARY_STRUCTURE = SalaryStructure()
+DEFAULT_TAX_SLABS: MappingProxyType = MappingProxyType({
+    TaxRegime.OLD: TaxSlabCollection([
+        TaxSlab(Decimal('250000'), Decimal('0')),
+        TaxSlab(Decimal('500000'), Decimal('0.05')),
+        TaxSlab(Decimal('1000000'), Decimal('0.20')),
+        TaxSlab(Decimal('Infinity'), Decimal('0.30'))
+    ]),
+    TaxRegime.NEW: TaxSlabCollection([
+        TaxSlab(Decimal('300000'), Decimal('0')),
+        TaxSlab(Decimal('600000'), Decimal('0.05')),
+        TaxSlab(Decimal('900000'), Decimal('0.10')),
+        TaxSlab(Decimal('1200000'), Decimal('0.15')),
+        TaxSlab(Decimal('1500000'), Decimal('0.20')),
+        TaxSlab(Decimal('Infinity'), Decimal('0.30'))
+    ])
+})
+
+
+def _to_lakhs(rupees: Fraction) -> Decimal:
+    """ :return exact rupee amount in lakhs, rounded to two places like the result dictionaries """
+    return round(Decimal(rupees.numerator) / Decimal(rupees.denominator) / Decimal('100000'), 2)
+
+
+class TaxEngine:
+    """
+    Immutable, thread-safe tax engine.
+
+    Slab tables, cess, deduction rules and the salary structure are frozen
+    at construction, so every method is a pure function of its arguments.
+    Net salary curves, the crossover index and the paise calculator are
+    derived from that configuration on first use (a racing thread at worst
+    builds an identical copy); the only other state that changes is the
+    result cache, which is locked. To change the configuration, build a new
+    engine.
+    """
+
+    __slots__ = ("_tax_slabs", "_cess_percentage", "_rules", "_structure", "_result_cache",
+                 "_net_salary_curves", "_crossover_index", "_paise_calculator", "_marginal_tables",
+                 "_freelancer_fixed_deductions")
+
+    def __init__(
+            self,
+            tax_slabs: Mapping[TaxRegime, TaxSlabCollection] = DEFAULT_TAX_SLABS,
+            cess_percentage: Decimal = DEFAULT_CESS_PERCENTAGE,
+            rules: DeductionRules | Mapping[TaxRegime, DeductionRules] = DEFAULT_DEDUCTION_RULES,
+            structure: SalaryStructure = DEFAULT_SALARY_STRUCTURE,
+            cache_size: int = 1024
+    ) -> None:
+        """
+        Args:
+            tax_slabs: Slab collection per regime
+            cess_percentage: Health and education cess as a fraction of tax
+            rules: Deduction rules shared by every regime, or one set per regime
+            structure: Salary structure used by the net salary calculations
+            cache_size: Maximum number of memoised net salary/freelancer results (0 disables)
+        """
+        self._tax_slabs: Mapping[TaxRegime, TaxSlabCollection] = MappingProxyType(dict(tax_slabs))
+        self._cess_percentage = Decimal(str(cess_percentage))
+        self._rules: Mapping[TaxRegime, DeductionRules] = MappingProxyType({
+            regime: rules if isinstance(rules, DeductionRules) else rules[regime]
+            for regime in self._tax_slabs
+        })
+        self._structure = structure
+        # 44ADA deductions that do not depend on receipts, summed once per regime
+        self._freelancer_fixed_deductions: Mapping[TaxRegime, Decimal] = MappingProxyType({
+            regime: sum((amount for _, amount in rules.freelancer_fixed_deductions), _ZERO)
+            for regime, rules in self._rules.items()
+        })
+        self._result_cache = ResultCache(cache_size)
+        self._paise_calculator: PaiseTaxCalculator | None = None
+        self._marginal_tables: dict[tuple[str, TaxRegime], MarginalRateTable] = {}
+        # Curves and crossovers serve comparisons, sweeps and aggregates; building them (and importing
+        # their modules) on first use keeps one-shot commands fast
+        self._net_salary_curves: Mapping[TaxRegime, PiecewiseLinear] | None = None
+        self._crossover_index: CrossoverIndex | None = None
+
+    @property
+    def tax_slabs(self) -> Mapping[TaxRegime, TaxSlabCollection]:
+        """ :return read-only slab collections per regime """
+        return self._tax_slabs
+
+    @property
+    def cess_percentage(self) -> Decimal:
+        """ :return cess as a fraction of tax """
+        return self._cess_percentage
+
+    @property
+    def rules(self) -> Mapping[TaxRegime, DeductionRules]:
+        """ :return read-only deduction rules per regime """
+        return self._rules
+
+    @property
+    def structure(self) -> SalaryStructure:
+        """ :return salary structure used by the net salary calculations """
+        return self._structure
+
+    @property
+    def config_key(self) -> tuple:
+        """ :return hashable fingerprint of the slab, cess and deduction configuration """
+        return self._cess_percentage, self._structure, tuple(
+            (regime, collection.slabs, self._rules[regime]) for regime, collection in self._tax_slabs.items()
+        )
+
+    @property
+    def crossover_index(self) -> 'CrossoverIndex':
+        """ :return exact regime crossovers for this configuration, built on first use """
+        if self._crossover_index is None:
+            from calculator.crossover import CrossoverIndex
+            self._crossover_index = CrossoverIndex.cached(self.config_key, self.net_salary_curves)
+        return self._crossover_index
+
+    @property
+    def paise(self) -> 'PaiseTaxCalculator':
+        """ :return integer-paise calculator sharing this engine's configuration """
+        if self._paise_calculator is None:
+            from calculator.paise import PaiseTaxCalculator
+            self._paise_calculator = PaiseTaxCalculator(self)
+        return self._paise_calculator
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        """ :return hit/miss/eviction counters of the result cache """
+        return self._result_cache.stats
+
+    def clear_cache(self) -> None:
+        """Drop all memoised results."""
+        self._result_cache.clear()
+
+    def _cached_result(
+            self,
+            name: str,
+            amount: Decimal,
+            regime: TaxRegime,
+            compute: Callable[[Decimal, TaxRegime], _ResultT]
+    ) -> _ResultT:
+        """
+        Serve a result from the cache, computing and storing it on a miss.
+
+        Equal amounts share an entry (Decimal hashes by value). Results are
+        frozen records, so the cached instance itself is returned.
+        """
+        key = (name, amount, regime)
+        result = self._result_cache.get(key)
+        if result is None:
+            result = compute(amount, regime)
+            self._result_cache.put(key, result)
+        return result
+
+    def calculate_tax(self, taxable_income: Decimal, regime: TaxRegime) -> Decimal:
+        """
+        Calculate tax based on taxable income and regime.
+
+        Args:
+            taxable_income: Income amount to calculate tax on
+            regime: Tax regime to use
+
+        Returns:
+            Total tax including cess
+        """
+        # Income tax rebate u/s 87A
+        if taxable_income < self._rules[regime].rebate_87a_limit:
+            return _ZERO
+
+        tax = self._tax_slabs[regime].compiled.slab_tax(taxable_income)
+
+        cess = tax * self._cess_percentage
+        return tax + cess
+
+    def calculate_tax_batch(
+            self,
+            taxable_incomes: Iterable[Decimal | int | float | str],
+            regime: TaxRegime
+    ) -> tuple[array, array, array]:
+        """
+        Calculate tax for many taxable incomes at once using integer paise.
+
+        Slab rates and cess are scaled to integers so every row is computed
+        exactly; each bracket is found with a single bisect over the slab
+        lower bounds and a cumulative tax table. Any integer sequence
+        (including a NumPy array) is accepted as input.
+
+        Args:
+            taxable_incomes: Taxable incomes in rupees
+            regime: Tax regime to use
+
+        Returns:
+            Tuple of ``array('q')`` columns (tax, cess, total) in paise. The
+            total equals ``calculate_tax`` rounded half-even to the paisa,
+            tax is the slab tax rounded the same way and cess is the
+            difference, so the columns always add up.
+        """
+        table = self._tax_slabs[regime].compiled
+
+        # Scale every rate and the cess to integers so the arithmetic is exact
+        rate_scale = 10 ** max(decimal_places(rate) for rate in table.rates)
+        cess_scale = 10 ** decimal_places(self._cess_percentage)
+        cess_units = int(self._cess_percentage * cess_scale)
+
+        # Lower bound (paise) and cumulative scaled tax owed at each bracket
+        lower_bounds = [to_paise(bound) for bound in table.lower_bounds]
+        rate_units = [int(rate * rate_scale) for rate in table.rates]
+        cumulative = [int(owed * 100 * rate_scale) for owed in table.cumulative_tax]
+
+        rebate_limit = to_paise(self._rules[regime].rebate_87a_limit)
+        total_scale = rate_scale * cess_scale
+        tax_column, cess_column, total_column = array('q'), array('q'), array('q')
+
+        for income in taxable_incomes:
+            paise = to_paise(income)
+            # Income tax rebate u/s 87A
+            if paise < rebate_limit:
+                tax_column.append(0)
+                cess_column.append(0)
+                total_column.append(0)
+                continue
+
+            bracket = bisect_right(lower_bounds, paise) - 1
+            scaled_tax = cumulative[bracket] + (paise - lower_bounds[bracket]) * rate_units[bracket]
+            tax = div_half_even(scaled_tax, rate_scale)
+            total = div_half_even(scaled_tax * (cess_scale + cess_units), total_scale)
+            tax_column.append(tax)
+            cess_column.append(total - tax)
+            total_column.append(total)
+
+        return tax_column, cess_column, total_column
+
+    def calculate_net_salary(self, gross_salary_lakhs: Decimal | float, regime: TaxRegime) -> NetSalaryResult:
+        """
+        Calculate net salary after tax deductions.
+
+        Args:
+            gross_salary_lakhs: Gross salary in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            Record of the calculation details, also readable as a mapping
+        """
+        gross_salary_lakhs = Decimal(str(gross_salary_lakhs))
+        result = self._cached_result('net_salary', gross_salary_lakhs, regime, self._compute_net_salary)
+        # Echo the caller's amount; 10 and 10.0 share a cache entry but keep their own form
+        if result.gross_salary_lakhs.as_tuple() != gross_salary_lakhs.as_tuple():
+            result = replace(result, gross_salary_lakhs=gross_salary_lakhs)
+        return result
+
+    def calculate_net_salary_batch(
+            self,
+            gross_salaries_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime
+    ) -> ResultColumns:
+        """
+        Calculate net salaries for many gross salaries into columns.
+
+        Uses the integer-paise backend and builds no per-row objects; see
+        ``ResultColumns`` for exporting the columns.
+
+        Args:
+            gross_salaries_lakhs: Gross salaries in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            One paise column per ``calculate_net_salary`` field
+        """
+        return self.paise.calculate_net_salary_batch(map(lakhs_to_paise, gross_salaries_lakhs), regime)
+
+    def calculate_net_salary_for_split(
+            self,
+            gross_salary_lakhs: Decimal | float,
+            basic_salary: Decimal,
+            hra: Decimal,
+            employee_pf: Decimal,
+            regime: TaxRegime
+    ) -> NetSalaryResult:
+        """
+        Calculate net salary for a gross salary split explicitly instead of by the engine's structure.
+
+        Args:
+            gross_salary_lakhs: Gross salary in lakhs
+            basic_salary: Annual basic salary in rupees
+            hra: Annual HRA in rupees
+            employee_pf: Annual employee PF contribution in rupees (the employer matches it)
+            regime: Tax regime to use
+
+        Returns:
+            Record of the calculation details, as ``calculate_net_salary``
+        """
+        gross_salary_lakhs = Decimal(str(gross_salary_lakhs))
+        components = (Decimal(basic_salary), Decimal(hra), Decimal(employee_pf), 2 * Decimal(employee_pf))
+        _, result = self._net_salary_for_components(gross_salary_lakhs, components, regime)
+        return result
+
+    def _compute_net_salary(self, gross_salary_lakhs: Decimal, regime: TaxRegime) -> NetSalaryResult:
+        """Uncached body of ``calculate_net_salary``."""
+        gross_salary = gross_salary_lakhs * Decimal('100000')
+        _, result = self._net_salary_for_components(
+            gross_salary_lakhs, self._salary_components(gross_salary), regime
+        )
+        return result
+
+    def _salary_components(self, gross_salary: Decimal) -> tuple[Decimal, Decimal, Decimal, Decimal]:
+        """
+        Split a gross salary into the components every regime shares.
+
+        Returns:
+            Tuple of basic salary, HRA, employee PF and total PF in rupees
+        """
+        # Calculate basic salary (50% of gross salary)
+        basic_salary = gross_salary * self._structure.basic_salary_ratio
+
+        # Calculate HRA component (Assuming HRA is 50% of basic salary)
+        hra = basic_salary * self._structure.hra_ratio
+
+        # Calculate employee's PF contribution (12% of basic salary)
+        employee_pf = basic_salary * self._structure.pf_ratio
+
+        # Calculate employer's PF contribution (12% of basic salary)
+        employer_pf = basic_salary * self._structure.pf_ratio
+
+        # total pf
+        total_pf = employee_pf + employer_pf
+        return basic_salary, hra, employee_pf, total_pf
+
+    def _salary_deductions(
+            self,
+            components: tuple[Decimal, Decimal, Decimal, Decimal],
+            regime: TaxRegime
+    ) -> Decimal:
+        """ :return total deductions in rupees allowed on a salary split into components """
+        _, hra, employee_pf, _ = components
+        rules = self._rules[regime]
+
+        # Deductions
+        standard_deduction = rules.standard_deduction  # Standard deduction allowed in both regimes
+
+        if regime == TaxRegime.OLD:
+            # PF contribution under section 80C (up to ₹1.5 lakh)
+            section_80c_deduction = min(employee_pf, rules.section_80c_limit)
+
+            # HRA exemption calculation
+            # Assuming maximum HRA exemption (rent paid is high enough)
+            hra_exemption = hra  # Since we're assuming the maximum possible exemption
+
+            # Total deductions
+            return standard_deduction + section_80c_deduction + hra_exemption
+
+        # In the new regime, only standard deduction is allowed
+        return standard_deduction
+
+    def taxable_salary_income(
+            self,
+            gross_salary: Decimal,
+            regime: TaxRegime,
+            other_income: Decimal = _ZERO
+    ) -> Decimal:
+        """
+        Calculate annual taxable income from a regular salary plus one-off payments.
+
+        The salary is split and deducted exactly like ``calculate_net_salary``;
+        one-off payments such as bonuses and arrears carry no HRA or PF, so
+        they are added to the taxable income in full.
+
+        Args:
+            gross_salary: Annual regular gross salary in rupees
+            regime: Tax regime to use
+            other_income: Fully taxable one-off payments in rupees
+
+        Returns:
+            Taxable income in rupees
+        """
+        deductions = self._salary_deductions(self._salary_components(gross_salary), regime)
+        return gross_salary - deductions + other_income
+
+    def _net_salary_for_components(
+            self,
+            gross_salary_lakhs: Decimal,
+            components: tuple[Decimal, Decimal, Decimal, Decimal],
+            regime: TaxRegime
+    ) -> tuple[Decimal, NetSalaryResult]:
+        """
+        Apply one regime's deductions and tax to precomputed salary components.
+
+        Returns:
+            Tuple of the unrounded annual net salary in rupees and the
+            ``calculate_net_salary`` result
+        """
+        gross_salary = gross_salary_lakhs * Decimal('100000')
+        basic_salary, hra, employee_pf, total_pf = components
+        deductions = self._salary_deductions(components, regime)
+
+        # Calculate taxable income
+        taxable_income = gross_salary - deductions
+
+        # Calculate tax
+        tax = self.calculate_tax(taxable_income, regime)
+
+        # Calculate net salary (only employee's PF is deducted from net salary)
+        net_salary = gross_salary - total_pf - tax
+
+        return net_salary, NetSalaryResult(
+            gross_salary_lakhs=gross_salary_lakhs,
+            basic_salary_lakhs=round(basic_salary / Decimal('100000'), 2),
+            hra_lakhs=round(hra / Decimal('100000'), 2),
+            pf_lakhs=round(total_pf / Decimal('100000'), 2),
+            deductions_lakhs=round(deductions / Decimal('100000'), 2),
+            taxable_income_lakhs=round(taxable_income / Decimal('100000'), 2),
+            tax_lakhs=round(tax / Decimal('100000'), 2),
+            net_salary_lakhs=round(net_salary / Decimal('100000'), 2),
+            monthly_take_home_lakhs=round(net_salary / Decimal('1200000'), 2)
+        )
+
+    def _tax_pieces(self, regime: TaxRegime) -> tuple[list[Fraction], list[tuple[Fraction, Fraction]]]:
+        """
+        Describe ``calculate_tax`` as linear pieces of taxable income.
+
+        Returns:
+            Tuple of piece start points (the 87A limit and slab lower bounds)
+            and matching ``(rate, constant)`` pairs, so that on the piece
+            starting at ``starts[i]`` tax is ``rate * taxable + constant``.
+            Below the first start tax is zero.
+        """
+        cess_factor = 1 + Fraction(self._cess_percentage)
+        rebate_limit = Fraction(self._rules[regime].rebate_87a_limit)
+
+        table = self._tax_slabs[regime].compiled
+        lower_bounds = [Fraction(bound) for bound in table.lower_bounds]
+        rates = [Fraction(rate) for rate in table.rates]
+        cumulative = [Fraction(owed) for owed in table.cumulative_tax]
+
+        starts = sorted({rebate_limit, *(bound for bound in lower_bounds if bound > rebate_limit)})
+        pieces: list[tuple[Fraction, Fraction]] = []
+        for start in starts:
+            bracket = bisect_right(lower_bounds, start) - 1
+            rate = rates[bracket]
+            pieces.append((
+                cess_factor * rate,
+                cess_factor * (cumulative[bracket] - rate * lower_bounds[bracket])
+            ))
+        return starts, pieces
+
+    def _taxable_income_pieces(self, regime: TaxRegime) -> list[tuple[Fraction, Fraction | None, Fraction, Fraction]]:
+        """
+        Describe taxable income in ``calculate_net_salary`` as linear pieces of gross.
+
+        Returns:
+            List of ``(start, end, slope, intercept)`` tuples in rupees
+        """
+        basic_ratio = Fraction(self._structure.basic_salary_ratio)
+        employee_pf_ratio = basic_ratio * Fraction(self._structure.pf_ratio)
+        standard_deduction = Fraction(self._rules[regime].standard_deduction)
+
+        if regime != TaxRegime.OLD:
+            return [(Fraction(0), None, Fraction(1), -standard_deduction)]
+
+        # Old regime: HRA exemption and 80C (PF until it hits the cap) are deducted
+        slope = 1 - basic_ratio * Fraction(self._structure.hra_ratio)
+        section_80c_cap = Fraction(self._rules[regime].section_80c_limit)
+        cap_reached_at = section_80c_cap / employee_pf_ratio
+        return [
+            (Fraction(0), cap_reached_at, slope - employee_pf_ratio, -standard_deduction),
+            (cap_reached_at, None, slope, -standard_deduction - section_80c_cap)
+        ]
+
+    @property
+    def net_salary_curves(self) -> Mapping[TaxRegime, 'PiecewiseLinear']:
+        """ :return read-only net salary curves per regime, built on first use """
+        if self._net_salary_curves is None:
+            self._net_salary_curves = MappingProxyType({
+                regime: self._build_net_salary_curve(regime) for regime in self._tax_slabs
+            })
+        return self._net_salary_curves
+
+    def net_salary_curve(self, regime: TaxRegime) -> 'PiecewiseLinear':
+        """
+        Annual net salary as an exact piecewise-linear function of gross salary.
+
+        Slab edges and the 87A limit are mapped back through the deduction and
+        PF formulas of ``calculate_net_salary``; both axes are in rupees.
+
+        Args:
+            regime: Tax regime to use
+
+        Returns:
+            Piecewise-linear net salary function (built once, on first use)
+        """
+        return self.net_salary_curves[regime]
+
+    def _build_net_salary_curve(self, regime: TaxRegime) -> 'PiecewiseLinear':
+        """Build the exact net salary curve for a regime."""
+        from calculator.piecewise import LinearSegment, PiecewiseLinear
+        total_pf_ratio = 2 * Fraction(self._structure.basic_salary_ratio) * Fraction(self._structure.pf_ratio)
+        # Net salary is gross minus total PF minus tax
+        return PiecewiseLinear([
+            LinearSegment(segment.start, segment.end, 1 - total_pf_ratio - segment.slope,
+                          -segment.intercept)
+            for segment in self._tax_segments(self._taxable_income_pieces(regime), regime)
+        ])
+
+    def _tax_segments(
+            self,
+            taxable_pieces: list[tuple[Fraction, Fraction | None, Fraction, Fraction]],
+            regime: TaxRegime
+    ) -> list['LinearSegment']:
+        """
+        Compose ``calculate_tax`` with taxable income given as linear pieces of a gross amount.
+
+        Args:
+            taxable_pieces: ``(start, end, slope, intercept)`` pieces of taxable income, in rupees
+            regime: Tax regime to use
+
+        Returns:
+            Segments of tax (cess included) as a function of the gross amount, in rupees
+        """
+        from calculator.piecewise import LinearSegment
+        tax_starts, tax_pieces = self._tax_pieces(regime)
+
+        segments: list[LinearSegment] = []
+        for start, end, slope, intercept in taxable_pieces:
+            # Gross amounts at which taxable income crosses a tax piece boundary
+            cuts = [start]
+            for tax_start in tax_starts if slope else ():
+                gross = (tax_start - intercept) / slope
+                if gross > start and (end is None or gross < end):
+                    cuts.append(gross)
+
+            for index, cut in enumerate(cuts):
+                cut_end = cuts[index + 1] if index + 1 < len(cuts) else end
+                piece = bisect_right(tax_starts, slope * cut + intercept) - 1
+                tax_rate, tax_constant = tax_pieces[piece] if piece >= 0 else (Fraction(0), Fraction(0))
+                segments.append(LinearSegment(
+                    start=cut,
+                    end=cut_end,
+                    slope=tax_rate * slope,
+                    intercept=tax_rate * intercept + tax_constant
+                ))
+        return segments
+
+    def salary_tax_curve(self, regime: TaxRegime) -> 'PiecewiseLinear':
+        """
+        Tax in ``calculate_net_salary`` as an exact piecewise-linear function of gross salary.
+
+        Args:
+            regime: Tax regime to use
+
+        Returns:
+            Piecewise-linear tax function (cess included); both axes are in rupees
+        """
+        from calculator.piecewise import PiecewiseLinear
+        return PiecewiseLinear(self._tax_segments(self._taxable_income_pieces(regime), regime))
+
+    def _freelancer_taxable_pieces(self, regime: TaxRegime) -> list[tuple[Fraction, Fraction | None, Fraction, Fraction]]:
+        """
+        Describe taxable income in ``calculate_freelancer_tax`` as linear pieces of gross receipts.
+
+        Returns:
+            List of ``(start, end, slope, intercept)`` tuples in rupees
+        """
+        rules = self._rules[regime]
+        ratio = Fraction(rules.presumptive_income_ratio)
+        fixed = sum((Fraction(amount) for _, amount in rules.freelancer_fixed_deductions), Fraction(0))
+        # 80D grows with presumptive income up to its cap, so nothing is taxable until income passes both
+        deducted = fixed + Fraction(rules.section_80d_self_limit)
+        if ratio == 0:
+            return [(Fraction(0), None, Fraction(0), Fraction(0))]
+        taxable_from = deducted / ratio
+        if taxable_from <= 0:
+            return [(Fraction(0), None, ratio, -deducted)]
+        return [
+            (Fraction(0), taxable_from, Fraction(0), Fraction(0)),
+            (taxable_from, None, ratio, -deducted)
+        ]
+
+    def freelancer_tax_curve(self, regime: TaxRegime) -> 'PiecewiseLinear':
+        """
+        Tax in ``calculate_freelancer_tax`` as an exact piecewise-linear function of gross receipts.
+
+        Args:
+            regime: Tax regime to use
+
+        Returns:
+            Piecewise-linear tax function (cess included); both axes are in rupees
+        """
+        from calculator.piecewise import PiecewiseLinear
+        return PiecewiseLinear(self._tax_segments(self._freelancer_taxable_pieces(regime), regime))
+
+    def _marginal_table(self, kind: str, regime: TaxRegime) -> 'MarginalRateTable':
+        """ :return marginal rate table of the "salary" or "freelancer" tax curve, built on first use """
+        table = self._marginal_tables.get((kind, regime))
+        if table is None:
+            from calculator.marginal import MarginalRateTable
+            if kind == "salary":
+                # Employee and employer PF both leave the take-home
+                pf_ratio = Fraction(self._structure.basic_salary_ratio) * Fraction(self._structure.pf_ratio)
+                table = MarginalRateTable(self.salary_tax_curve(regime), 1 - 2 * pf_ratio)
+            else:
+                table = MarginalRateTable(self.freelancer_tax_curve(regime), Fraction(1))
+            # Tables are immutable, so a concurrent build only wastes work
+            self._marginal_tables[(kind, regime)] = table
+        return table
+
+    def salary_marginal_rates(
+            self,
+            gross_salary_lakhs: Decimal | float,
+            regime: TaxRegime
+    ) -> 'MarginalRates':
+        """
+        Exact marginal rates of ``calculate_net_salary`` at a gross salary.
+
+        Read off ``salary_tax_curve`` instead of recomputing net salaries,
+        so a raise across the 87A limit shows up as a take-home jump rather
+        than as a bogus marginal rate.
+
+        Args:
+            gross_salary_lakhs: Gross salary in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            Marginal tax and take-home rates, effective tax rate and the
+            distance to the next slab or deduction edge
+        """
+        return self._marginal_table("salary", regime).rates(gross_salary_lakhs)
+
+    def salary_marginal_rates_batch(
+            self,
+            gross_salaries_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime
+    ) -> 'MarginalRateColumns':
+        """
+        Marginal rates of ``calculate_net_salary`` for many gross salaries, in integer paise.
+
+        Args:
+            gross_salaries_lakhs: Gross salaries in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            Rate columns (floats) and tax and edge distance columns (paise), in input order
+        """
+        return self._marginal_table("salary", regime).rates_batch(map(lakhs_to_paise, gross_salaries_lakhs))
+
+    def freelancer_marginal_rates(
+            self,
+            gross_receipts_lakhs: Decimal | float,
+            regime: TaxRegime
+    ) -> 'MarginalRates':
+        """
+        Exact marginal rates of ``calculate_freelancer_tax`` at gross receipts.
+
+        Args:
+            gross_receipts_lakhs: Gross receipts in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            See ``salary_marginal_rates``; take-home is receipts minus tax
+        """
+        return self._marginal_table("freelancer", regime).rates(gross_receipts_lakhs)
+
+    def freelancer_marginal_rates_batch(
+            self,
+            gross_receipts_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime
+    ) -> 'MarginalRateColumns':
+        """
+        Marginal rates of ``calculate_freelancer_tax`` for many gross receipts, in integer paise.
+
+        Args:
+            gross_receipts_lakhs: Gross receipts in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            See ``salary_marginal_rates_batch``
+        """
+        return self._marginal_table("freelancer", regime).rates_batch(map(lakhs_to_paise, gross_receipts_lakhs))
+
+    def marginal_rates_sweep(
+            self,
+            start_lakhs: Decimal | float,
+            stop_lakhs: Decimal | float,
+            regime: TaxRegime,
+            step_rupees: Decimal | int = 1000,
+            freelancer: bool = False
+    ) -> 'MarginalRateColumns':
+        """
+        Marginal rates over a gross amount range, e.g. for effective- and marginal-rate charts.
+
+        The tax curve is walked segment by segment with integer arithmetic
+        instead of bisecting for every point.
+
+        Args:
+            start_lakhs: First gross amount of the grid, in lakhs
+            stop_lakhs: Last gross amount of the grid (included when on a step), in lakhs
+            regime: Tax regime to use
+            step_rupees: Grid spacing in rupees
+            freelancer: Sweep ``calculate_freelancer_tax`` receipts instead of salaries
+
+        Returns:
+            See ``salary_marginal_rates_batch``
+        """
+        start_paise = lakhs_to_paise(start_lakhs)
+        stop_paise = lakhs_to_paise(stop_lakhs)
+        step_paise = to_paise(step_rupees)
+        if step_paise <= 0:
+            raise ValueError("Sweep step must be positive")
+        if stop_paise < start_paise:
+            raise ValueError("Sweep range must not end before it starts")
+        count = (stop_paise - start_paise) // step_paise + 1
+        table = self._marginal_table("freelancer" if freelancer else "salary", regime)
+        return table.rates_sweep(start_paise, step_paise, count)
+
+    def solve_gross_salary_for_target_take_home(
+            self,
+            target_monthly_take_home_lakhs: Decimal | float,
+            regime: TaxRegime,
+            method: SolverMethod = SolverMethod.ANALYTIC
+    ) -> GrossSalarySolution:
+        """
+        Solve for the gross salary behind a target monthly take-home.
+
+        The analytic method inverts ``net_salary_curve`` and returns the
+        smallest whole-rupee gross whose annual net salary reaches the
+        target. The bisection method is the original search, kept for
+        validation; it converges to 0.01 lakh on the rounded net salary.
+
+        Args:
+            target_monthly_take_home_lakhs: Desired monthly take-home salary in lakhs
+            regime: Tax regime to use
+            method: Solver strategy
+
+        Returns:
+            Solution with the gross salary in rupees, the number of net salary
+            evaluations used and the ``calculate_net_salary`` result
+        """
+        target_monthly_take_home_lakhs = Decimal(str(target_monthly_take_home_lakhs))
+        target_annual_take_home = target_monthly_take_home_lakhs * Decimal('12') * Decimal('100000')
+
+        if method == SolverMethod.ANALYTIC:
+            gross, evaluations = self.net_salary_curve(regime).first_integer_reaching(
+                Fraction(target_annual_take_home)
+            )
+            gross_lakhs = Decimal(gross) / Decimal('100000')
+        else:
+            evaluations = 0
+            left, right = Decimal('1'), Decimal('1000')
+            while right - left > Decimal('0.01'):
+                mid = (left + right) / Decimal('2')
+                # Probe uncached so the search does not flood the result cache
+                result = self._compute_net_salary(mid, regime)
+                evaluations += 1
+                annual_take_home = result.net_salary_lakhs * Decimal('100000')
+
+                if annual_take_home < target_annual_take_home:
+                    left = mid
+                else:
+                    right = mid
+            gross_lakhs = right
+
+        return GrossSalarySolution(
+            gross_salary=gross_lakhs * Decimal('100000'),
+            method=method,
+            evaluations=evaluations + 1,
+            result=self.calculate_net_salary(gross_lakhs, regime)
+        )
+
+    def solve_gross_salary_batch(
+            self,
+            targets_monthly_take_home_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime
+    ) -> ResultColumns:
+        """
+        Solve for the gross salaries behind many target monthly take-homes at once.
+
+        Gives the analytic ``solve_gross_salary_for_target_take_home``
+        answer for every target (the smallest whole-rupee gross whose annual
+        net salary reaches it), but sorts the targets and inverts
+        ``net_salary_curve`` for all of them in one integer sweep, then
+        evaluates the solved salaries through the paise batch path.
+
+        Args:
+            targets_monthly_take_home_lakhs: Desired monthly take-home salaries in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            One paise column per ``calculate_net_salary`` field, row by row in
+            input order; the ``gross_salary`` column holds the solved salaries
+        """
+        annual_targets = [Fraction(numerator * 1200000, denominator) for numerator, denominator
+                          in (Decimal(str(target)).as_integer_ratio() for target in targets_monthly_take_home_lakhs)]
+        gross_salaries = self.net_salary_curve(regime).first_integers_reaching(annual_targets)
+        return self.paise.calculate_net_salary_batch((gross * 100 for gross in gross_salaries), regime)
+
+    def find_gross_salary_for_target_take_home(
+            self,
+            target_monthly_take_home_lakhs: Decimal | float,
+            regime: TaxRegime,
+            method: SolverMethod = SolverMethod.ANALYTIC
+    ) -> NetSalaryResult:
+        """
+        Find required gross salary for desired monthly take-home salary.
+
+        Args:
+            target_monthly_take_home_lakhs: Desired monthly take-home salary in lakhs
+            regime: Tax regime to use
+            method: Solver strategy (see ``solve_gross_salary_for_target_take_home``)
+
+        Returns:
+            ``calculate_net_salary`` result for the required gross salary
+        """
+        return self.solve_gross_salary_for_target_take_home(
+            target_monthly_take_home_lakhs, regime, method
+        ).result
+
+    def compare_regimes(self, gross_salary_lakhs: Decimal | float) -> RegimeComparison:
+        """
+        Compare every regime for one gross salary in a single pass.
+
+        Basic salary, HRA and PF are computed once and shared by every
+        regime; only deductions and tax are evaluated per regime. Regimes
+        are ranked on their unrounded net salary, so the delta is not
+        affected by the rounding of the breakdowns.
+
+        Args:
+            gross_salary_lakhs: Gross salary in lakhs
+
+        Returns:
+            Comparison with a ``calculate_net_salary``-style breakdown per regime
+        """
+        gross_salary_lakhs = Decimal(str(gross_salary_lakhs))
+        gross_salary = gross_salary_lakhs * Decimal('100000')
+        components = self._salary_components(gross_salary)
+
+        unrounded_net: dict[TaxRegime, Decimal] = {}
+        breakdowns: dict[TaxRegime, NetSalaryResult] = {}
+        for regime in self._tax_slabs:
+            unrounded_net[regime], breakdowns[regime] = self._net_salary_for_components(
+                gross_salary_lakhs, components, regime
+            )
+
+        ranked = sorted(unrounded_net, key=unrounded_net.__getitem__, reverse=True)
+        best = ranked[0]
+        runner_up = ranked[1] if len(ranked) > 1 else best
+        breakeven = None
+        if self.crossover_index.between(best, runner_up):
+            breakeven = _to_lakhs(self.crossover_index.nearest(Fraction(gross_salary), best, runner_up))
+
+        return RegimeComparison(
+            gross_salary_lakhs=gross_salary_lakhs,
+            breakdowns=breakdowns,
+            best_regime=best,
+            delta_lakhs=round((unrounded_net[best] - unrounded_net[runner_up]) / Decimal('100000'), 2),
+            breakeven_gross_lakhs=breakeven
+        )
+
+    def compare_regimes_sweep(
+            self,
+            start_lakhs: Decimal | float,
+            stop_lakhs: Decimal | float,
+            step_rupees: Decimal | int = 1000
+    ) -> RegimeSweep:
+        """
+        Evaluate every regime over a gross salary range, e.g. for a chart.
+
+        Each regime's net salary curve is sampled segment by segment with
+        integer arithmetic, so a 1-500 lakh sweep at 1,000-rupee steps
+        takes tens of milliseconds. Values are exact net salaries rounded
+        half-even to the paisa, identical to ``paise.calculate_net_salary``.
+
+        Args:
+            start_lakhs: First gross salary of the grid, in lakhs
+            stop_lakhs: Last gross salary of the grid (included when on a step), in lakhs
+            step_rupees: Grid spacing in rupees
+
+        Returns:
+            Sweep with one net salary column per regime
+        """
+        start_paise = lakhs_to_paise(start_lakhs)
+        stop_paise = lakhs_to_paise(stop_lakhs)
+        step_paise = to_paise(step_rupees)
+        if step_paise <= 0:
+            raise ValueError("Sweep step must be positive")
+        if stop_paise < start_paise:
+            raise ValueError("Sweep range must not end before it starts")
+
+        count = (stop_paise - start_paise) // step_paise + 1
+        start, step, paisa = Fraction(start_paise, 100), Fraction(step_paise, 100), Fraction(1, 100)
+        crossovers = self.crossover_index.in_range(start, Fraction(stop_paise, 100))
+
+        return RegimeSweep(
+            gross_salary_paise=array('q', range(start_paise, start_paise + count * step_paise, step_paise)),
+            net_salary_paise={
+                regime: curve.sample_rounded(start, step, count, paisa)
+                for regime, curve in self.net_salary_curves.items()
+            },
+            crossovers_lakhs=tuple(_to_lakhs(point) for point in crossovers)
+        )
+
+    def calculate_freelancer_tax(
+            self,
+            gross_receipts_lakhs: Decimal | float,
+            regime: TaxRegime
+    ) -> FreelancerTaxResult:
+        """
+        Calculate tax for freelancers under Section 44ADA.
+
+        Args:
+            gross_receipts_lakhs: Gross receipts in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            Record of the calculation details, also readable as a mapping
+        """
+        gross_receipts_lakhs = Decimal(str(gross_receipts_lakhs))
+        return self._cached_result(
+            'freelancer_tax', gross_receipts_lakhs, regime, self._compute_freelancer_tax
+        )
+
+    def calculate_freelancer_tax_batch(
+            self,
+            gross_receipts_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime
+    ) -> ResultColumns:
+        """
+        Calculate freelancer tax for many gross receipts into paise columns.
+
+        Args:
+            gross_receipts_lakhs: Gross receipts in lakhs
+            regime: Tax regime to use
+
+        Returns:
+            One paise column per ``calculate_freelancer_tax`` field
+        """
+        return self.paise.calculate_freelancer_tax_batch(map(lakhs_to_paise, gross_receipts_lakhs), regime)
+
+    def freelancer_breakpoints(self, regime: TaxRegime) -> tuple[Fraction, ...]:
+        """
+        Gross receipts at which a ``calculate_freelancer_tax`` amount changes formula.
+
+        Between consecutive breakpoints every amount is linear in gross
+        receipts; at a breakpoint it may have a kink or (87A) a jump.
+
+        Args:
+            regime: Tax regime to use
+
+        Returns:
+            Ascending gross receipts in rupees
+        """
+        rules = self._rules[regime]
+        ratio = Fraction(rules.presumptive_income_ratio)
+        if ratio == 0:
+            return ()
+        cap = Fraction(rules.section_80d_self_limit)
+        fixed = sum((Fraction(amount) for _, amount in rules.freelancer_fixed_deductions), Fraction(0))
+        tax_starts, _ = self._tax_pieces(regime)
+        # 80D stops growing at its cap, taxable income leaves zero, then tax moves through its pieces
+        presumptive = {cap, fixed + cap, *(start + fixed + cap for start in tax_starts if start > 0)}
+        return tuple(sorted(income / ratio for income in presumptive if income >= 0))
+
+    def _compute_freelancer_tax(self, gross_receipts_lakhs: Decimal, regime: TaxRegime) -> FreelancerTaxResult:
+        """Uncached body of ``calculate_freelancer_tax``."""
+        gross_receipts = gross_receipts_lakhs * Decimal('100000')
+        rules = self._rules[regime]
+
+        # Under 44ADA, 50% is considered as an expense deduction
+        presumptive_income = gross_receipts * rules.presumptive_income_ratio
+
+        # Only the 80D self deduction depends on income; the rest were summed at construction
+        total_deductions = (self._freelancer_fixed_deductions[regime]
+                            + min(rules.section_80d_self_limit, presumptive_income))
+        taxable_income = max(_ZERO, presumptive_income - total_deductions)
+        tax = self.calculate_tax(taxable_income, regime)
+        net_income = gross_receipts - tax
+
+        # Shifting the exponent converts rupees to lakhs exactly, without a division
+        return FreelancerTaxResult(
+            gross_receipts_lakhs=round(gross_receipts_lakhs, 2),
+            presumptive_income_lakhs=round(presumptive_income.scaleb(-5), 2),
+            total_deductions_lakhs=round(total_deductions.scaleb(-5), 2),
+            taxable_income_lakhs=round(taxable_income.scaleb(-5), 2),
+            tax_lakhs=round(tax.scaleb(-5), 2),
+            net_income_lakhs=round(net_income.scaleb(-5), 2),
+            monthly_take_home_lakhs=round(net_income / Decimal('1200000'), 2),
+            expense_deduction_lakhs=round((gross_receipts - presumptive_income).scaleb(-5), 2)
+        )
@@ -0,0 +1,298 @@
+"""
+Precomputed lookup tables over a gross amount grid.
+
+``GridTable`` evaluates ``calculate_net_salary`` and
+``calculate_freelancer_tax`` for every point of an evenly spaced grid and
+every regime, and keeps the exact, unrounded amounts from the paise
+backend in ``array('q')`` columns. Queries are answered without running
+the tax calculation:
+
+    * on a grid point, by index;
+    * between two grid points, by exact linear interpolation of the two
+      neighbours. Every amount is linear between the breakpoints of its
+      calculation (slab edges, the 87A limit, deduction caps), so this is
+      only done in cells without a breakpoint; queries in the few other
+      cells, off the grid or below a paisa return None.
+
+Amounts are rounded from the exact values exactly like the ``Decimal``
+engine rounds them, so table results equal the engine's.
+
+Tables persist as column files (see ``calculator.binary``) named after a
+digest of the engine configuration and the grid, so a changed slab, cess
+or deduction setting never reuses a stale table: ``GridTable.cached``
+loads the matching file, or builds and saves it.
+"""
+import hashlib
+import os
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import repeat
+from math import ceil
+
+from calculator.binary import BinaryFormatError, ColumnFile, ColumnFileWriter
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import PAISE_PER_LAKH, div_half_even, lakhs_to_paise, to_paise
+from calculator.results import FREELANCER_TAX_FIELDS, NET_SALARY_FIELDS, FreelancerTaxResult, NetSalaryResult
+
+GRID_KIND = "grid"
+TABLE_VERSION = 1
+
+SALARY = "salary"
+FREELANCER = "44ada"
+_FIELDS = {SALARY: NET_SALARY_FIELDS, FREELANCER: FREELANCER_TAX_FIELDS}
+# Hundredths of a lakh per paisa, for rounding to the engine's two decimal places
+_PAISE_PER_HUNDREDTH_LAKH = PAISE_PER_LAKH // 100
+
+
+@dataclass(frozen=True, slots=True)
+class GridSpec:
+    """Evenly spaced grid of gross amounts from start to stop (inclusive when on a step), in paise."""
+
+    start_paise: int
+    stop_paise: int
+    step_paise: int
+
+    def __post_init__(self) -> None:
+        if self.step_paise <= 0:
+            raise ValueError("Grid step must be positive")
+        if self.start_paise < 0 or self.stop_paise < self.start_paise:
+            raise ValueError("Grid range must be non-negative and not end before it starts")
+
+    @classmethod
+    def from_lakhs(
+            cls,
+            start_lakhs: Decimal | float,
+            stop_lakhs: Decimal | float,
+            step_rupees: Decimal | int = 1000
+    ) -> 'GridSpec':
+        """ :return grid with bounds in lakhs and spacing in rupees """
+        return cls(lakhs_to_paise(start_lakhs), lakhs_to_paise(stop_lakhs), to_paise(step_rupees))
+
+    @property
+    def count(self) -> int:
+        """ :return number of grid points """
+        return (self.stop_paise - self.start_paise) // self.step_paise + 1
+
+    def locate(self, paise: int) -> tuple[int, int] | None:
+        """ :return index of the grid point at or below paise and the distance past it, or None outside the grid """
+        index, offset = divmod(paise - self.start_paise, self.step_paise)
+        if index < 0 or index >= self.count or (offset and index == self.count - 1):
+            return None
+        return index, offset
+
+
+# Every 1,000 rupees from 1 to 200 lakhs
+DEFAULT_GRID = GridSpec.from_lakhs(1, 200, 1000)
+
+
+def _column_name(regime: TaxRegime, calculation: str, field: str, rounded: bool = False) -> str:
+    """ :return file column name of one amount, e.g. "old.salary.tax", or "old.salary.tax.h" when rounded """
+    return f"{regime.value}.{calculation}.{field}{'.h' if rounded else ''}"
+
+
+def _exact_batch(engine: TaxEngine, calculation: str, amounts, regime: TaxRegime) -> tuple[list[array], tuple]:
+    """ :return exact amount columns of a calculation and their denominators """
+    if calculation == SALARY:
+        return engine.paise.exact_net_salary_batch(amounts, regime)
+    return engine.paise.exact_freelancer_tax_batch(amounts, regime)
+
+
+class GridTable:
+    """Exact ``calculate_net_salary`` / ``calculate_freelancer_tax`` amounts on a grid, per regime."""
+
+    def __init__(self, engine: TaxEngine, spec: GridSpec, columns: Mapping[str, array]) -> None:
+        """
+        Args:
+            engine: Engine the amounts were computed with
+            spec: Grid the amounts were computed on
+            columns: Column per ``_column_name``, one value per grid point: the exact
+                amounts and the same amounts rounded to hundredths of a lakh
+        """
+        self.engine = engine
+        self.spec = spec
+        self._columns: dict[tuple[str, TaxRegime], list[array]] = {}
+        self._hundredths: dict[tuple[str, TaxRegime], list[array]] = {}
+        # Denominators reducing exact values to paise and to hundredths of a lakh
+        self._paise_units: dict[tuple[str, TaxRegime], tuple[int, ...]] = {}
+        self._lakh_units: dict[tuple[str, TaxRegime], tuple[int, ...]] = {}
+        self._kinked: dict[tuple[str, TaxRegime], frozenset[int]] = {}
+        for regime in engine.tax_slabs:
+            for calculation, fields in _FIELDS.items():
+                key = calculation, regime
+                self._columns[key] = [columns[_column_name(regime, calculation, field)] for field in fields]
+                self._hundredths[key] = [columns[_column_name(regime, calculation, field, True)] for field in fields]
+                # Denominators depend only on the configuration; an empty batch returns them without work
+                self._paise_units[key] = _exact_batch(engine, calculation, (), regime)[1]
+                self._lakh_units[key] = tuple(unit * _PAISE_PER_HUNDREDTH_LAKH for unit in self._paise_units[key])
+                breakpoints = (engine.net_salary_curve(regime).breakpoints if calculation == SALARY
+                               else engine.freelancer_breakpoints(regime))
+                self._kinked[key] = self._kinked_cells(breakpoints)
+
+    def _kinked_cells(self, breakpoints) -> frozenset[int]:
+        """ :return indices of the cells (g_k, g_k+1] containing a breakpoint given in rupees """
+        cells = set()
+        for breakpoint in breakpoints:
+            cell = ceil((breakpoint * 100 - self.spec.start_paise) / self.spec.step_paise) - 1
+            if 0 <= cell < self.spec.count - 1:
+                cells.add(cell)
+        return frozenset(cells)
+
+    @staticmethod
+    def _points(spec: GridSpec) -> range:
+        """ :return grid amounts in paise """
+        return range(spec.start_paise, spec.start_paise + spec.count * spec.step_paise, spec.step_paise)
+
+    @staticmethod
+    def _column_names(engine: TaxEngine) -> list[str]:
+        """ :return names of every stored column, in file order """
+        return [_column_name(regime, calculation, field, rounded)
+                for regime in engine.tax_slabs for calculation, fields in _FIELDS.items()
+                for rounded in (False, True) for field in fields]
+
+    @classmethod
+    def build(cls, engine: TaxEngine, spec: GridSpec = DEFAULT_GRID) -> 'GridTable':
+        """
+        Compute a table with the paise backend.
+
+        Raises:
+            ValueError: If the grid reaches amounts too large for 64-bit exact values
+        """
+        columns: dict[str, array] = {}
+        try:
+            for regime in engine.tax_slabs:
+                for calculation, fields in _FIELDS.items():
+                    exact, units = _exact_batch(engine, calculation, cls._points(spec), regime)
+                    for field, column, unit in zip(fields, exact, units):
+                        columns[_column_name(regime, calculation, field)] = column
+                        columns[_column_name(regime, calculation, field, True)] = array(
+                            'q', map(div_half_even, column, repeat(unit * _PAISE_PER_HUNDREDTH_LAKH)))
+        except OverflowError:
+            raise ValueError("Grid amounts are too large for a lookup table") from None
+        return cls(engine, spec, columns)
+
+    @staticmethod
+    def path_for(engine: TaxEngine, spec: GridSpec, directory: str) -> str:
+        """ :return file of the table for an engine configuration and grid """
+        digest = hashlib.sha256(repr((TABLE_VERSION, engine.config_key, spec)).encode("utf-8")).hexdigest()
+        return os.path.join(directory, f"grid-{digest[:24]}.bin")
+
+    def save(self, path: str) -> None:
+        """Write the table as a column file, atomically."""
+        columns = [column for key in self._columns for column in (*self._columns[key], *self._hundredths[key])]
+        schema = [("gross_paise", "q"), *((name, "q") for name in self._column_names(self.engine))]
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as stream:
+            with ColumnFileWriter(stream, GRID_KIND, schema, spool_rows=self.spec.count + 1) as writer:
+                writer.extend([self._points(self.spec), *columns])
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, engine: TaxEngine, spec: GridSpec = DEFAULT_GRID) -> 'GridTable':
+        """
+        Read a saved table.
+
+        The caller vouches that the file was built with engine's
+        configuration (``cached`` guarantees it through the file name);
+        the grid is checked against the file.
+
+        Raises:
+            BinaryFormatError: If the file is not a table for this grid and regimes
+        """
+        with ColumnFile(path, GRID_KIND) as table:
+            points = table.column("gross_paise")
+            if (len(points) != spec.count or points[0] != spec.start_paise
+                    or (spec.count > 1 and points[1] - points[0] != spec.step_paise)):
+                raise BinaryFormatError(f"{path} was built for another grid")
+            columns: dict[str, array] = {}
+            try:
+                for name in cls._column_names(engine):
+                    columns[name] = array('q')
+                    columns[name].frombytes(table.column(name).cast("B"))
+            except KeyError as e:
+                raise BinaryFormatError(str(e)) from None
+        return cls(engine, spec, columns)
+
+    @classmethod
+    def cached(cls, engine: TaxEngine, spec: GridSpec = DEFAULT_GRID, directory: str = ".") -> 'GridTable':
+        """Load the table of this configuration and grid from directory, building and saving it on a miss."""
+        path = cls.path_for(engine, spec, directory)
+        try:
+            return cls.load(path, engine, spec)
+        except (OSError, BinaryFormatError):
+            pass
+        table = cls.build(engine, spec)
+        os.makedirs(directory, exist_ok=True)
+        table.save(path)
+        return table
+
+    def _interpolate(self, key: tuple[str, TaxRegime], index: int, offset: int) -> list[int] | None:
+        """
+        Interpolate exact amounts between two grid points.
+
+        Returns:
+            Numerators of every amount, over the exact denominators times the
+            grid step, or None when the cell holds a breakpoint
+        """
+        if index in self._kinked[key]:
+            return None
+        remaining = self.spec.step_paise - offset
+        return [column[index] * remaining + column[index + 1] * offset for column in self._columns[key]]
+
+    def _paise(self, calculation: str, regime: TaxRegime, paise: int) -> dict[str, int] | None:
+        """ :return amounts in paise keyed like the paise backend, or None when the table cannot answer """
+        located = self.spec.locate(paise)
+        if located is None:
+            return None
+        key = calculation, regime
+        index, offset = located
+        if not offset:
+            numerators, step = [column[index] for column in self._columns[key]], 1
+        else:
+            numerators, step = self._interpolate(key, index, offset), self.spec.step_paise
+            if numerators is None:
+                return None
+        return {field: div_half_even(numerator, unit * step)
+                for field, numerator, unit in zip(_FIELDS[calculation], numerators, self._paise_units[key])}
+
+    def _lakhs(self, calculation: str, regime: TaxRegime, amount_lakhs: Decimal) -> list[Decimal] | None:
+        """ :return amounts in lakhs rounded like the ``Decimal`` engine, or None when the table cannot answer """
+        paise = amount_lakhs * PAISE_PER_LAKH
+        if paise != paise.to_integral_value():
+            return None
+        located = self.spec.locate(int(paise))
+        if located is None:
+            return None
+        key = calculation, regime
+        index, offset = located
+        if not offset:
+            return [Decimal(column[index]).scaleb(-2) for column in self._hundredths[key]]
+        numerators = self._interpolate(key, index, offset)
+        if numerators is None:
+            return None
+        step = self.spec.step_paise
+        return [Decimal(div_half_even(numerator, unit * step)).scaleb(-2)
+                for numerator, unit in zip(numerators, self._lakh_units[key])]
+
+    def calculate_net_salary(self, gross_salary_paise: int, regime: TaxRegime) -> dict[str, int] | None:
+        """ :return ``PaiseTaxCalculator.calculate_net_salary`` result, or None when the table cannot answer """
+        return self._paise(SALARY, regime, gross_salary_paise)
+
+    def calculate_freelancer_tax(self, gross_receipts_paise: int, regime: TaxRegime) -> dict[str, int] | None:
+        """ :return ``PaiseTaxCalculator.calculate_freelancer_tax`` result, or None when the table cannot answer """
+        return self._paise(FREELANCER, regime, gross_receipts_paise)
+
+    def net_salary(self, gross_salary_lakhs: Decimal, regime: TaxRegime) -> NetSalaryResult | None:
+        """ :return ``TaxEngine.calculate_net_salary`` result, or None when the table cannot answer """
+        amounts = self._lakhs(SALARY, regime, gross_salary_lakhs)
+        if amounts is None:
+            return None
+        return NetSalaryResult(gross_salary_lakhs, *amounts[1:])
+
+    def freelancer_tax(self, gross_receipts_lakhs: Decimal, regime: TaxRegime) -> FreelancerTaxResult | None:
+        """ :return ``TaxEngine.calculate_freelancer_tax`` result, or None when the table cannot answer """
+        amounts = self._lakhs(FREELANCER, regime, gross_receipts_lakhs)
+        if amounts is None:
+            return None
+        return FreelancerTaxResult(round(gross_receipts_lakhs, 2), *amounts[1:])
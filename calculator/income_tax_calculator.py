@@ -1,241 +1,622 @@
-from enum import Enum
+"""
+Menu-facing income tax calculator.
+
+``IncomeTaxCalculator`` holds the mutable session state of the interactive
+menus (current regime, cess and slab settings, numeric backend) and
+delegates every calculation to an immutable ``TaxEngine``. The engine is
+rebuilt whenever the settings change, so memoised results never outlive
+the configuration they were computed under.
+
+With ``enable_grid_table`` the calculator answers net salary and
+freelancer queries from a precomputed grid (see ``calculator.grid``),
+which is rebuilt, or reloaded from disk, together with the engine.
+With ``enable_result_store`` results are shared with other processes
+through an on-disk store (see ``calculator.store``).
+"""
+from array import array
+from collections.abc import Iterable
 from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from calculator.cache import CacheStats
+# Engine names are re-exported so existing imports from this module keep working
+from calculator.engine import (
+    BASIC_SALARY_RATIO,
+    DEFAULT_CESS_PERCENTAGE,
+    DEFAULT_DEDUCTION_RULES,
+    DEFAULT_SALARY_STRUCTURE,
+    DEFAULT_TAX_SLABS,
+    FREELANCER_FIXED_DEDUCTIONS,
+    HRA_RATIO,
+    PF_RATIO,
+    PRESUMPTIVE_INCOME_RATIO,
+    REBATE_87A_LIMIT,
+    SECTION_80C_LIMIT,
+    SECTION_80D_SELF_LIMIT,
+    STANDARD_DEDUCTION,
+    CompiledSlabTable,
+    DeductionRules,
+    GrossSalarySolution,
+    NumericBackend,
+    RegimeComparison,
+    RegimeSweep,
+    SalaryStructure,
+    SolverMethod,
+    TaxEngine,
+    TaxRegime,
+    TaxSlab,
+    TaxSlabCollection,
+)
+from calculator.money import lakhs_to_paise
+from calculator.results import FreelancerTaxResult, NetSalaryResult, ResultColumns
+
+if TYPE_CHECKING:
+    from calculator.crossover import CrossoverIndex
+    from calculator.grid import GridSpec, GridTable
+    from calculator.marginal import MarginalRateColumns, MarginalRates
+    from calculator.paise import PaiseTaxCalculator
+    from calculator.piecewise import PiecewiseLinear
+    from calculator.store import ResultStore
+    from calculator.structure import StructureOptimum, StructurePolicy
 
 
-class TaxRegime(Enum):
-    """Enumeration for different tax regimes."""
-    OLD = "old"
-    NEW = "new"
+class IncomeTaxCalculator:
+    """Professional income tax calculator with support for different regimes."""
 
+    def __init__(self, cache_size: int = 1024, backend: NumericBackend = NumericBackend.DECIMAL) -> None:
+        """
+        Args:
+            cache_size: Maximum number of memoised net salary/freelancer results (0 disables)
+            backend: Arithmetic the menus should use (see ``paise``)
+        """
+        self.cess_percentage: Decimal = DEFAULT_CESS_PERCENTAGE
+        self.current_regime: TaxRegime = TaxRegime.OLD
+        self.backend = backend
+        self.rules: DeductionRules | dict[TaxRegime, DeductionRules] = DEFAULT_DEDUCTION_RULES
+        self.structure: SalaryStructure = DEFAULT_SALARY_STRUCTURE
+        # When set, calculations use the shipped rules of this year instead of the settings above
+        self.assessment_year: str | None = None
 
-class TaxSlab:
-    """Represents a tax slab with maximum income limit and tax rate."""
+        # Initialize tax slabs
+        self._tax_slabs: dict[TaxRegime, TaxSlabCollection] = dict(DEFAULT_TAX_SLABS)
 
-    def __init__(self, max_amount: Decimal, rate: Decimal) -> None:
-        self.max_amount = max_amount
-        self.rate = rate
+        self._cache_size = cache_size
+        self._engine: TaxEngine | None = None
+        self._engine_state: tuple | None = None
+        self._grid_spec: 'GridSpec | None' = None
+        self._grid_directory: str | None = None
+        self._grid_table: 'GridTable | None' = None
+        self._result_store: 'ResultStore | None' = None
 
+    @property
+    def current_regime_name(self):
+        """ :return regime name """
+        return self.current_regime.name.title()
 
-class TaxSlabCollection:
-    """Collection of tax slabs for a specific regime."""
+    def _config_fingerprint(self) -> tuple:
+        """ :return snapshot of the slab, cess, deduction and salary structure configuration """
+        rules = self.rules if isinstance(self.rules, DeductionRules) else tuple(self.rules.items())
+        return self.cess_percentage, rules, self.structure, tuple(
+            (regime, collection.slabs) for regime, collection in self._tax_slabs.items()
+        )
 
-    def __init__(self, slabs: list[TaxSlab]) -> None:
-        self.slabs = slabs
+    @property
+    def engine(self) -> TaxEngine:
+        """ :return immutable engine for the selected assessment year or the current settings """
+        return self._engine_for(None)
 
+    def _engine_for(self, assessment_year: str | None) -> TaxEngine:
+        """
+        Pick the engine for a call.
 
-class IncomeTaxCalculator:
-    """Professional income tax calculator with support for different regimes."""
+        Args:
+            assessment_year: Year requested by the call; falls back to ``self.assessment_year``
 
-    def __init__(self) -> None:
-        self.cess_percentage: Decimal = Decimal('0.04')
-        self.current_regime: TaxRegime = TaxRegime.OLD
+        Returns:
+            The shared engine of that year's rule set, or without a year the
+            engine built from this calculator's settings (rebuilt if they changed)
+        """
+        assessment_year = assessment_year or self.assessment_year
+        if assessment_year is not None:
+            # Imported on first use so sessions without a year never load the rule files' parsers
+            from calculator.rulesets import engine_for
+            return engine_for(assessment_year)
+
+        fingerprint = self._config_fingerprint()
+        if self._engine is None or fingerprint != self._engine_state:
+            self._engine = TaxEngine(self._tax_slabs, self.cess_percentage, self.rules, self.structure,
+                                     self._cache_size)
+            self._engine_state = fingerprint
+        return self._engine
+
+    def enable_grid_table(self, spec: 'GridSpec | None' = None, directory: str | None = None) -> None:
+        """
+        Answer net salary and freelancer queries from a precomputed lookup table.
 
-        # Initialize tax slabs
-        self._tax_slabs: dict[TaxRegime, TaxSlabCollection] = {
-            TaxRegime.OLD: TaxSlabCollection([
-                TaxSlab(Decimal('250000'), Decimal('0')),
-                TaxSlab(Decimal('500000'), Decimal('0.05')),
-                TaxSlab(Decimal('1000000'), Decimal('0.20')),
-                TaxSlab(Decimal('Infinity'), Decimal('0.30'))
-            ]),
-            TaxRegime.NEW: TaxSlabCollection([
-                TaxSlab(Decimal('300000'), Decimal('0')),
-                TaxSlab(Decimal('600000'), Decimal('0.05')),
-                TaxSlab(Decimal('900000'), Decimal('0.10')),
-                TaxSlab(Decimal('1200000'), Decimal('0.15')),
-                TaxSlab(Decimal('1500000'), Decimal('0.20')),
-                TaxSlab(Decimal('Infinity'), Decimal('0.30'))
-            ])
-        }
+        The table covers both regimes and is built on first use for the
+        current settings; calls with an assessment year, or amounts the
+        table cannot answer exactly, still go to the engine.
+
+        Args:
+            spec: Grid to precompute (defaults to every 1,000 rupees from 1 to 200 lakhs)
+            directory: Keep tables as files here and load them instead of recomputing
+        """
+        from calculator.grid import DEFAULT_GRID
+        self._grid_spec = spec or DEFAULT_GRID
+        self._grid_directory = directory
+        self._grid_table = None
+
+    def disable_grid_table(self) -> None:
+        """Stop using the lookup table and release it."""
+        self._grid_spec = self._grid_directory = self._grid_table = None
 
     @property
-    def current_regime_name(self):
-        """ :return regime name """
-        return self.current_regime.name.title()
+    def grid_table(self) -> 'GridTable | None':
+        """ :return lookup table for the current settings (None unless enabled), rebuilt when they change """
+        if self._grid_spec is None:
+            return None
+        engine = self.engine
+        if self._grid_table is None or self._grid_table.engine is not engine:
+            from calculator.grid import GridTable
+            if self._grid_directory is None:
+                self._grid_table = GridTable.build(engine, self._grid_spec)
+            else:
+                self._grid_table = GridTable.cached(engine, self._grid_spec, self._grid_directory)
+        return self._grid_table
+
+    def enable_result_store(self, path: str, max_bytes: int | None = None) -> None:
+        """
+        Share net salary, freelancer and gross-for-take-home results with other processes.
+
+        Results are read from, and computed results written to, a SQLite
+        store keyed by the engine configuration, so it is safe across
+        settings changes and assessment years.
+
+        Args:
+            path: Store database file, created if missing
+            max_bytes: Evict least recently used results beyond this size (defaults to 256 MB)
+        """
+        from calculator.store import DEFAULT_MAX_BYTES, ResultStore
+        self.disable_result_store()
+        self._result_store = ResultStore(path, max_bytes or DEFAULT_MAX_BYTES)
+
+    def disable_result_store(self) -> None:
+        """Stop using the result store and close it."""
+        if self._result_store is not None:
+            self._result_store.close()
+        self._result_store = None
+
+    @property
+    def result_store(self) -> 'ResultStore | None':
+        """ :return result store shared with other processes (None unless enabled) """
+        return self._result_store
+
+    @property
+    def crossover_index(self) -> 'CrossoverIndex':
+        """ :return exact regime crossovers for the current settings """
+        return self.engine.crossover_index
+
+    @property
+    def paise(self) -> 'PaiseTaxCalculator':
+        """ :return integer-paise calculator sharing this calculator's configuration """
+        return self.engine.paise
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        """ :return hit/miss/eviction counters of the current engine's result cache """
+        return self.engine.cache_stats
+
+    def clear_cache(self) -> None:
+        """Drop all memoised results."""
+        self.engine.clear_cache()
 
-    def calculate_tax(self, taxable_income: Decimal, regime: TaxRegime | None = None) -> Decimal:
+    def calculate_tax(
+            self,
+            taxable_income: Decimal,
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> Decimal:
         """
         Calculate tax based on taxable income and regime.
 
         Args:
             taxable_income: Income amount to calculate tax on
             regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
         Returns:
             Total tax including cess
         """
-        # Income tax rebate u/s 87A
-        if taxable_income < Decimal('500000'):
-            return Decimal('0')
+        return self._engine_for(assessment_year).calculate_tax(taxable_income, regime or self.current_regime)
+
+    def calculate_tax_batch(
+            self,
+            taxable_incomes: Iterable[Decimal | int | float | str],
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> tuple[array, array, array]:
+        """
+        Calculate tax for many taxable incomes at once using integer paise.
+
+        Args:
+            taxable_incomes: Taxable incomes in rupees
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
+
+        Returns:
+            Tuple of ``array('q')`` columns (tax, cess, total) in paise; see
+            ``TaxEngine.calculate_tax_batch``
+        """
+        return self._engine_for(assessment_year).calculate_tax_batch(
+            taxable_incomes, regime or self.current_regime
+        )
+
+    def calculate_net_salary(
+            self,
+            gross_salary_lakhs: Decimal | float,
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> NetSalaryResult:
+        """
+        Calculate net salary after tax deductions.
+
+        Args:
+            gross_salary_lakhs: Gross salary in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
+        Returns:
+            Record of the calculation details, also readable as a mapping
+        """
         regime = regime or self.current_regime
-        slabs = self._tax_slabs[regime].slabs
+        if self._grid_spec is not None and not (assessment_year or self.assessment_year):
+            gross_salary_lakhs = Decimal(str(gross_salary_lakhs))
+            result = self.grid_table.net_salary(gross_salary_lakhs, regime)
+            if result is not None:
+                return result
+        if self._result_store is not None:
+            from calculator.store import StoredFunction
+            return self._result_store.resolve(
+                StoredFunction.NET_SALARY, self._engine_for(assessment_year), gross_salary_lakhs, regime
+            )
+        return self._engine_for(assessment_year).calculate_net_salary(
+            gross_salary_lakhs, regime
+        )
+
+    def calculate_net_salary_batch(
+            self,
+            gross_salaries_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> ResultColumns:
+        """
+        Calculate net salaries for many gross salaries into paise columns.
 
-        tax: Decimal = Decimal('0')
-        prev_max: Decimal = Decimal('0')
+        Args:
+            gross_salaries_lakhs: Gross salaries in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-        for slab in slabs:
-            if taxable_income > slab.max_amount:
-                taxable_in_slab = slab.max_amount - prev_max
-            else:
-                taxable_in_slab = max(Decimal('0'), taxable_income - prev_max)
+        Returns:
+            See ``TaxEngine.calculate_net_salary_batch``
+        """
+        return self._engine_for(assessment_year).calculate_net_salary_batch(
+            gross_salaries_lakhs, regime or self.current_regime
+        )
 
-            tax += taxable_in_slab * slab.rate
+    def net_salary_curve(
+            self,
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> 'PiecewiseLinear':
+        """
+        Annual net salary as an exact piecewise-linear function of gross salary.
 
-            if taxable_income <= slab.max_amount:
-                break
+        Args:
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-            prev_max = slab.max_amount
+        Returns:
+            Piecewise-linear net salary function; both axes are in rupees
+        """
+        return self._engine_for(assessment_year).net_salary_curve(regime or self.current_regime)
 
-        cess = tax * self.cess_percentage
-        return tax + cess
+    def solve_gross_salary_for_target_take_home(
+            self,
+            target_monthly_take_home_lakhs: Decimal | float,
+            regime: TaxRegime | None = None,
+            method: SolverMethod = SolverMethod.ANALYTIC,
+            assessment_year: str | None = None
+    ) -> GrossSalarySolution:
+        """
+        Solve for the gross salary behind a target monthly take-home.
 
-    def calculate_net_salary(
+        Args:
+            target_monthly_take_home_lakhs: Desired monthly take-home salary in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            method: Solver strategy (see ``TaxEngine.solve_gross_salary_for_target_take_home``)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
+
+        Returns:
+            Solution with the gross salary in rupees, the number of net salary
+            evaluations used and the ``calculate_net_salary`` result
+        """
+        return self._engine_for(assessment_year).solve_gross_salary_for_target_take_home(
+            target_monthly_take_home_lakhs, regime or self.current_regime, method
+        )
+
+    def find_gross_salary_for_target_take_home(
+            self,
+            target_monthly_take_home_lakhs: Decimal | float,
+            regime: TaxRegime | None = None,
+            method: SolverMethod = SolverMethod.ANALYTIC,
+            assessment_year: str | None = None
+    ) -> NetSalaryResult:
+        """
+        Find required gross salary for desired monthly take-home salary.
+
+        Args:
+            target_monthly_take_home_lakhs: Desired monthly take-home salary in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            method: Solver strategy (see ``solve_gross_salary_for_target_take_home``)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
+
+        Returns:
+            ``calculate_net_salary`` result for the required gross salary
+        """
+        if self._result_store is not None and method == SolverMethod.ANALYTIC:
+            from calculator.store import StoredFunction
+            return self._result_store.resolve(
+                StoredFunction.GROSS_FOR_TAKE_HOME, self._engine_for(assessment_year),
+                target_monthly_take_home_lakhs, regime or self.current_regime
+            )
+        return self._engine_for(assessment_year).find_gross_salary_for_target_take_home(
+            target_monthly_take_home_lakhs, regime or self.current_regime, method
+        )
+
+    def solve_gross_salary_batch(
+            self,
+            targets_monthly_take_home_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> ResultColumns:
+        """
+        Solve for the gross salaries behind many target monthly take-homes into paise columns.
+
+        Args:
+            targets_monthly_take_home_lakhs: Desired monthly take-home salaries in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
+
+        Returns:
+            See ``TaxEngine.solve_gross_salary_batch``
+        """
+        return self._engine_for(assessment_year).solve_gross_salary_batch(
+            targets_monthly_take_home_lakhs, regime or self.current_regime
+        )
+
+    def optimize_salary_structure(
             self,
             gross_salary_lakhs: Decimal | float,
-            regime: TaxRegime | None = None
-    ) -> dict:
+            policy: 'StructurePolicy | None' = None,
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> 'StructureOptimum':
         """
-        Calculate net salary after tax deductions.
+        Find the basic/HRA/PF split within policy bounds that maximizes net salary.
 
         Args:
             gross_salary_lakhs: Gross salary in lakhs
+            policy: Bounds of every structure ratio (see ``calculator.structure.DEFAULT_POLICY``)
             regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
         Returns:
-            Dictionary containing calculation details
+            Best split in paise and its gain over the configured structure
         """
-        gross_salary_lakhs = Decimal(str(gross_salary_lakhs))
-        gross_salary = gross_salary_lakhs * Decimal('100000')
-        regime = regime or self.current_regime
+        # Imported on first use so sessions that never optimize do not load the batch tooling
+        from calculator.structure import DEFAULT_POLICY, StructureOptimizer
+        optimizer = StructureOptimizer(self._engine_for(assessment_year), policy or DEFAULT_POLICY)
+        return optimizer.optimize(lakhs_to_paise(gross_salary_lakhs), regime or self.current_regime)
 
-        # Calculate basic salary (50% of gross salary)
-        basic_salary = gross_salary * Decimal('0.5')
+    def compare_regimes(
+            self,
+            gross_salary_lakhs: Decimal | float,
+            assessment_year: str | None = None
+    ) -> RegimeComparison:
+        """
+        Compare every regime for one gross salary in a single pass.
 
-        # Calculate HRA component (Assuming HRA is 50% of basic salary)
-        hra = basic_salary * Decimal('0.4')
+        Args:
+            gross_salary_lakhs: Gross salary in lakhs
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-        # Calculate employee's PF contribution (12% of basic salary)
-        employee_pf = basic_salary * Decimal('0.12')
+        Returns:
+            Breakdowns per regime, the best regime, its advantage and the nearest breakeven
+        """
+        return self._engine_for(assessment_year).compare_regimes(gross_salary_lakhs)
+
+    def compare_regimes_sweep(
+            self,
+            start_lakhs: Decimal | float,
+            stop_lakhs: Decimal | float,
+            step_rupees: Decimal | int = 1000,
+            assessment_year: str | None = None
+    ) -> RegimeSweep:
+        """
+        Evaluate every regime over a gross salary range.
+
+        Args:
+            start_lakhs: First gross salary of the grid, in lakhs
+            stop_lakhs: Last gross salary of the grid, in lakhs
+            step_rupees: Grid spacing in rupees
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
+
+        Returns:
+            Net salary columns in paise per regime and the crossovers within the range
+        """
+        return self._engine_for(assessment_year).compare_regimes_sweep(start_lakhs, stop_lakhs, step_rupees)
 
-        # Calculate employer's PF contribution (12% of basic salary)
-        employer_pf = basic_salary * Decimal('0.12')
+    def salary_marginal_rates(
+            self,
+            gross_salary_lakhs: Decimal | float,
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> 'MarginalRates':
+        """
+        Exact marginal rates of ``calculate_net_salary`` at a gross salary.
 
-        # total pf
-        total_pf = employee_pf + employer_pf
-        # Deductions
-        standard_deduction = Decimal('50000')  # Standard deduction allowed in both regimes
+        Args:
+            gross_salary_lakhs: Gross salary in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-        if regime == TaxRegime.OLD:
-            # PF contribution under section 80C (up to ₹1.5 lakh)
-            section_80c_deduction = min(employee_pf, Decimal('150000'))
+        Returns:
+            See ``TaxEngine.salary_marginal_rates``
+        """
+        return self._engine_for(assessment_year).salary_marginal_rates(
+            gross_salary_lakhs, regime or self.current_regime
+        )
 
-            # HRA exemption calculation
-            # Assuming maximum HRA exemption (rent paid is high enough)
-            hra_exemption = hra  # Since we're assuming the maximum possible exemption
+    def salary_marginal_rates_batch(
+            self,
+            gross_salaries_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> 'MarginalRateColumns':
+        """
+        Marginal rates of ``calculate_net_salary`` for many gross salaries.
 
-            # Total deductions
-            deductions = standard_deduction + section_80c_deduction + hra_exemption
-        else:
-            # In the new regime, only standard deduction is allowed
-            deductions = standard_deduction
+        Args:
+            gross_salaries_lakhs: Gross salaries in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-        # Calculate taxable income
-        taxable_income = gross_salary - deductions
+        Returns:
+            See ``TaxEngine.salary_marginal_rates_batch``
+        """
+        return self._engine_for(assessment_year).salary_marginal_rates_batch(
+            gross_salaries_lakhs, regime or self.current_regime
+        )
 
-        # Calculate tax
-        tax = self.calculate_tax(taxable_income, regime)
+    def freelancer_marginal_rates(
+            self,
+            gross_receipts_lakhs: Decimal | float,
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> 'MarginalRates':
+        """
+        Exact marginal rates of ``calculate_freelancer_tax`` at gross receipts.
 
-        # Calculate net salary (only employee's PF is deducted from net salary)
-        net_salary = gross_salary - total_pf - tax
+        Args:
+            gross_receipts_lakhs: Gross receipts in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-        return {
-            "gross_salary_lakhs": gross_salary_lakhs,
-            "basic_salary_lakhs": round(basic_salary / Decimal('100000'), 2),
-            "hra_lakhs": round(hra / Decimal('100000'), 2),
-            "pf_lakhs": round(total_pf / Decimal('100000'), 2),
-            "deductions_lakhs": round(deductions / Decimal('100000'), 2),
-            "taxable_income_lakhs": round(taxable_income / Decimal('100000'), 2),
-            "tax_lakhs": round(tax / Decimal('100000'), 2),
-            "net_salary_lakhs": round(net_salary / Decimal('100000'), 2),
-            "monthly_take_home_lakhs": round(net_salary / Decimal('1200000'), 2)
-        }
+        Returns:
+            See ``TaxEngine.freelancer_marginal_rates``
+        """
+        return self._engine_for(assessment_year).freelancer_marginal_rates(
+            gross_receipts_lakhs, regime or self.current_regime
+        )
 
-    def find_gross_salary_for_target_take_home(
+    def freelancer_marginal_rates_batch(
             self,
-            target_monthly_take_home_lakhs: Decimal | float,
-            regime: TaxRegime | None = None
-    ) -> dict:
+            gross_receipts_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> 'MarginalRateColumns':
         """
-        Find required gross salary for desired monthly take-home salary.
+        Marginal rates of ``calculate_freelancer_tax`` for many gross receipts.
 
         Args:
-            target_monthly_take_home_lakhs: Desired monthly take-home salary in lakhs
+            gross_receipts_lakhs: Gross receipts in lakhs
             regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
         Returns:
-            Dictionary with required gross salary details
+            See ``TaxEngine.freelancer_marginal_rates_batch``
         """
-        target_monthly_take_home_lakhs = Decimal(str(target_monthly_take_home_lakhs))
-        target_annual_take_home = target_monthly_take_home_lakhs * Decimal('12') * Decimal('100000')
-        regime = regime or self.current_regime
+        return self._engine_for(assessment_year).freelancer_marginal_rates_batch(
+            gross_receipts_lakhs, regime or self.current_regime
+        )
 
-        left, right = Decimal('1'), Decimal('1000')
-        while right - left > Decimal('0.01'):
-            mid = (left + right) / Decimal('2')
-            result = self.calculate_net_salary(mid, regime)
-            annual_take_home = result["net_salary_lakhs"] * Decimal('100000')
+    def marginal_rates_sweep(
+            self,
+            start_lakhs: Decimal | float,
+            stop_lakhs: Decimal | float,
+            regime: TaxRegime | None = None,
+            step_rupees: Decimal | int = 1000,
+            freelancer: bool = False,
+            assessment_year: str | None = None
+    ) -> 'MarginalRateColumns':
+        """
+        Marginal rates over a gross amount range, e.g. for a chart.
 
-            if annual_take_home < target_annual_take_home:
-                left = mid
-            else:
-                right = mid
+        Args:
+            start_lakhs: First gross amount of the grid, in lakhs
+            stop_lakhs: Last gross amount of the grid, in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            step_rupees: Grid spacing in rupees
+            freelancer: Sweep freelancer receipts instead of salaries
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-        return self.calculate_net_salary(right, regime)
+        Returns:
+            See ``TaxEngine.marginal_rates_sweep``
+        """
+        return self._engine_for(assessment_year).marginal_rates_sweep(
+            start_lakhs, stop_lakhs, regime or self.current_regime, step_rupees, freelancer
+        )
 
     def calculate_freelancer_tax(
             self,
             gross_receipts_lakhs: Decimal | float,
-            regime: TaxRegime | None = None
-    ) -> dict:
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> FreelancerTaxResult:
         """
         Calculate tax for freelancers under Section 44ADA.
 
         Args:
             gross_receipts_lakhs: Gross receipts in lakhs
             regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
         Returns:
-            Dictionary containing calculation details
+            Record of the calculation details, also readable as a mapping
         """
-        gross_receipts_lakhs = Decimal(str(gross_receipts_lakhs))
-        gross_receipts = gross_receipts_lakhs * Decimal('100000')
         regime = regime or self.current_regime
+        if self._grid_spec is not None and not (assessment_year or self.assessment_year):
+            gross_receipts_lakhs = Decimal(str(gross_receipts_lakhs))
+            result = self.grid_table.freelancer_tax(gross_receipts_lakhs, regime)
+            if result is not None:
+                return result
+        if self._result_store is not None:
+            from calculator.store import StoredFunction
+            return self._result_store.resolve(
+                StoredFunction.FREELANCER_TAX, self._engine_for(assessment_year), gross_receipts_lakhs, regime
+            )
+        return self._engine_for(assessment_year).calculate_freelancer_tax(
+            gross_receipts_lakhs, regime
+        )
+
+    def calculate_freelancer_tax_batch(
+            self,
+            gross_receipts_lakhs: Iterable[Decimal | float],
+            regime: TaxRegime | None = None,
+            assessment_year: str | None = None
+    ) -> ResultColumns:
+        """
+        Calculate freelancer tax for many gross receipts into paise columns.
+
+        Args:
+            gross_receipts_lakhs: Gross receipts in lakhs
+            regime: Tax regime to use (defaults to current regime if None)
+            assessment_year: Use the shipped rules of this year (see ``calculator.rulesets``)
 
-        # Under 44ADA, 50% is considered as an expense deduction
-        presumptive_income = gross_receipts * Decimal('0.5')
-
-        # Calculate deductions based on actual limits
-        deductions: dict[str, Decimal] = {
-            'section_80c': Decimal('150000'),
-            'section_80d_self': min(Decimal('25000'), presumptive_income),
-            'section_80d_parents': Decimal('50000'),
-            'section_80d_health_checkup': Decimal('5000'),
-            'hra': Decimal('60000'),
-            'standard_deduction': Decimal('50000')
-        }
-
-        total_deductions = sum(deductions.values())
-        taxable_income = max(Decimal('0'), presumptive_income - total_deductions)
-        tax = self.calculate_tax(taxable_income, regime)
-
-        return {
-            "gross_receipts_lakhs": round(gross_receipts_lakhs, 2),
-            "presumptive_income_lakhs": round(presumptive_income / Decimal('100000'), 2),
-            "total_deductions_lakhs": round(total_deductions / Decimal('100000'), 2),
-            "taxable_income_lakhs": round(taxable_income / Decimal('100000'), 2),
-            "tax_lakhs": round(tax / Decimal('100000'), 2),
-            "net_income_lakhs": round((gross_receipts - tax) / Decimal('100000'), 2),
-            "monthly_take_home_lakhs": round((gross_receipts - tax) / Decimal('1200000'), 2),
-            "expense_deduction_lakhs": round(gross_receipts * Decimal('0.5') / Decimal('100000'), 2)
-        }
+        Returns:
+            See ``TaxEngine.calculate_freelancer_tax_batch``
+        """
+        return self._engine_for(assessment_year).calculate_freelancer_tax_batch(
+            gross_receipts_lakhs, regime or self.current_regime
+        )
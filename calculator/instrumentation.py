@@ -0,0 +1,250 @@
+"""
+Opt-in instrumentation of the tax engine's hot paths.
+
+While at least one hook is registered, the methods named in
+``INSTRUMENTED_METHODS`` are replaced on ``TaxEngine`` by timed wrappers
+that pass ``(method name, elapsed nanoseconds, result)`` to every hook.
+When the last hook is removed the original methods are put back, so a
+process that never enables instrumentation runs exactly the uninstrumented
+code. Wrappers apply to every engine (and every ``IncomeTaxCalculator``)
+in the process, including calls one engine method makes to another.
+
+``MetricsRecorder`` is the bundled hook: call counts, cumulative time,
+percentiles over a sliding window and the gross salary solver's evaluation
+counts, exportable as Prometheus text or JSON.
+
+Usage:
+    with instrumented() as metrics:
+        engine.calculate_net_salary(12.5, TaxRegime.NEW)
+    metrics.write_prometheus("tax_engine.prom")
+"""
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any
+
+from calculator.engine import GrossSalarySolution, TaxEngine
+
+INSTRUMENTED_METHODS = (
+    "calculate_tax",
+    "calculate_net_salary",
+    "solve_gross_salary_for_target_take_home",
+    "find_gross_salary_for_target_take_home",
+    "calculate_freelancer_tax",
+)
+
+Hook = Callable[[str, int, Any], None]
+
+# Registered hooks; replaced as a whole so wrappers can iterate without a lock
+_hooks: tuple[Hook, ...] = ()
+_originals: dict[str, Callable[..., Any]] = {}
+_registry_lock = threading.Lock()
+
+
+def _timed(name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an engine method so every successful call is reported to the hooks."""
+    @wraps(method)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        started = perf_counter_ns()
+        result = method(*args, **kwargs)
+        elapsed = perf_counter_ns() - started
+        for hook in _hooks:
+            hook(name, elapsed, result)
+        return result
+    return timed
+
+
+def add_hook(hook: Hook) -> None:
+    """Register a hook, installing the timed wrappers if it is the first one."""
+    global _hooks
+    with _registry_lock:
+        if not _hooks:
+            for name in INSTRUMENTED_METHODS:
+                _originals[name] = getattr(TaxEngine, name)
+                setattr(TaxEngine, name, _timed(name, _originals[name]))
+        _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """Unregister a hook, restoring the original methods once none are left."""
+    global _hooks
+    with _registry_lock:
+        if hook not in _hooks:
+            return
+        remaining = list(_hooks)
+        remaining.remove(hook)
+        _hooks = tuple(remaining)
+        if not _hooks:
+            for name, original in _originals.items():
+                setattr(TaxEngine, name, original)
+            _originals.clear()
+
+
+def is_enabled() -> bool:
+    """ :return whether the timed wrappers are installed """
+    return bool(_hooks)
+
+
+@dataclass(frozen=True, slots=True)
+class CallStats:
+    """Latency summary of one instrumented method; times in seconds."""
+
+    count: int
+    total_seconds: float
+    mean_seconds: float
+    p50_seconds: float
+    p90_seconds: float
+    p99_seconds: float
+    max_seconds: float
+
+
+def _percentile(ordered: list[int], fraction: float) -> int:
+    """ :return nearest-rank percentile of an ascending list """
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, max(0, int(fraction * len(ordered) + 0.5) - 1))]
+
+
+class _MethodMetrics:
+    """Mutable counters of one method, guarded by the recorder's lock."""
+
+    __slots__ = ("count", "total_ns", "recent")
+
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.recent: deque[int] = deque(maxlen=window)
+
+
+class MetricsRecorder:
+    """
+    Hook collecting per-method call metrics.
+
+    Counts and totals cover every call; percentiles and the maximum are
+    computed over the most recent ``window`` calls of each method.
+    """
+
+    def __init__(self, window: int = 10_000) -> None:
+        if window <= 0:
+            raise ValueError("Window must be positive")
+        self.window = window
+        self._lock = threading.Lock()
+        self._methods: dict[str, _MethodMetrics] = {}
+        self._solver_calls: dict[str, int] = {}
+        self._solver_evaluations: dict[str, int] = {}
+
+    def __call__(self, name: str, elapsed_ns: int, result: Any) -> None:
+        with self._lock:
+            metrics = self._methods.get(name)
+            if metrics is None:
+                metrics = self._methods[name] = _MethodMetrics(self.window)
+            metrics.count += 1
+            metrics.total_ns += elapsed_ns
+            metrics.recent.append(elapsed_ns)
+
+            if type(result) is GrossSalarySolution:
+                method = result.method.value
+                self._solver_calls[method] = self._solver_calls.get(method, 0) + 1
+                self._solver_evaluations[method] = self._solver_evaluations.get(method, 0) + result.evaluations
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self._methods.clear()
+            self._solver_calls.clear()
+            self._solver_evaluations.clear()
+
+    def snapshot(self) -> dict[str, CallStats]:
+        """ :return latency summary per instrumented method called so far """
+        with self._lock:
+            methods = {name: (metrics.count, metrics.total_ns, sorted(metrics.recent))
+                       for name, metrics in self._methods.items()}
+
+        return {
+            name: CallStats(
+                count=count,
+                total_seconds=total_ns / 1e9,
+                mean_seconds=total_ns / count / 1e9,
+                p50_seconds=_percentile(ordered, 0.50) / 1e9,
+                p90_seconds=_percentile(ordered, 0.90) / 1e9,
+                p99_seconds=_percentile(ordered, 0.99) / 1e9,
+                max_seconds=ordered[-1] / 1e9,
+            )
+            for name, (count, total_ns, ordered) in methods.items()
+        }
+
+    def solver_evaluations(self) -> dict[str, tuple[int, int]]:
+        """ :return (solves, net salary evaluations) per gross salary solver method """
+        with self._lock:
+            return {method: (calls, self._solver_evaluations[method])
+                    for method, calls in self._solver_calls.items()}
+
+    def to_json(self) -> dict[str, Any]:
+        """ :return metrics as a JSON-serialisable document """
+        return {
+            "calls": {name: asdict(stats) for name, stats in self.snapshot().items()},
+            "solver_evaluations": {method: {"solves": solves, "evaluations": evaluations}
+                                   for method, (solves, evaluations) in self.solver_evaluations().items()},
+        }
+
+    def prometheus_text(self, prefix: str = "tax_engine") -> str:
+        """ :return metrics in the Prometheus text exposition format """
+        lines = [
+            f"# HELP {prefix}_call_seconds Latency of instrumented TaxEngine calls",
+            f"# TYPE {prefix}_call_seconds summary",
+        ]
+        for name, stats in self.snapshot().items():
+            for quantile, value in (("0.5", stats.p50_seconds), ("0.9", stats.p90_seconds),
+                                    ("0.99", stats.p99_seconds)):
+                lines.append(f'{prefix}_call_seconds{{method="{name}",quantile="{quantile}"}} {value:.9g}')
+            lines.append(f'{prefix}_call_seconds_sum{{method="{name}"}} {stats.total_seconds:.9g}')
+            lines.append(f'{prefix}_call_seconds_count{{method="{name}"}} {stats.count}')
+
+        lines += [
+            f"# HELP {prefix}_solver_evaluations_total Net salary evaluations made by the gross salary solver",
+            f"# TYPE {prefix}_solver_evaluations_total counter",
+        ]
+        for method, (_, evaluations) in self.solver_evaluations().items():
+            lines.append(f'{prefix}_solver_evaluations_total{{solver="{method}"}} {evaluations}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "tax_engine") -> None:
+        """Write the Prometheus text atomically, as textfile collectors expect."""
+        _write_atomically(path, self.prometheus_text(prefix))
+
+    def write_json(self, path: str) -> None:
+        """Write the JSON document atomically."""
+        _write_atomically(path, json.dumps(self.to_json(), indent=2) + "\n")
+
+
+def _write_atomically(path: str, text: str) -> None:
+    """Write text to a temporary file and rename it over path."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as stream:
+        stream.write(text)
+    os.replace(temporary, path)
+
+
+@contextmanager
+def instrumented(recorder: MetricsRecorder | None = None) -> Iterator[MetricsRecorder]:
+    """
+    Record engine metrics for the duration of a ``with`` block.
+
+    Args:
+        recorder: Recorder to fill (a new one by default)
+
+    Yields:
+        The recorder
+    """
+    recorder = recorder or MetricsRecorder()
+    add_hook(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_hook(recorder)
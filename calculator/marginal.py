@@ -0,0 +1,236 @@
+"""
+Exact marginal and effective tax rates.
+
+Tax is an exact piecewise-linear function of the gross amount (see
+``TaxEngine.salary_tax_curve`` and ``TaxEngine.freelancer_tax_curve``).
+Inside a segment every extra rupee costs the same tax. At a segment edge
+the rate changes (slab edges, the 80C cap, the point where 44ADA taxable
+income starts), tax jumps (the end of the 87A rebate), or both.
+
+``MarginalRateTable`` reads the marginal tax rate, the marginal take-home
+rate and the distance to the next edge straight off those segments. No
+net salary is recomputed, and a jump is reported as a jump instead of
+being smeared into a finite-difference "rate".
+"""
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from fractions import Fraction
+from itertools import repeat
+from math import ceil, lcm
+
+from calculator.money import div_half_even, paise_to_lakhs
+from calculator.piecewise import PiecewiseLinear
+
+# Places of the lakh amounts that locate edges: one paisa
+_EDGE_PLACES = 7
+
+
+def _fraction_lakhs(rupees: Fraction, places: int = 2) -> Decimal:
+    """ :return exact rupee amount in lakhs, rounded half-even to places """
+    return round(Decimal(rupees.numerator) / Decimal(rupees.denominator) / Decimal('100000'), places)
+
+
+@dataclass(frozen=True, slots=True)
+class MarginalRates:
+    """Marginal and effective tax rates at one gross amount; rates are exact shares of a rupee."""
+
+    amount_lakhs: Decimal
+    # Rounded like the ``tax_lakhs`` field of the matching calculation
+    tax_lakhs: Decimal
+    # Extra tax and extra take-home per extra rupee of gross, up to the next edge
+    marginal_tax_rate: Fraction
+    marginal_take_home_rate: Fraction
+    effective_tax_rate: Fraction
+    # First whole paisa of gross at which the rates change or tax jumps; None past the last edge
+    next_edge_lakhs: Decimal | None
+    distance_to_next_edge_lakhs: Decimal | None
+    # Step in take-home at that edge, beyond what the marginal rate accounts for (negative where 87A ends)
+    take_home_jump_lakhs: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class MarginalRateColumns:
+    """Marginal and effective tax rates for many gross amounts, one column per quantity."""
+
+    amount_paise: array
+    tax_paise: array
+    marginal_tax_rate: array
+    marginal_take_home_rate: array
+    effective_tax_rate: array
+    # -1 past the last edge
+    distance_to_next_edge_paise: array
+
+    def __len__(self) -> int:
+        return len(self.amount_paise)
+
+
+class MarginalRateTable:
+    """
+    Marginal rates of one calculation and regime, precomputed per segment.
+
+    Adjacent tax segments with the same rate and no jump between them are
+    merged, so every remaining edge is a point where the answer changes.
+    """
+
+    __slots__ = ("edges", "_retained_ratio", "_segments", "_edge_paise", "_lines", "_float_rates", "_jumps")
+
+    def __init__(self, tax_curve: PiecewiseLinear, retained_ratio: Fraction) -> None:
+        """
+        Args:
+            tax_curve: Tax as a function of the gross amount, in rupees
+            retained_ratio: Share of each gross rupee left after non-tax deductions (e.g. PF) and
+                before tax, so that take-home rate = retained_ratio - tax rate
+        """
+        self._retained_ratio = retained_ratio
+        segments = [tax_curve.segments[0]]
+        jumps: list[Fraction] = []
+        for segment in tax_curve.segments[1:]:
+            previous = segments[-1]
+            jump = segment.value_at(segment.start) - previous.value_at(segment.start)
+            if segment.slope == previous.slope and not jump:
+                continue
+            segments.append(segment)
+            jumps.append(jump)
+        self._segments = segments
+        self._jumps = jumps
+        self.edges: tuple[Fraction, ...] = tuple(segment.start for segment in segments[1:])
+
+        # Integer form for the batch path: a gross of p paise lies in segment i exactly when
+        # edge_paise[i] <= p, and its tax is (slope_units * p + 100 * offset) / denominator paise
+        self._edge_paise = [ceil(segments[0].start * 100), *(ceil(edge * 100) for edge in self.edges)]
+        self._lines = []
+        self._float_rates = []
+        for segment in segments:
+            denominator = lcm(segment.slope.denominator, segment.intercept.denominator)
+            self._lines.append((segment.slope.numerator * (denominator // segment.slope.denominator),
+                                segment.intercept.numerator * (denominator // segment.intercept.denominator),
+                                denominator))
+            self._float_rates.append((float(segment.slope), float(retained_ratio - segment.slope)))
+
+    def rates(self, amount_lakhs: Decimal | float) -> MarginalRates:
+        """
+        Marginal rates at one gross amount.
+
+        At an edge the rates of the segment starting there are reported,
+        i.e. the rates that apply to a raise.
+
+        Args:
+            amount_lakhs: Gross salary or receipts in lakhs
+
+        Returns:
+            Exact rates, tax and the distance to the next edge
+        """
+        amount_lakhs = Decimal(str(amount_lakhs))
+        gross = Fraction(amount_lakhs) * 100000
+        index = bisect_right(self.edges, gross)
+        segment = self._segments[index]
+        tax = segment.value_at(gross)
+
+        next_edge = distance = None
+        jump = Decimal('0')
+        if index < len(self.edges):
+            edge_paise = self._edge_paise[index + 1]
+            next_edge = paise_to_lakhs(edge_paise, _EDGE_PLACES)
+            distance = next_edge - amount_lakhs
+            jump = -_fraction_lakhs(self._jumps[index])
+
+        return MarginalRates(
+            amount_lakhs=amount_lakhs,
+            tax_lakhs=_fraction_lakhs(tax),
+            marginal_tax_rate=segment.slope,
+            marginal_take_home_rate=self._retained_ratio - segment.slope,
+            effective_tax_rate=tax / gross if gross else Fraction(0),
+            next_edge_lakhs=next_edge,
+            distance_to_next_edge_lakhs=distance,
+            take_home_jump_lakhs=jump
+        )
+
+    def rates_batch(self, amounts_paise: Iterable[int]) -> MarginalRateColumns:
+        """
+        Marginal rates for many gross amounts, computed in integer paise.
+
+        Each amount costs one bisect over the edges and one integer
+        division; rates are the segment's exact rate as a float.
+
+        Args:
+            amounts_paise: Gross salaries or receipts in paise
+
+        Returns:
+            Columns in input order; the tax column equals the paise backend's
+        """
+        edge_paise, lines, float_rates = self._edge_paise, self._lines, self._float_rates
+        last = len(lines) - 1
+        amounts, taxes = array('q'), array('q')
+        tax_rates, take_home_rates, effective_rates = array('d'), array('d'), array('d')
+        distances = array('q')
+
+        for paise in amounts_paise:
+            index = max(0, bisect_right(edge_paise, paise) - 1)
+            slope_units, offset, denominator = lines[index]
+            tax = div_half_even(slope_units * paise + 100 * offset, denominator)
+            tax_rate, take_home_rate = float_rates[index]
+            amounts.append(paise)
+            taxes.append(tax)
+            tax_rates.append(tax_rate)
+            take_home_rates.append(take_home_rate)
+            effective_rates.append(tax / paise if paise else 0.0)
+            distances.append(edge_paise[index + 1] - paise if index < last else -1)
+
+        return MarginalRateColumns(amounts, taxes, tax_rates, take_home_rates, effective_rates, distances)
+
+    def rates_sweep(self, start_paise: int, step_paise: int, count: int) -> MarginalRateColumns:
+        """
+        Marginal rates over an evenly spaced grid, e.g. for a chart.
+
+        Segments are walked in order: rates are repeated across each one
+        and tax is an integer arithmetic progression, so there is no
+        per-point bisect.
+
+        Args:
+            start_paise: First gross amount
+            step_paise: Positive grid spacing
+            count: Number of grid points
+
+        Returns:
+            Columns in grid order, equal to ``rates_batch`` over the same amounts
+        """
+        if step_paise <= 0:
+            raise ValueError("Sweep step must be positive")
+        edge_paise, lines, float_rates = self._edge_paise, self._lines, self._float_rates
+        amounts = array('q', range(start_paise, start_paise + count * step_paise, step_paise))
+        taxes, distances = array('q'), array('q')
+        tax_rates, take_home_rates = array('d'), array('d')
+
+        index = max(0, bisect_right(edge_paise, start_paise) - 1)
+        k = 0
+        while k < count:
+            # Grid points before the next edge belong to this segment
+            if index + 1 < len(lines):
+                edge = edge_paise[index + 1]
+                stop = min(count, max(k, -((start_paise - edge) // step_paise)))
+            else:
+                edge, stop = None, count
+
+            if stop > k:
+                slope_units, offset, denominator = lines[index]
+                numerator = slope_units * (start_paise + k * step_paise) + 100 * offset
+                increment = slope_units * step_paise
+                for _ in range(k, stop):
+                    taxes.append(div_half_even(numerator, denominator))
+                    numerator += increment
+                tax_rate, take_home_rate = float_rates[index]
+                tax_rates.extend(repeat(tax_rate, stop - k))
+                take_home_rates.extend(repeat(take_home_rate, stop - k))
+                if edge is None:
+                    distances.extend(repeat(-1, stop - k))
+                else:
+                    distances.extend(range(edge - amounts[k], edge - amounts[k] - (stop - k) * step_paise,
+                                           -step_paise))
+                k = stop
+            index += 1
+
+        effective_rates = array('d', (tax / paise if paise else 0.0 for tax, paise in zip(taxes, amounts)))
+        return MarginalRateColumns(amounts, taxes, tax_rates, take_home_rates, effective_rates, distances)
@@ -0,0 +1,90 @@
+"""
+Integer money helpers.
+
+Amounts are converted to integer paise with half-even rounding, matching
+``Decimal.quantize`` under the default context. The same rule is used
+whenever an exact scaled integer is reduced to paise or to lakhs for
+display.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+from numbers import Integral
+from typing import Any
+
+PAISE_PER_RUPEE = 100
+PAISE_PER_LAKH = 100000 * PAISE_PER_RUPEE
+# Largest amount accepted from files and requests (₹1 lakh crore); results stay well within
+# Decimal precision and 64-bit paise
+MAX_AMOUNT_LAKHS = Decimal('10000000')
+
+
+def div_half_even(numerator: int, denominator: int) -> int:
+    """Integer division rounded half-even, matching ``Decimal.quantize``."""
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder * 2 > denominator or (remainder * 2 == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def parse_amount_lakhs(value: Any) -> Decimal:
+    """
+    Read an amount in lakhs from untrusted input such as a file row or a request.
+
+    Raises:
+        ValueError: If the amount is not a number, not finite, negative or above ``MAX_AMOUNT_LAKHS``
+    """
+    text = str(value).strip()
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{text}'") from None
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount '{text}'")
+    if amount < 0:
+        raise ValueError("Amount must not be negative")
+    if amount > MAX_AMOUNT_LAKHS:
+        raise ValueError(f"Amount '{text}' exceeds the limit of {MAX_AMOUNT_LAKHS} lakhs")
+    return amount
+
+
+def decimal_places(value: Decimal) -> int:
+    """ :return number of digits after the decimal point in value """
+    return max(0, -value.as_tuple().exponent)
+
+
+def to_paise(amount: Decimal | int | float | str) -> int:
+    """Convert a rupee amount to integer paise (half-even on sub-paise input)."""
+    if isinstance(amount, Integral):
+        return int(amount) * PAISE_PER_RUPEE
+    paise = (Decimal(str(amount)) * PAISE_PER_RUPEE).quantize(Decimal('1'), rounding=ROUND_HALF_EVEN)
+    return int(paise)
+
+
+def lakhs_to_paise(amount_lakhs: Decimal | int | float | str) -> int:
+    """Convert an amount in lakhs to integer paise (half-even on sub-paise input)."""
+    if isinstance(amount_lakhs, Integral):
+        return int(amount_lakhs) * PAISE_PER_LAKH
+    paise = (Decimal(str(amount_lakhs)) * PAISE_PER_LAKH).quantize(Decimal('1'), rounding=ROUND_HALF_EVEN)
+    return int(paise)
+
+
+def paise_to_lakhs(paise: int, places: int = 2) -> Decimal:
+    """
+    Convert integer paise to lakhs rounded half-even to the given places, for display.
+
+    The input is already rounded to the paisa, so an amount lying within
+    half a paisa of a rounding boundary can display 0.01 lakh away from
+    rounding the unrounded ``Decimal`` value directly.
+    """
+    return round(Decimal(paise) / PAISE_PER_LAKH, places)
+
+
+def paise_to_rupees(paise: int) -> Decimal:
+    """ :return integer paise as an exact rupee amount with two decimal places """
+    return Decimal(paise).scaleb(-2)
+
+
+def format_rupees(paise: int) -> str:
+    """ :return integer paise as an exact rupee string with two decimals, e.g. "1234.50" """
+    sign = "-" if paise < 0 else ""
+    rupees, remainder = divmod(abs(paise), PAISE_PER_RUPEE)
+    return f"{sign}{rupees}.{remainder:02d}"
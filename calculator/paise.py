@@ -0,0 +1,308 @@
+"""
+Integer-paise numeric backend.
+
+``PaiseTaxCalculator`` mirrors ``calculate_tax``, ``calculate_net_salary``
+and ``calculate_freelancer_tax`` using only integer arithmetic. Inputs and
+outputs are integer paise; nothing is converted to lakhs here.
+
+Rounding rules:
+    * Inputs given in rupees or lakhs are converted to paise half-even.
+    * Internally every amount is an exact integer in a sub-paise unit
+      chosen from the configured ratios, slab rates and cess, so there
+      is no intermediate rounding.
+    * Every output field is its exact value rounded half-even to the
+      paisa, exactly as ``Decimal.quantize`` would round the value from
+      the ``Decimal`` path.
+
+The ``*_batch`` methods run the same arithmetic over many inputs and
+append straight into ``ResultColumns``, without a dictionary per row.
+"""
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from decimal import Decimal
+
+from calculator.engine import CompiledSlabTable, DeductionRules, TaxEngine, TaxRegime
+from calculator.money import decimal_places, div_half_even, to_paise
+from calculator.results import FREELANCER_TAX_FIELDS, NET_SALARY_FIELDS, ResultColumns
+
+
+class _IntegerRegimeTable:
+    """Slab table and deduction limits of one regime, scaled to integers in units of ``1 / scale`` paise."""
+
+    __slots__ = ("lower_bounds", "rate_units", "cumulative", "rate_scale", "cess_multiplier",
+                 "cess_scale", "rebate_limit", "standard_deduction", "section_80c_limit",
+                 "section_80d_self_limit", "freelancer_fixed_deductions", "presumptive_units",
+                 "old_regime", "net_salary_units", "freelancer_tax_units")
+
+    def __init__(
+            self,
+            table: CompiledSlabTable,
+            cess_percentage: Decimal,
+            rules: DeductionRules,
+            scale: int,
+            old_regime: bool
+    ) -> None:
+        self.old_regime = old_regime
+        self.rate_scale = 10 ** max(decimal_places(rate) for rate in table.rates)
+        self.cess_scale = 10 ** decimal_places(cess_percentage)
+        self.cess_multiplier = self.cess_scale + int(cess_percentage * self.cess_scale)
+        self.lower_bounds = [to_paise(bound) * scale for bound in table.lower_bounds]
+        self.rate_units = [int(rate * self.rate_scale) for rate in table.rates]
+        self.cumulative = [int(owed * 100 * scale * self.rate_scale) for owed in table.cumulative_tax]
+        self.rebate_limit = to_paise(rules.rebate_87a_limit) * scale
+        self.standard_deduction = to_paise(rules.standard_deduction) * scale
+        self.section_80c_limit = to_paise(rules.section_80c_limit) * scale
+        self.section_80d_self_limit = to_paise(rules.section_80d_self_limit) * scale
+        self.freelancer_fixed_deductions = sum(
+            to_paise(amount) for _, amount in rules.freelancer_fixed_deductions
+        ) * scale
+        self.presumptive_units = int(rules.presumptive_income_ratio * scale)
+
+        # Exact amounts are in 1 / unit paise; units in NET_SALARY_FIELDS and FREELANCER_TAX_FIELDS order
+        tax_unit = scale * self.tax_scale
+        self.net_salary_units = (scale, scale, scale, scale, scale, scale, tax_unit, tax_unit, tax_unit * 12)
+        self.freelancer_tax_units = (scale, scale, scale, scale, tax_unit, tax_unit, tax_unit * 12, scale)
+
+    @property
+    def tax_scale(self) -> int:
+        """ :return extra scale factor introduced by rates and cess """
+        return self.rate_scale * self.cess_scale
+
+    def tax(self, taxable: int) -> int:
+        """ :return exact tax including cess, in units of ``1 / (scale * tax_scale)`` paise """
+        # Income tax rebate u/s 87A
+        if taxable < self.rebate_limit:
+            return 0
+        bracket = bisect_right(self.lower_bounds, taxable) - 1
+        slab_tax = self.cumulative[bracket] + (taxable - self.lower_bounds[bracket]) * self.rate_units[bracket]
+        return slab_tax * self.cess_multiplier
+
+
+class PaiseTaxCalculator:
+    """
+    Integer-paise counterpart of ``TaxEngine``.
+
+    Integer tables are derived from the engine's frozen slab, cess and
+    deduction configuration once, at construction, so an instance is as
+    immutable and shareable as the engine it wraps.
+    """
+
+    def __init__(self, engine: TaxEngine) -> None:
+        self.engine = engine
+        structure = engine.structure
+
+        # Unit for salary/freelancer amounts: 1 / scale paise keeps every ratio product integral
+        self.scale = 10 ** max(
+            decimal_places(structure.basic_salary_ratio),
+            decimal_places(structure.basic_salary_ratio * structure.hra_ratio),
+            decimal_places(structure.basic_salary_ratio * structure.pf_ratio),
+            *(decimal_places(rules.presumptive_income_ratio) for rules in engine.rules.values())
+        )
+        self._basic_units = int(structure.basic_salary_ratio * self.scale)
+        self._hra_units = int(structure.basic_salary_ratio * structure.hra_ratio * self.scale)
+        self._pf_units = int(structure.basic_salary_ratio * structure.pf_ratio * self.scale)
+        self._tables: dict[TaxRegime, _IntegerRegimeTable] = {
+            regime: _IntegerRegimeTable(collection.compiled, engine.cess_percentage,
+                                        engine.rules[regime], self.scale, regime == TaxRegime.OLD)
+            for regime, collection in engine.tax_slabs.items()
+        }
+
+    def _round(self, amount: int, extra_scale: int = 1) -> int:
+        """Reduce an exact scaled amount to paise, half-even."""
+        return div_half_even(amount, self.scale * extra_scale)
+
+    def calculate_tax(self, taxable_income_paise: int, regime: TaxRegime) -> int:
+        """
+        Calculate tax on a taxable income.
+
+        Args:
+            taxable_income_paise: Taxable income in paise
+            regime: Tax regime to use
+
+        Returns:
+            Total tax including cess, in paise
+        """
+        table = self._tables[regime]
+        return self._round(table.tax(taxable_income_paise * self.scale), table.tax_scale)
+
+    def calculate_net_salary(self, gross_salary_paise: int, regime: TaxRegime) -> dict[str, int]:
+        """
+        Calculate net salary after tax deductions.
+
+        Args:
+            gross_salary_paise: Annual gross salary in paise
+            regime: Tax regime to use
+
+        Returns:
+            Dictionary of amounts in paise, keyed like ``calculate_net_salary``
+            without the ``_lakhs`` suffix
+        """
+        return dict(zip(NET_SALARY_FIELDS, self._net_salary_values(gross_salary_paise, self._tables[regime])))
+
+    def calculate_net_salary_batch(
+            self,
+            gross_salaries_paise: Iterable[int],
+            regime: TaxRegime
+    ) -> ResultColumns:
+        """
+        Calculate net salaries for many gross salaries.
+
+        Args:
+            gross_salaries_paise: Annual gross salaries in paise
+            regime: Tax regime to use
+
+        Returns:
+            One paise column per ``calculate_net_salary`` key, row by row in input order
+        """
+        columns = self._columns(self._net_salary_values, len(NET_SALARY_FIELDS), gross_salaries_paise,
+                                self._tables[regime])
+        return ResultColumns(NET_SALARY_FIELDS, dict(zip(NET_SALARY_FIELDS, columns)))
+
+    def exact_net_salary_batch(
+            self,
+            gross_salaries_paise: Iterable[int],
+            regime: TaxRegime
+    ) -> tuple[list[array], tuple[int, ...]]:
+        """
+        Calculate unrounded net salary amounts for many gross salaries.
+
+        Returns:
+            One column per ``NET_SALARY_FIELDS`` entry and its denominator:
+            column ``i`` holds exact amounts in units of ``1 / denominators[i]`` paise
+        """
+        table = self._tables[regime]
+        columns = self._columns(self._net_salary_exact, len(NET_SALARY_FIELDS), gross_salaries_paise, table)
+        return columns, table.net_salary_units
+
+    def _net_salary_values(self, gross_salary_paise: int, table: _IntegerRegimeTable) -> tuple[int, ...]:
+        """ :return ``calculate_net_salary`` amounts in paise, in ``NET_SALARY_FIELDS`` order """
+        return tuple(map(div_half_even, self._net_salary_exact(gross_salary_paise, table),
+                         table.net_salary_units))
+
+    def _net_salary_exact(self, gross_salary_paise: int, table: _IntegerRegimeTable) -> tuple[int, ...]:
+        """ :return exact ``calculate_net_salary`` amounts in units of ``table.net_salary_units`` """
+        gross_salary = gross_salary_paise * self.scale
+        basic_salary = gross_salary_paise * self._basic_units
+        hra = gross_salary_paise * self._hra_units
+        employee_pf = gross_salary_paise * self._pf_units
+        total_pf = 2 * employee_pf
+
+        deductions = table.standard_deduction
+        if table.old_regime:
+            deductions += min(employee_pf, table.section_80c_limit) + hra
+
+        taxable_income = gross_salary - deductions
+        tax = table.tax(taxable_income)
+        net_salary = (gross_salary - total_pf) * table.tax_scale - tax
+
+        return (gross_salary, basic_salary, hra, total_pf, deductions, taxable_income, tax, net_salary,
+                net_salary)
+
+    def calculate_freelancer_tax(self, gross_receipts_paise: int, regime: TaxRegime) -> dict[str, int]:
+        """
+        Calculate tax for freelancers under Section 44ADA.
+
+        Args:
+            gross_receipts_paise: Annual gross receipts in paise
+            regime: Tax regime to use
+
+        Returns:
+            Dictionary of amounts in paise, keyed like ``calculate_freelancer_tax``
+            without the ``_lakhs`` suffix
+        """
+        return dict(zip(FREELANCER_TAX_FIELDS,
+                        self._freelancer_tax_values(gross_receipts_paise, self._tables[regime])))
+
+    def calculate_freelancer_tax_batch(
+            self,
+            gross_receipts_paise: Iterable[int],
+            regime: TaxRegime
+    ) -> ResultColumns:
+        """
+        Calculate freelancer tax for many gross receipts.
+
+        Args:
+            gross_receipts_paise: Annual gross receipts in paise
+            regime: Tax regime to use
+
+        Returns:
+            One paise column per ``calculate_freelancer_tax`` key, row by row in input order
+        """
+        columns = self._columns(self._freelancer_tax_values, len(FREELANCER_TAX_FIELDS), gross_receipts_paise,
+                                self._tables[regime])
+        return ResultColumns(FREELANCER_TAX_FIELDS, dict(zip(FREELANCER_TAX_FIELDS, columns)))
+
+    def exact_freelancer_tax_batch(
+            self,
+            gross_receipts_paise: Iterable[int],
+            regime: TaxRegime
+    ) -> tuple[list[array], tuple[int, ...]]:
+        """
+        Calculate unrounded freelancer tax amounts for many gross receipts.
+
+        Returns:
+            One column per ``FREELANCER_TAX_FIELDS`` entry and its denominator:
+            column ``i`` holds exact amounts in units of ``1 / denominators[i]`` paise
+        """
+        table = self._tables[regime]
+        columns = self._columns(self._freelancer_tax_exact, len(FREELANCER_TAX_FIELDS), gross_receipts_paise,
+                                table)
+        return columns, table.freelancer_tax_units
+
+    def presumptive_units(self, regime: TaxRegime) -> int:
+        """ :return presumptive income per paisa of receipts, in units of ``1 / scale`` paise """
+        return self._tables[regime].presumptive_units
+
+    def freelancer_tax_on_presumptive(self, presumptive_income: int, regime: TaxRegime) -> int:
+        """
+        Calculate the tax of ``calculate_freelancer_tax`` from presumptive income alone.
+
+        For callers that keep presumptive income as a running total
+        (``receipts_paise * presumptive_units(regime)`` per invoice) and
+        need no other field.
+
+        Args:
+            presumptive_income: Presumptive income in units of ``1 / scale`` paise
+            regime: Tax regime to use
+
+        Returns:
+            Tax including cess, in paise
+        """
+        table = self._tables[regime]
+        total_deductions = (table.freelancer_fixed_deductions
+                            + min(table.section_80d_self_limit, presumptive_income))
+        return self._round(table.tax(max(0, presumptive_income - total_deductions)), table.tax_scale)
+
+    def _freelancer_tax_values(self, gross_receipts_paise: int, table: _IntegerRegimeTable) -> tuple[int, ...]:
+        """ :return ``calculate_freelancer_tax`` amounts in paise, in ``FREELANCER_TAX_FIELDS`` order """
+        return tuple(map(div_half_even, self._freelancer_tax_exact(gross_receipts_paise, table),
+                         table.freelancer_tax_units))
+
+    def _freelancer_tax_exact(self, gross_receipts_paise: int, table: _IntegerRegimeTable) -> tuple[int, ...]:
+        """ :return exact ``calculate_freelancer_tax`` amounts in ``table.freelancer_tax_units`` """
+        gross_receipts = gross_receipts_paise * self.scale
+        presumptive_income = gross_receipts_paise * table.presumptive_units
+        total_deductions = (table.freelancer_fixed_deductions
+                            + min(table.section_80d_self_limit, presumptive_income))
+        taxable_income = max(0, presumptive_income - total_deductions)
+        tax = table.tax(taxable_income)
+        net_income = gross_receipts * table.tax_scale - tax
+
+        return (gross_receipts, presumptive_income, total_deductions, taxable_income, tax, net_income,
+                net_income, gross_receipts - presumptive_income)
+
+    @staticmethod
+    def _columns(
+            values: Callable[[int, _IntegerRegimeTable], tuple[int, ...]],
+            width: int,
+            amounts: Iterable[int],
+            table: _IntegerRegimeTable
+    ) -> list[array]:
+        """Append the per-row values of every amount to ``width`` new ``array('q')`` columns."""
+        columns = [array('q') for _ in range(width)]
+        appenders = [column.append for column in columns]
+        for amount in amounts:
+            for append, value in zip(appenders, values(amount, table)):
+                append(value)
+        return columns
@@ -0,0 +1,204 @@
+"""
+Multiprocess execution of the batch runner.
+
+The input file is split into byte-range shards. Every worker process keeps
+its own tax engine, processes whole lines that start inside its shard and
+writes them to a temporary file; the parent then concatenates the shard
+outputs in order, so the output rows keep the input order. Invalid-row
+reports are renumbered on the way, so they name the same row of the file
+as a sequential run would.
+
+Shards are cut on line boundaries, so CSV inputs must not contain quoted
+newlines inside fields.
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO
+
+from calculator.batch import (
+    DEFAULT_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    BatchMode,
+    BatchStats,
+    RowWriter,
+    process_rows,
+    read_rows,
+)
+from calculator.engine import TaxEngine, TaxRegime
+
+# Engine owned by each worker process, created by the pool initializer
+_worker_engine: TaxEngine | None = None
+
+
+def _init_worker() -> None:
+    """Create the per-process engine."""
+    global _worker_engine
+    _worker_engine = TaxEngine()
+
+
+def plan_shards(path: str, data_start: int, chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Split the data section of a file into byte ranges.
+
+    Args:
+        path: Input file path
+        data_start: Offset of the first data byte (after any CSV header)
+        chunk_size: Target shard size in bytes
+
+    Returns:
+        List of ``(start, end)`` byte offsets; a line belongs to the shard it starts in
+    """
+    size = os.path.getsize(path)
+    chunk_size = max(1, chunk_size)
+    return [(start, min(start + chunk_size, size)) for start in range(data_start, size, chunk_size)]
+
+
+def default_chunk_size(path: str, data_start: int, workers: int) -> int:
+    """
+    Size shards from the file so that every worker gets several of them.
+
+    About four shards per worker keeps all workers busy while shards finish
+    unevenly; shards stay within ``MIN_CHUNK_SIZE`` and ``DEFAULT_CHUNK_SIZE``.
+
+    Returns:
+        Shard size in bytes
+    """
+    data_size = os.path.getsize(path) - data_start
+    return min(DEFAULT_CHUNK_SIZE, max(MIN_CHUNK_SIZE, data_size // (workers * 4)))
+
+
+def _iter_shard_lines(path: str, start: int, end: int) -> Iterator[str]:
+    """Yield decoded lines that start within [start, end)."""
+    with open(path, "rb") as stream:
+        if start > 0:
+            # Skip the tail of a line that began in the previous shard
+            stream.seek(start - 1)
+            stream.readline()
+        while stream.tell() < end:
+            line = stream.readline()
+            if not line:
+                break
+            yield line.decode("utf-8")
+
+
+def _process_shard(
+        index: int,
+        path: str,
+        start: int,
+        end: int,
+        fieldnames: list[str] | None,
+        mode: BatchMode,
+        regime: TaxRegime,
+        input_format: str,
+        output_format: str,
+        output_dir: str,
+        assessment_year: str | None = None
+) -> tuple[str, str, BatchStats]:
+    """
+    Process a single shard in a worker process.
+
+    Returns:
+        Paths of the shard's output and error files, and its statistics
+    """
+    output_path = os.path.join(output_dir, f"shard-{index:06d}.out")
+    errors_path = os.path.join(output_dir, f"shard-{index:06d}.err")
+    rows = read_rows(_iter_shard_lines(path, start, end), input_format, fieldnames)
+
+    with open(output_path, "w", newline="", encoding="utf-8") as sink, \
+            open(errors_path, "w", encoding="utf-8") as errors:
+        writer = RowWriter(sink, output_format, fieldnames=mode.output_columns)
+        stats = process_rows(
+            rows, writer, mode, regime, _worker_engine, errors, assessment_year=assessment_year
+        )
+    return output_path, errors_path, stats
+
+
+def _copy_errors(shard_errors: IO[str], errors: IO[str], rows_before: int) -> None:
+    """Copy a shard's ``Row N: message`` reports, numbering rows from the start of the file."""
+    for line in shard_errors:
+        label, number, message = line.split(" ", 2)
+        errors.write(f"{label} {int(number.rstrip(':')) + rows_before}: {message}")
+
+
+def _read_csv_header(path: str) -> tuple[list[str], int]:
+    """ :return CSV field names and the byte offset just after the header line """
+    with open(path, "rb") as stream:
+        header = stream.readline()
+    return next(csv.reader([header.decode("utf-8")])), len(header)
+
+
+def run_parallel(
+        input_path: str,
+        sink: IO[str],
+        mode: BatchMode,
+        regime: TaxRegime,
+        input_format: str,
+        output_format: str,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        errors: IO[str] | None = None,
+        assessment_year: str | None = None
+) -> BatchStats:
+    """
+    Run a batch across worker processes and merge results in input order.
+
+    Args:
+        input_path: Input CSV or JSONL file
+        sink: Stream receiving the merged output
+        mode: Calculation to apply
+        regime: Default tax regime
+        input_format: Either "csv" or "jsonl"
+        output_format: Either "csv" or "jsonl"
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_size: Shard size in bytes (sized from the file by default); smaller
+            shards balance load better, larger ones reduce per-shard overhead
+        errors: Stream for invalid-row reports (stderr by default)
+        assessment_year: Default assessment year whose shipped rules are used
+
+    Returns:
+        Combined statistics, timed end to end
+    """
+    errors = errors or sys.stderr
+    started = time.perf_counter()
+
+    fieldnames, data_start = _read_csv_header(input_path) if input_format == "csv" else (None, 0)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or default_chunk_size(input_path, data_start, workers)
+    shards = plan_shards(input_path, data_start, chunk_size)
+    stats = BatchStats()
+
+    with tempfile.TemporaryDirectory(prefix="tax-shards-") as output_dir, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_process_shard, index, input_path, start, end, fieldnames,
+                        mode, regime, input_format, output_format, output_dir, assessment_year)
+            for index, (start, end) in enumerate(shards)
+        ]
+
+        # Collect in submission order so the merged output keeps the input order
+        header_written = False
+        for future in futures:
+            output_path, errors_path, shard_stats = future.result()
+            with open(output_path, newline="", encoding="utf-8") as shard_output:
+                if output_format == "csv":
+                    # Every shard writes its own header; keep only the first one
+                    header = shard_output.readline()
+                    if header and not header_written:
+                        sink.write(header)
+                        header_written = True
+                shutil.copyfileobj(shard_output, sink)
+            with open(errors_path, encoding="utf-8") as shard_errors:
+                _copy_errors(shard_errors, errors, stats.rows + stats.skipped)
+            os.remove(output_path)
+            os.remove(errors_path)
+            stats.rows += shard_stats.rows
+            stats.skipped += shard_stats.skipped
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,260 @@
+"""
+Exact piecewise-linear functions.
+
+A ``PiecewiseLinear`` is an ordered list of ``LinearSegment`` pieces, each
+``slope * x + intercept`` on ``[start, end)`` with every value a
+``Fraction``, so tax and net salary curves built from slab edges, ratios
+and cess stay exact. ``crossover`` intersects these segments to find
+regime breakevens, ``marginal`` reads slopes as marginal rates and
+``aggregate`` integrates them over salary distributions; inverses and
+rounded samples are computed here with integer arithmetic.
+"""
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from fractions import Fraction
+from math import ceil, lcm
+
+from calculator.money import div_half_even
+
+
+def _sign(value: Fraction) -> int:
+    """ :return -1, 0 or 1 according to the sign of value """
+    return (value > 0) - (value < 0)
+
+
+@dataclass(frozen=True, slots=True)
+class LinearSegment:
+    """A linear piece ``slope * x + intercept`` on the interval [start, end)."""
+
+    start: Fraction
+    end: Fraction | None
+    slope: Fraction
+    intercept: Fraction
+
+    def value_at(self, x: Fraction) -> Fraction:
+        """ :return value of the segment's line at x """
+        return self.slope * x + self.intercept
+
+    @property
+    def supremum(self) -> Fraction | None:
+        """ :return limit of the segment at its end, or None if unbounded """
+        if self.end is None:
+            return None
+        return max(self.value_at(self.start), self.value_at(self.end))
+
+
+class PiecewiseLinear:
+    """
+    Exact piecewise-linear function built from contiguous segments.
+
+    Segments must be ordered, start where the previous one ends and have
+    non-negative slopes (the inverse ``first_integer_reaching`` needs the
+    function to be non-decreasing); jumps between segments (such as the
+    87A rebate cliff) are allowed. All arithmetic uses ``Fraction`` so there is no rounding.
+    """
+
+    def __init__(self, segments: list[LinearSegment]) -> None:
+        self.segments = segments
+        self.breakpoints: list[Fraction] = [segment.start for segment in segments]
+
+        # Running maximum of every segment's supremum; non-decreasing so it can be bisected
+        self._reach: list[Fraction | None] = []
+        best: Fraction | None = None
+        for segment in segments:
+            supremum = segment.supremum
+            if supremum is None or best is None:
+                best = supremum
+            else:
+                best = max(best, supremum)
+            self._reach.append(best)
+
+    def segment_index(self, x: Fraction) -> int:
+        """ :return index of the segment containing x """
+        return max(0, bisect_right(self.breakpoints, x) - 1)
+
+    def evaluate(self, x: Fraction) -> Fraction:
+        """Evaluate the function at x."""
+        return self.segments[self.segment_index(x)].value_at(x)
+
+    def first_integer_reaching(self, target: Fraction) -> tuple[int, int]:
+        """
+        Find the smallest integer x in the domain with f(x) >= target.
+
+        Args:
+            target: Value the function must reach
+
+        Returns:
+            Tuple of the integer x and the number of segment evaluations used
+        """
+        # Bisect the running maxima for the first segment that can reach the target
+        bounded = self._reach[:-1] if self._reach and self._reach[-1] is None else self._reach
+        index = bisect_right(bounded, target)
+        evaluations = 0
+
+        while index < len(self.segments):
+            segment = self.segments[index]
+            evaluations += 1
+            if segment.value_at(segment.start) >= target:
+                x = ceil(segment.start)
+            else:
+                x = ceil((target - segment.intercept) / segment.slope)
+
+            # Rounding up to an integer may cross into a lower segment after a jump
+            evaluations += 1
+            if self.evaluate(Fraction(x)) >= target:
+                return x, evaluations
+            index += 1
+
+        raise ValueError("Target is not reachable by this function")
+
+    def first_integers_reaching(self, targets: Sequence[Fraction]) -> array:
+        """
+        Run ``first_integer_reaching`` for many targets in one sorted sweep.
+
+        Targets are visited in (approximately) ascending order, so the first
+        segment that can reach each one is found by nudging a pointer along
+        the running maxima instead of bisecting. Every segment and bound is
+        reduced to integers once: with ``denominator`` clearing its slope
+        and intercept, ``f(x) >= n / d`` becomes
+        ``(slope_units * x + offset) * d >= n * denominator``.
+
+        Args:
+            targets: Values the function must reach
+
+        Returns:
+            ``array('q')`` of the smallest integers reaching each target, in input order
+
+        Raises:
+            ValueError: If a target is not reachable by this function
+        """
+        lines = []
+        for segment in self.segments:
+            denominator = lcm(segment.slope.denominator, segment.intercept.denominator)
+            lines.append((segment.slope.numerator * (denominator // segment.slope.denominator),
+                          segment.intercept.numerator * (denominator // segment.intercept.denominator),
+                          denominator))
+        # An integer x lies in segment i exactly when starts[i] <= x < starts[i + 1]
+        starts = [ceil(start) for start in self.breakpoints]
+        bounded = self._reach[:-1] if self._reach and self._reach[-1] is None else self._reach
+        reach = [(bound.numerator, bound.denominator) for bound in bounded]
+
+        results = array('q', bytes(8 * len(targets)))
+        index = 0
+        # Floats only order the sweep; every comparison that decides a result is exact
+        for position in sorted(range(len(targets)), key=lambda position: float(targets[position])):
+            target = targets[position]
+            numerator, denominator = target.numerator, target.denominator
+            while index < len(reach) and reach[index][0] * denominator <= numerator * reach[index][1]:
+                index += 1
+            while index > 0 and reach[index - 1][0] * denominator > numerator * reach[index - 1][1]:
+                index -= 1
+
+            probe = index
+            while probe < len(self.segments):
+                slope_units, offset, scale = lines[probe]
+                needed = numerator * scale
+                x = max(starts[probe], -((offset * denominator - needed) // (slope_units * denominator)))
+                # Rounding up to an integer may cross into a lower segment after a jump
+                slope_units, offset, scale = lines[max(0, bisect_right(starts, x) - 1)]
+                if (slope_units * x + offset) * denominator >= numerator * scale:
+                    results[position] = x
+                    break
+                probe += 1
+            else:
+                raise ValueError("Target is not reachable by this function")
+        return results
+
+    def sample_rounded(
+            self,
+            start: Fraction,
+            step: Fraction,
+            count: int,
+            unit: Fraction = Fraction(1)
+    ) -> array:
+        """
+        Evaluate the function on an evenly spaced grid, rounding every value.
+
+        Segments are walked in order and each one is sampled as an integer
+        arithmetic progression, so a sweep costs one addition and one
+        half-even division per point instead of a ``Fraction`` evaluation.
+
+        Args:
+            start: First grid point
+            step: Positive grid spacing
+            count: Number of grid points
+            unit: Values are rounded half-even to multiples of this unit
+
+        Returns:
+            ``array('q')`` of rounded values, as integer multiples of unit
+        """
+        values = array('q')
+        index = self.segment_index(start)
+        k = 0
+        while k < count:
+            # Grid points before the next breakpoint belong to this segment
+            if index + 1 < len(self.segments):
+                stop = min(count, ceil((self.segments[index + 1].start - start) / step))
+            else:
+                stop = count
+
+            if stop > k:
+                segment = self.segments[index]
+                # value_k / unit = (offset + k * increment) / denominator, all integers
+                offset = (segment.slope * start + segment.intercept) / unit
+                increment = segment.slope * step / unit
+                denominator = lcm(offset.denominator, increment.denominator)
+                increment_units = increment.numerator * (denominator // increment.denominator)
+                numerator = offset.numerator * (denominator // offset.denominator) + k * increment_units
+                for _ in range(k, stop):
+                    values.append(div_half_even(numerator, denominator))
+                    numerator += increment_units
+                k = stop
+            index += 1
+        return values
+
+    def crossings(self, other: 'PiecewiseLinear') -> list[Fraction]:
+        """
+        Find every x at which the sign of ``self - other`` changes.
+
+        Both functions are linear between their merged breakpoints, so each
+        interval is checked for a root of the difference and for a jump at
+        its start. When the functions are equal over a stretch before the
+        sign flips, the start of that stretch is reported.
+
+        Returns:
+            Ascending crossing points
+        """
+        points = sorted(set(self.breakpoints) | set(other.breakpoints))
+        found: list[Fraction] = []
+        sign = 0
+        tie_start: Fraction | None = None
+
+        for position, start in enumerate(points):
+            end = points[position + 1] if position + 1 < len(points) else None
+            mine = self.segments[self.segment_index(start)]
+            theirs = other.segments[other.segment_index(start)]
+            slope = mine.slope - theirs.slope
+            intercept = mine.intercept - theirs.intercept
+
+            # Sign at the interval start, at an interior root and just before its end
+            events = [(start, _sign(slope * start + intercept))]
+            if slope:
+                root = -intercept / slope
+                if root > start and (end is None or root < end):
+                    events.append((root, 0))
+            if end is not None:
+                events.append((end, _sign(slope * end + intercept)))
+            else:
+                events.append((None, _sign(slope) or _sign(intercept)))
+
+            for x, event_sign in events:
+                if event_sign == 0:
+                    if tie_start is None:
+                        tie_start = x
+                    continue
+                if sign and event_sign != sign:
+                    found.append(tie_start if tie_start is not None else x)
+                sign, tie_start = event_sign, None
+        return found
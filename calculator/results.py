@@ -0,0 +1,196 @@
+"""
+Result records and columnar batch results.
+
+Scalar calls return frozen, slotted records instead of dictionaries. The
+records are read-only mappings over their fields, so code written against
+the former result dictionaries (``result["tax_lakhs"]``, ``result.items()``,
+``dict(result)``) keeps working, and a record compares equal to a
+dictionary holding the same items.
+
+Batch calls return ``ResultColumns``: one ``array('q')`` of integer paise
+per field and no per-row objects. Columns can be handed out as buffers
+without copying (NumPy and Arrow use the same int64 layout), written to CSV
+straight from the integers, or turned back into dictionaries row by row.
+"""
+import sys
+from array import array
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import IO, Any
+
+from calculator.money import format_rupees, paise_to_lakhs, paise_to_rupees
+
+NET_SALARY_FIELDS = ("gross_salary", "basic_salary", "hra", "pf", "deductions", "taxable_income",
+                     "tax", "net_salary", "monthly_take_home")
+FREELANCER_TAX_FIELDS = ("gross_receipts", "presumptive_income", "total_deductions", "taxable_income",
+                         "tax", "net_income", "monthly_take_home", "expense_deduction")
+
+_UNITS = ("paise", "rupees", "lakhs")
+
+
+class _ResultRecord(Mapping):
+    """Read-only mapping over a dataclass record's fields, in declaration order."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__match_args__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__match_args__)
+
+    def __len__(self) -> int:
+        return len(self.__match_args__)
+
+    def as_dict(self) -> dict[str, Any]:
+        """ :return fields as a new dictionary """
+        return {name: getattr(self, name) for name in self.__match_args__}
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class NetSalaryResult(_ResultRecord):
+    """Outcome of ``calculate_net_salary``; amounts in lakhs rounded to two places."""
+
+    gross_salary_lakhs: Decimal
+    basic_salary_lakhs: Decimal
+    hra_lakhs: Decimal
+    pf_lakhs: Decimal
+    deductions_lakhs: Decimal
+    taxable_income_lakhs: Decimal
+    tax_lakhs: Decimal
+    net_salary_lakhs: Decimal
+    monthly_take_home_lakhs: Decimal
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FreelancerTaxResult(_ResultRecord):
+    """Outcome of ``calculate_freelancer_tax``; amounts in lakhs rounded to two places."""
+
+    gross_receipts_lakhs: Decimal
+    presumptive_income_lakhs: Decimal
+    total_deductions_lakhs: Decimal
+    taxable_income_lakhs: Decimal
+    tax_lakhs: Decimal
+    net_income_lakhs: Decimal
+    monthly_take_home_lakhs: Decimal
+    expense_deduction_lakhs: Decimal
+
+
+class ResultColumns:
+    """
+    Columnar batch results in integer paise.
+
+    Field names follow the scalar results without the unit suffix (e.g.
+    ``tax`` for ``tax_lakhs``). Row ``i`` of every column belongs to the
+    ``i``-th input.
+    """
+
+    __slots__ = ("fields", "_columns")
+
+    def __init__(self, fields: tuple[str, ...], columns: Mapping[str, array] | None = None) -> None:
+        """
+        Args:
+            fields: Column names in output order
+            columns: Existing ``array('q')`` columns to adopt (empty columns by default)
+        """
+        self.fields = fields
+        self._columns = {name: columns[name] if columns else array('q') for name in fields}
+        if len({len(column) for column in self._columns.values()}) > 1:
+            raise ValueError("Columns must all have the same length")
+
+    def __len__(self) -> int:
+        return len(self._columns[self.fields[0]])
+
+    def column(self, name: str) -> array:
+        """ :return the paise column of a field (not a copy) """
+        return self._columns[name]
+
+    def row(self, index: int, unit: str = "lakhs") -> dict[str, Any]:
+        """
+        Materialise one row as a dictionary.
+
+        Args:
+            index: Row number
+            unit: "lakhs" (rounded ``Decimal``, keyed like the scalar results),
+                "rupees" (exact ``Decimal``) or "paise" (``int``)
+        """
+        convert, suffix = self._converter(unit)
+        return {f"{name}{suffix}": convert(self._columns[name][index]) for name in self.fields}
+
+    def to_dicts(self, unit: str = "lakhs") -> Iterator[dict[str, Any]]:
+        """Yield every row as a dictionary (see ``row``), one at a time."""
+        convert, suffix = self._converter(unit)
+        names = [f"{name}{suffix}" for name in self.fields]
+        for values in zip(*(self._columns[name] for name in self.fields)):
+            yield dict(zip(names, map(convert, values)))
+
+    @staticmethod
+    def _converter(unit: str) -> tuple[Any, str]:
+        """ :return value converter and key suffix for a unit """
+        if unit == "paise":
+            return int, "_paise"
+        if unit == "rupees":
+            return paise_to_rupees, "_rupees"
+        if unit == "lakhs":
+            return paise_to_lakhs, "_lakhs"
+        raise ValueError(f"Unknown unit '{unit}', expected one of: {', '.join(_UNITS)}")
+
+    def write_csv(self, stream: IO[str], unit: str = "rupees", header: bool = True) -> int:
+        """
+        Write the columns as CSV, formatting straight from the integers.
+
+        Args:
+            stream: Text stream opened with ``newline=""``
+            unit: "paise" or exact "rupees"; "lakhs" rounds like the scalar results
+            header: Whether to write the header row
+
+        Returns:
+            Number of data rows written
+        """
+        if unit == "paise":
+            convert = str
+        elif unit == "rupees":
+            convert = format_rupees
+        else:
+            convert = self._converter(unit)[0]
+        import csv  # only batch exports need it, so scalar calls do not pay for the import
+        writer = csv.writer(stream)
+        if header:
+            writer.writerow([f"{name}_{unit}" for name in self.fields])
+        columns = [self._columns[name] for name in self.fields]
+        writer.writerows([convert(value) for value in values] for values in zip(*columns))
+        return len(self)
+
+    def buffers(self) -> dict[str, memoryview]:
+        """
+        Expose every column without copying.
+
+        Each buffer is a contiguous native-endian int64 array, the data
+        buffer layout NumPy (``numpy.frombuffer``) and Arrow int64 arrays
+        without nulls use.
+        """
+        return {name: memoryview(column) for name, column in self._columns.items()}
+
+    def to_numpy(self) -> dict[str, Any]:
+        """ :return zero-copy NumPy int64 views of every column (requires NumPy) """
+        import numpy
+
+        return {name: numpy.frombuffer(column, dtype=numpy.int64) for name, column in self._columns.items()}
+
+    def to_arrow(self) -> Any:
+        """
+        Build a ``pyarrow.Table`` over the columns without copying (requires pyarrow).
+
+        Columns are named ``<field>_paise``; write it with
+        ``pyarrow.parquet.write_table`` for Parquet output.
+        """
+        import pyarrow
+
+        if sys.byteorder != "little":
+            raise ValueError("Arrow buffers must be little-endian")
+        arrays = [pyarrow.Array.from_buffers(pyarrow.int64(), len(column), [None, pyarrow.py_buffer(column)])
+                  for column in self._columns.values()]
+        return pyarrow.Table.from_arrays(arrays, names=[f"{name}_paise" for name in self.fields])
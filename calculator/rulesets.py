@@ -0,0 +1,261 @@
+"""
+Versioned tax rule sets per assessment year.
+
+Slabs, cess, the 87A threshold, deduction limits and the 44ADA ratio of each
+assessment year live in ``calculator/rules/ay<YYYY-YY>.toml`` (a ``.json``
+file with the same structure is accepted too). A rule set is parsed and
+validated once per process, compiled into a ``TaxEngine`` and shared, so
+computations for different years can run side by side without reloading.
+
+Usage:
+    engine = engine_for("2025-26")
+    engine.calculate_net_salary(12.5, TaxRegime.NEW)
+"""
+import json
+import re
+import threading
+import tomllib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from calculator.engine import (
+    DEFAULT_SALARY_STRUCTURE,
+    CompiledSlabTable,
+    DeductionRules,
+    SalaryStructure,
+    TaxEngine,
+    TaxRegime,
+    TaxSlab,
+    TaxSlabCollection,
+)
+
+RULES_DIRECTORY = Path(__file__).with_name("rules")
+
+_ASSESSMENT_YEAR = re.compile(r"^(?:AY\s*)?(\d{4}-\d{2})$", re.IGNORECASE)
+_TOP_LEVEL_KEYS = {"assessment_year", "financial_year", "cess_percentage", "regimes"}
+_REGIME_KEYS = {
+    "slabs", "standard_deduction", "rebate_87a_limit", "section_80c_limit",
+    "section_80d_self_limit", "presumptive_income_ratio", "freelancer_fixed_deductions",
+}
+
+# Engines compiled from shipped rule sets, shared by every caller in the process
+_engines: dict[str, TaxEngine] = {}
+_engines_lock = threading.Lock()
+
+
+class RuleSetError(ValueError):
+    """Raised when a rule set is missing or fails validation."""
+
+
+@dataclass(frozen=True, slots=True)
+class RuleSet:
+    """Validated tax rules of one assessment year."""
+
+    assessment_year: str
+    financial_year: str
+    cess_percentage: Decimal
+    tax_slabs: Mapping[TaxRegime, TaxSlabCollection]
+    rules: Mapping[TaxRegime, DeductionRules]
+
+    def engine(
+            self,
+            structure: SalaryStructure = DEFAULT_SALARY_STRUCTURE,
+            cache_size: int = 1024
+    ) -> TaxEngine:
+        """ :return new engine computing with these rules """
+        return TaxEngine(self.tax_slabs, self.cess_percentage, self.rules, structure, cache_size)
+
+
+def normalise_assessment_year(assessment_year: str) -> str:
+    """
+    Validate an assessment year such as "2025-26" or "AY2025-26".
+
+    Returns:
+        The year in "YYYY-YY" form
+    """
+    match = _ASSESSMENT_YEAR.match(str(assessment_year).strip())
+    if match is None:
+        raise RuleSetError(f"Invalid assessment year '{assessment_year}', expected e.g. 2025-26")
+    return match.group(1)
+
+
+def available_assessment_years() -> list[str]:
+    """ :return assessment years with a shipped rule set, oldest first """
+    years = {path.stem[2:] for path in RULES_DIRECTORY.glob("ay*.*") if path.suffix in (".toml", ".json")}
+    return sorted(years)
+
+
+def _amount(value: Any, where: str, upper: Decimal | None = None) -> Decimal:
+    """Validate a non-negative number (optionally capped) and return it as ``Decimal``."""
+    if isinstance(value, bool) or not isinstance(value, (int, Decimal)):
+        raise RuleSetError(f"{where} must be a number")
+    amount = Decimal(value)
+    if not amount.is_finite() or amount < 0 or (upper is not None and amount > upper):
+        limit = f" between 0 and {upper}" if upper is not None else " non-negative"
+        raise RuleSetError(f"{where} must be{limit}")
+    return amount
+
+
+def _table(value: Any, where: str, allowed: set[str] | None = None) -> dict[str, Any]:
+    """Validate a table and its keys."""
+    if not isinstance(value, dict):
+        raise RuleSetError(f"{where} must be a table")
+    if allowed is not None:
+        unknown = set(value) - allowed
+        missing = allowed - set(value)
+        if unknown:
+            raise RuleSetError(f"{where} has unknown keys: {', '.join(sorted(unknown))}")
+        if missing:
+            raise RuleSetError(f"{where} is missing keys: {', '.join(sorted(missing))}")
+    return value
+
+
+def _parse_slabs(value: Any, where: str) -> TaxSlabCollection:
+    """Validate ascending slabs ending in a single open-ended slab."""
+    if not isinstance(value, list) or not value:
+        raise RuleSetError(f"{where} must be a non-empty array")
+
+    slabs: list[TaxSlab] = []
+    previous = Decimal('0')
+    for position, raw in enumerate(value):
+        slab_where = f"{where}[{position}]"
+        raw = _table(raw, slab_where)
+        unknown = set(raw) - {"up_to", "rate"}
+        if unknown or "rate" not in raw:
+            raise RuleSetError(f"{slab_where} needs 'rate' and an optional 'up_to' only")
+        rate = _amount(raw["rate"], f"{slab_where}.rate", Decimal('1'))
+
+        is_last = position == len(value) - 1
+        if "up_to" not in raw:
+            if not is_last:
+                raise RuleSetError(f"{slab_where} without 'up_to' must be the last slab")
+            slabs.append(TaxSlab(Decimal('Infinity'), rate))
+            continue
+        if is_last:
+            raise RuleSetError(f"{slab_where} is the last slab and must not have 'up_to'")
+        up_to = _amount(raw["up_to"], f"{slab_where}.up_to")
+        if up_to <= previous:
+            raise RuleSetError(f"{slab_where}.up_to must be greater than the previous slab's")
+        slabs.append(TaxSlab(up_to, rate))
+        previous = up_to
+    return TaxSlabCollection(slabs)
+
+
+def _parse_regime(value: Any, where: str) -> tuple[TaxSlabCollection, DeductionRules]:
+    """Validate one regime's slabs and deduction rules."""
+    raw = _table(value, where, _REGIME_KEYS)
+    deductions = _table(raw["freelancer_fixed_deductions"], f"{where}.freelancer_fixed_deductions")
+    rules = DeductionRules(
+        standard_deduction=_amount(raw["standard_deduction"], f"{where}.standard_deduction"),
+        section_80c_limit=_amount(raw["section_80c_limit"], f"{where}.section_80c_limit"),
+        rebate_87a_limit=_amount(raw["rebate_87a_limit"], f"{where}.rebate_87a_limit"),
+        presumptive_income_ratio=_amount(raw["presumptive_income_ratio"], f"{where}.presumptive_income_ratio",
+                                         Decimal('1')),
+        section_80d_self_limit=_amount(raw["section_80d_self_limit"], f"{where}.section_80d_self_limit"),
+        freelancer_fixed_deductions=tuple(
+            (name, _amount(amount, f"{where}.freelancer_fixed_deductions.{name}"))
+            for name, amount in deductions.items()
+        )
+    )
+    return _parse_slabs(raw["slabs"], f"{where}.slabs"), rules
+
+
+def parse_rule_set(document: Mapping[str, Any], source: str = "<rule set>") -> RuleSet:
+    """
+    Validate a parsed rule set document.
+
+    Args:
+        document: Mapping decoded from TOML or JSON, with floats as ``Decimal``
+        source: Name used in error messages
+
+    Returns:
+        Validated rule set
+
+    Raises:
+        RuleSetError: If a key is missing or unknown, or a value is out of range
+    """
+    raw = _table(dict(document), source, _TOP_LEVEL_KEYS)
+    regimes = _table(raw["regimes"], f"{source}: regimes", {regime.value for regime in TaxRegime})
+
+    tax_slabs: dict[TaxRegime, TaxSlabCollection] = {}
+    rules: dict[TaxRegime, DeductionRules] = {}
+    for regime in TaxRegime:
+        tax_slabs[regime], rules[regime] = _parse_regime(
+            regimes[regime.value], f"{source}: regimes.{regime.value}"
+        )
+
+    return RuleSet(
+        assessment_year=normalise_assessment_year(raw["assessment_year"]),
+        financial_year=str(raw["financial_year"]),
+        cess_percentage=_amount(raw["cess_percentage"], f"{source}: cess_percentage", Decimal('1')),
+        tax_slabs=MappingProxyType(tax_slabs),
+        rules=MappingProxyType(rules)
+    )
+
+
+def read_rule_set(path: str | Path) -> RuleSet:
+    """
+    Read and validate a TOML or JSON rule set file.
+
+    Raises:
+        RuleSetError: If the file cannot be decoded or fails validation
+    """
+    path = Path(path)
+    try:
+        with open(path, "rb") as stream:
+            if path.suffix == ".json":
+                document = json.load(stream, parse_float=Decimal)
+            else:
+                document = tomllib.load(stream, parse_float=Decimal)
+    except (tomllib.TOMLDecodeError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise RuleSetError(f"{path.name}: {e}") from None
+    return parse_rule_set(document, path.name)
+
+
+@lru_cache(maxsize=None)
+def load_rule_set(assessment_year: str) -> RuleSet:
+    """
+    Load the shipped rule set of an assessment year (parsed once per process).
+
+    Args:
+        assessment_year: Year such as "2025-26"
+
+    Raises:
+        RuleSetError: If no rule set is shipped for the year or it is invalid
+    """
+    assessment_year = normalise_assessment_year(assessment_year)
+    for suffix in (".toml", ".json"):
+        path = RULES_DIRECTORY / f"ay{assessment_year}{suffix}"
+        if path.exists():
+            rule_set = read_rule_set(path)
+            if rule_set.assessment_year != assessment_year:
+                raise RuleSetError(f"{path.name} declares assessment year {rule_set.assessment_year}")
+            return rule_set
+    available = ", ".join(available_assessment_years()) or "none"
+    raise RuleSetError(f"No rules for assessment year {assessment_year} (available: {available})")
+
+
+def engine_for(assessment_year: str) -> TaxEngine:
+    """
+    Return the shared engine of an assessment year, compiling it on first use.
+
+    Engines are immutable, so one instance per year serves every thread.
+    """
+    assessment_year = normalise_assessment_year(assessment_year)
+    engine = _engines.get(assessment_year)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(assessment_year)
+            if engine is None:
+                engine = _engines[assessment_year] = load_rule_set(assessment_year).engine()
+    return engine
+
+
+def compiled_table(assessment_year: str, regime: TaxRegime) -> CompiledSlabTable:
+    """ :return compiled slab table for (assessment year, regime) """
+    return engine_for(assessment_year).tax_slabs[regime].compiled
@@ -0,0 +1,351 @@
+"""
+Asyncio HTTP service wrapping the income tax calculator.
+
+A small HTTP/1.1 server built on ``asyncio`` streams with keep-alive
+connections. Every request names its own regime and is answered by one
+shared, immutable ``TaxEngine``, so handlers hold no per-session state.
+
+Endpoints (JSON in, JSON out):
+    GET  /health
+    POST /net-salary            {"gross_salary_lakhs": 12.5, "regime": "new"}
+    POST /freelancer-tax        {"gross_receipts_lakhs": 30, "regime": "old"}
+    POST /gross-for-take-home   {"target_monthly_take_home_lakhs": 1.2, "regime": "new"}
+    POST /bulk                  {"mode": "salary", "regime": "new", "amounts": [10, 12.5, ...]}
+
+Any request object may add ``"assessment_year": "2025-26"`` to be computed
+with that year's shipped rule set; requests for different years are served
+side by side by one engine per year.
+
+The three scalar endpoints also accept a JSON array of request objects and
+answer with an array, so clients can batch several calculations into one
+round trip (up to ``MAX_BATCH_ITEMS`` objects; larger amount lists belong
+in ``/bulk``); an invalid item is answered with its own ``{"error": ...}``
+entry without failing the rest of the batch. Bulk requests above ``--inline-limit`` amounts are split into
+chunks and computed in a process pool, keeping the event loop responsive.
+
+Usage:
+    python -m calculator.server --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import sys
+import traceback
+from collections.abc import Callable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any
+
+from calculator.batch import BatchMode
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import parse_amount_lakhs
+from calculator.rulesets import RuleSetError, engine_for, normalise_assessment_year
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# Largest array a scalar endpoint accepts; batches run on the event loop, so this bounds the stall
+MAX_BATCH_ITEMS = 256
+BULK_CHUNK_SIZE = 2_000
+
+# Engine owned by each pool worker, created by the pool initializer
+_worker_engine: TaxEngine | None = None
+
+
+class RequestError(Exception):
+    """Client error carrying the HTTP status to answer with."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _init_worker() -> None:
+    """Create the per-process engine."""
+    global _worker_engine
+    _worker_engine = TaxEngine()
+
+
+def _calculate_chunk(
+        mode: BatchMode,
+        regime: TaxRegime,
+        amounts: list[Decimal],
+        engine: TaxEngine | None = None,
+        assessment_year: str | None = None
+) -> list[dict]:
+    """Compute a chunk of bulk amounts (runs in a pool worker, or inline with the service engine)."""
+    if assessment_year is not None:
+        engine = engine_for(assessment_year)
+    engine = engine or _worker_engine or TaxEngine()
+    method = (engine.calculate_net_salary if mode == BatchMode.SALARY
+              else engine.calculate_freelancer_tax)
+    return [method(amount, regime) for amount in amounts]
+
+
+def _parse_amount(payload: dict[str, Any], field: str) -> Decimal:
+    """Read a non-negative amount in lakhs, up to ``MAX_AMOUNT_LAKHS``, from a request object."""
+    if field not in payload:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"Missing field '{field}'")
+    try:
+        return parse_amount_lakhs(payload[field])
+    except ValueError as e:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{field}': {e}") from None
+
+
+def _parse_enum(payload: dict[str, Any], field: str, enum: type, default: Any) -> Any:
+    """Read an enum value such as a regime from a request object."""
+    try:
+        return enum(str(payload.get(field, default.value)).lower())
+    except ValueError:
+        choices = ", ".join(member.value for member in enum)
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{field}' must be one of: {choices}") from None
+
+
+class TaxService:
+    """Request handlers and the connection loop of the HTTP service."""
+
+    def __init__(
+            self,
+            default_regime: TaxRegime = TaxRegime.OLD,
+            pool: ProcessPoolExecutor | None = None,
+            inline_limit: int = 256
+    ) -> None:
+        self.engine = TaxEngine()
+        self.default_regime = default_regime
+        self.pool = pool
+        self.inline_limit = inline_limit
+        self._routes: dict[tuple[str, str], Callable[[Any], Any]] = {
+            ("GET", "/health"): self._health,
+            ("POST", "/net-salary"): self._batched(self._net_salary),
+            ("POST", "/freelancer-tax"): self._batched(self._freelancer_tax),
+            ("POST", "/gross-for-take-home"): self._batched(self._gross_for_take_home),
+            ("POST", "/bulk"): self._bulk,
+        }
+
+    def _regime(self, payload: dict[str, Any]) -> TaxRegime:
+        """ :return regime requested by payload, or the service default """
+        return _parse_enum(payload, "regime", TaxRegime, self.default_regime)
+
+    def _assessment_year(self, payload: dict[str, Any]) -> str | None:
+        """ :return assessment year requested by payload (validated), or None for the built-in rules """
+        assessment_year = payload.get("assessment_year")
+        if assessment_year is None:
+            return None
+        try:
+            assessment_year = normalise_assessment_year(str(assessment_year))
+            engine_for(assessment_year)  # reject years without a shipped rule set up front
+        except RuleSetError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        return assessment_year
+
+    def _engine(self, payload: dict[str, Any]) -> TaxEngine:
+        """ :return engine for the assessment year requested by payload, or the service engine """
+        assessment_year = self._assessment_year(payload)
+        return self.engine if assessment_year is None else engine_for(assessment_year)
+
+    @staticmethod
+    def _batched(handler: Callable[[dict], dict]) -> Callable[[Any], Any]:
+        """
+        Let a scalar handler accept either one request object or an array of them.
+
+        Items of an array are answered independently: an item the handler rejects
+        becomes an ``{"error": ...}`` entry at its position in the response array.
+        Arrays longer than ``MAX_BATCH_ITEMS`` are refused, since they are computed
+        on the event loop.
+        """
+        def handle_item(item: Any) -> dict:
+            try:
+                return handler(_require_object(item))
+            except RequestError as e:
+                return {"error": str(e)}
+
+        async def handle(payload: Any) -> Any:
+            if isinstance(payload, list):
+                if len(payload) > MAX_BATCH_ITEMS:
+                    raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                       f"Batches are limited to {MAX_BATCH_ITEMS} requests; use /bulk for "
+                                       f"larger salary or freelancer batches")
+                return [handle_item(item) for item in payload]
+            return handler(_require_object(payload))
+        return handle
+
+    async def _health(self, _payload: Any) -> dict:
+        return {"status": "ok"}
+
+    def _net_salary(self, payload: dict) -> dict:
+        amount = _parse_amount(payload, "gross_salary_lakhs")
+        return self._engine(payload).calculate_net_salary(amount, self._regime(payload))
+
+    def _freelancer_tax(self, payload: dict) -> dict:
+        amount = _parse_amount(payload, "gross_receipts_lakhs")
+        return self._engine(payload).calculate_freelancer_tax(amount, self._regime(payload))
+
+    def _gross_for_take_home(self, payload: dict) -> dict:
+        amount = _parse_amount(payload, "target_monthly_take_home_lakhs")
+        return self._engine(payload).find_gross_salary_for_target_take_home(amount, self._regime(payload))
+
+    async def _bulk(self, payload: Any) -> dict:
+        payload = _require_object(payload)
+        mode = _parse_enum(payload, "mode", BatchMode, BatchMode.SALARY)
+        regime = self._regime(payload)
+        assessment_year = self._assessment_year(payload)
+        raw_amounts = payload.get("amounts")
+        if not isinstance(raw_amounts, list):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'amounts' must be an array")
+        amounts = [_parse_amount({f"amounts[{index}]": value}, f"amounts[{index}]")
+                   for index, value in enumerate(raw_amounts)]
+
+        if self.pool is None or len(amounts) <= self.inline_limit:
+            results = _calculate_chunk(mode, regime, amounts, self.engine, assessment_year)
+        else:
+            loop = asyncio.get_running_loop()
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(self.pool, _calculate_chunk, mode, regime,
+                                     amounts[start:start + BULK_CHUNK_SIZE], None, assessment_year)
+                for start in range(0, len(amounts), BULK_CHUNK_SIZE)
+            ))
+            results = [result for chunk in chunks for result in chunk]
+        response = {"mode": mode.value, "regime": regime.value, "results": results}
+        if assessment_year is not None:
+            response["assessment_year"] = assessment_year
+        return response
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[HTTPStatus, Any]:
+        """
+        Route a parsed request to its handler.
+
+        Returns:
+            HTTP status and the JSON-serialisable response body
+        """
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed on {path}"}
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path {path}"}
+
+        try:
+            payload = json.loads(body, parse_float=Decimal) if body else {}
+            return HTTPStatus.OK, await handler(payload)
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e}"}
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+        except Exception:
+            # Keep the connection and the service alive; the traceback goes to the server log
+            print(f"❌ Unhandled error for {method} {path}:", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _write_response(writer, HTTPStatus.BAD_REQUEST, {"error": "Bad request line"}, False)
+                    break
+
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              if version == "HTTP/1.1"
+                              else headers.get("connection", "").lower() == "keep-alive")
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _write_response(writer, HTTPStatus.BAD_REQUEST,
+                                          {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await _write_response(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                          {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, response = await self.dispatch(method.upper(), path.split("?", 1)[0], body)
+                await _write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+def _require_object(payload: Any) -> dict:
+    """Ensure a request item is a JSON object."""
+    if not isinstance(payload, dict):
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+    return payload
+
+
+def _json_default(value: Any) -> Any:
+    """Serialise result records as objects and anything else, such as Decimal, as a string."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+async def _write_response(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        body: Any,
+        keep_alive: bool
+) -> None:
+    """Serialise and send a JSON response."""
+    payload = json.dumps(body, default=_json_default).encode("utf-8")
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + payload)
+    await writer.drain()
+
+
+async def serve(host: str, port: int, service: TaxService) -> None:
+    """Run the HTTP server until cancelled."""
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"🚀 Tax service listening on {addresses}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m calculator.server``."""
+    parser = argparse.ArgumentParser(description="HTTP service for the income tax calculator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                        default=TaxRegime.OLD.value, help="Regime used when a request omits it")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="Processes for bulk requests (0 computes them on the event loop)")
+    parser.add_argument("--inline-limit", type=int, default=256,
+                        help="Bulk requests up to this many amounts are computed inline")
+    args = parser.parse_args(argv)
+
+    pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) if args.workers else None
+    service = TaxService(TaxRegime(args.regime), pool, args.inline_limit)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        print("\n🚪 Shutting down tax service.", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so enums match the ones used by worker processes
+    from calculator import server
+    sys.exit(server.main())
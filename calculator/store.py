@@ -0,0 +1,437 @@
+"""
+Persistent result store shared across processes.
+
+``ResultStore`` keeps ``calculate_net_salary``, ``calculate_freelancer_tax``
+and ``find_gross_salary_for_target_take_home`` results in a SQLite
+database, so nightly jobs, the HR portal and ad-hoc scripts stop
+recomputing each other's results. Rows are keyed by the function, the
+normalized amount (``10``, ``10.0`` and ``1E+1`` share a row), the regime
+and a digest of the engine's slab, cess and deduction configuration, so
+a changed setting or another assessment year never reads a stale result.
+
+The database runs in WAL mode: any number of processes can read while
+one writes. A whole input batch is looked up with a single query
+(``get_many``), misses are computed and inserted in one transaction
+(``put_many``), and once the database outgrows ``max_bytes`` the least
+recently used rows are evicted.
+
+Usage:
+    python -m calculator.store warm results.db --start 1 --stop 200 --step-rupees 1000
+    python -m calculator.store stats results.db
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+
+from calculator.cache import CacheStats
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import PAISE_PER_LAKH, lakhs_to_paise
+from calculator.results import FreelancerTaxResult, NetSalaryResult
+from calculator.rulesets import engine_for, normalise_assessment_year
+
+STORE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction shrinks the database to this fraction of max_bytes, so it does not run on every insert
+EVICTION_TARGET = 0.8
+# Hits refresh their row's last-used time at most this often, keeping readers from writing on every lookup
+TOUCH_INTERVAL_SECONDS = 3600
+WARM_CHUNK = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    function TEXT NOT NULL,
+    config TEXT NOT NULL,
+    regime TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    UNIQUE (function, config, regime, amount)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used, id);
+"""
+
+
+class StoredFunction(Enum):
+    """Enumeration for the calculations kept in a result store."""
+    NET_SALARY = "net_salary"
+    FREELANCER_TAX = "freelancer_tax"
+    GROSS_FOR_TAKE_HOME = "gross_for_take_home"
+
+
+# Engine method and record type behind every stored function
+_ENGINE_METHODS = {
+    StoredFunction.NET_SALARY: "calculate_net_salary",
+    StoredFunction.FREELANCER_TAX: "calculate_freelancer_tax",
+    StoredFunction.GROSS_FOR_TAKE_HOME: "find_gross_salary_for_target_take_home",
+}
+_RECORDS = {
+    StoredFunction.NET_SALARY: NetSalaryResult,
+    StoredFunction.FREELANCER_TAX: FreelancerTaxResult,
+    StoredFunction.GROSS_FOR_TAKE_HOME: NetSalaryResult,
+}
+
+_Record = NetSalaryResult | FreelancerTaxResult
+
+
+def normalize_amount(amount: Decimal | float | str) -> str:
+    """ :return canonical text of an amount in lakhs, equal for equal values """
+    try:
+        value = Decimal(str(amount))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{amount}'") from None
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount '{amount}'")
+    return format(value.normalize(), "f")
+
+
+def config_digest(engine: TaxEngine) -> str:
+    """ :return digest of an engine's slab, cess and deduction configuration """
+    return hashlib.sha256(repr((STORE_VERSION, engine.config_key)).encode("utf-8")).hexdigest()[:24]
+
+
+class ResultStore:
+    """
+    SQLite-backed result store, safe to share between processes.
+
+    One instance serializes its own calls with a lock, so it can be used
+    from several threads; processes (including forked children) each open
+    their own connection.
+    """
+
+    def __init__(self, path: str, max_bytes: int | None = DEFAULT_MAX_BYTES, timeout: float = 30.0) -> None:
+        """
+        Args:
+            path: Database file, created if missing
+            max_bytes: Evict least recently used rows beyond this size (None never evicts)
+            timeout: Seconds to wait for another process's write lock
+        """
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Store size limit must be positive")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._digests: dict[tuple, str] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """ :return this process's connection, opening it (and the schema) on first use """
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        # Autocommit mode; writes open their own transactions
+        connection = sqlite3.connect(self.path, timeout=self._timeout, isolation_level=None,
+                                     check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL still never corrupts the database; it only skips an fsync per commit
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._connection, self._pid = connection, os.getpid()
+        return connection
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT count(*) FROM results").fetchone()[0]
+
+    def _digest(self, engine: TaxEngine) -> str:
+        """ :return config digest of an engine, memoised per configuration """
+        key = engine.config_key
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = config_digest(engine)
+        return digest
+
+    def _used_bytes(self, connection: sqlite3.Connection) -> int:
+        """ :return bytes of database pages in use (free pages are reused before the file grows) """
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    @property
+    def stats(self) -> CacheStats:
+        """ :return this instance's hit/miss/eviction counters; size and max_size are in bytes """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              self._used_bytes(self._connect()), self.max_bytes or 0)
+
+    def get_many(
+            self,
+            function: StoredFunction,
+            engine: TaxEngine,
+            amounts: Iterable[Decimal | float | str],
+            regime: TaxRegime
+    ) -> dict[str, _Record]:
+        """
+        Look up a whole batch of amounts with one query.
+
+        Args:
+            function: Calculation the results belong to
+            engine: Engine whose configuration the results were computed under
+            amounts: Amounts in lakhs
+            regime: Tax regime
+
+        Returns:
+            Stored records keyed by normalized amount; misses are absent
+        """
+        keys = sorted({normalize_amount(amount) for amount in amounts})
+        if not keys:
+            return {}
+        record = _RECORDS[function]
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT amount, payload, id, last_used FROM results"
+                " WHERE function = ? AND config = ? AND regime = ?"
+                " AND amount IN (SELECT value FROM json_each(?))",
+                (function.value, self._digest(engine), regime.value, json.dumps(keys))
+            ).fetchall()
+            self._hits += len(rows)
+            self._misses += len(keys) - len(rows)
+
+            now = int(time.time())
+            stale = [(now, row_id) for _, _, row_id, last_used in rows
+                     if now - last_used >= TOUCH_INTERVAL_SECONDS]
+            if stale:
+                with connection:
+                    connection.execute("BEGIN IMMEDIATE")
+                    connection.executemany("UPDATE results SET last_used = ? WHERE id = ?", stale)
+        return {amount: record(*map(Decimal, payload.split(","))) for amount, payload, _, _ in rows}
+
+    def put_many(
+            self,
+            function: StoredFunction,
+            engine: TaxEngine,
+            results: Iterable[tuple[Decimal | float | str, _Record]],
+            regime: TaxRegime
+    ) -> None:
+        """
+        Store results in one transaction, then evict if the store has grown too large.
+
+        Args:
+            function: Calculation the results belong to
+            engine: Engine the results were computed with
+            results: Pairs of amount in lakhs and its result
+            regime: Tax regime
+        """
+        now = int(time.time())
+        digest = self._digest(engine)
+        rows = [(function.value, digest, regime.value, normalize_amount(amount),
+                 ",".join(map(str, result.values())), now) for amount, result in results]
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(
+                    "INSERT OR IGNORE INTO results (function, config, regime, amount, payload, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+            if self.max_bytes is not None and self._used_bytes(connection) > self.max_bytes:
+                self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Drop least recently used rows until the store is back under its eviction target."""
+        target = self.max_bytes * EVICTION_TARGET
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            while (used := self._used_bytes(connection)) > target:
+                count = connection.execute("SELECT count(*) FROM results").fetchone()[0]
+                if not count:
+                    break
+                # Rows are of similar size, so drop the share of rows the store is over by
+                drop = max(1, int(count * (1 - target / used)) + 1)
+                connection.execute(
+                    "DELETE FROM results WHERE id IN (SELECT id FROM results ORDER BY last_used, id LIMIT ?)",
+                    (drop,)
+                )
+                self._evictions += min(drop, count)
+
+    def resolve_many(
+            self,
+            function: StoredFunction,
+            engine: TaxEngine,
+            amounts: Sequence[Decimal | float | str],
+            regime: TaxRegime
+    ) -> list[_Record]:
+        """
+        Serve a batch from the store, computing and storing the misses.
+
+        Args:
+            function: Calculation to run
+            engine: Engine that computes the misses
+            amounts: Amounts in lakhs
+            regime: Tax regime
+
+        Returns:
+            One record per amount, in input order, equal to the engine's
+        """
+        keys = [normalize_amount(amount) for amount in amounts]
+        found = self.get_many(function, engine, keys, regime)
+        compute = getattr(engine, _ENGINE_METHODS[function])
+        computed = []
+        for key, amount in zip(keys, amounts):
+            if key not in found:
+                found[key] = compute(amount, regime)
+                computed.append((key, found[key]))
+        self.put_many(function, engine, computed, regime)
+
+        results = [found[key] for key in keys]
+        if function == StoredFunction.NET_SALARY:
+            # Echo the caller's amount, as the engine does; 10 and 10.0 share a row but keep their own form
+            for position, amount in enumerate(amounts):
+                amount = Decimal(str(amount))
+                if results[position].gross_salary_lakhs.as_tuple() != amount.as_tuple():
+                    results[position] = NetSalaryResult(amount, *list(results[position].values())[1:])
+        return results
+
+    def resolve(
+            self,
+            function: StoredFunction,
+            engine: TaxEngine,
+            amount: Decimal | float | str,
+            regime: TaxRegime
+    ) -> _Record:
+        """ :return result of one calculation, from the store or computed and stored """
+        return self.resolve_many(function, engine, [amount], regime)[0]
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """ :return number of stored rows per function and regime """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT function, regime, count(*) FROM results"
+                " GROUP BY function, regime ORDER BY function, regime"
+            ).fetchall()
+        return {(function, regime): count for function, regime, count in rows}
+
+
+def grid_amounts(start_lakhs: Decimal, stop_lakhs: Decimal, step_rupees: Decimal) -> list[Decimal]:
+    """ :return amounts in lakhs from start to stop (inclusive when on a step) every step_rupees """
+    step = lakhs_to_paise(Decimal(step_rupees) / Decimal('100000'))
+    if step <= 0:
+        raise ValueError("Grid step must be positive")
+    return [Decimal(paise) / PAISE_PER_LAKH
+            for paise in range(lakhs_to_paise(start_lakhs), lakhs_to_paise(stop_lakhs) + 1, step)]
+
+
+def warm(
+        store: ResultStore,
+        engine: TaxEngine,
+        amounts: Sequence[Decimal],
+        functions: Iterable[StoredFunction],
+        regimes: Iterable[TaxRegime],
+        chunk_size: int = WARM_CHUNK
+) -> list[tuple[StoredFunction, TaxRegime, int, int, float]]:
+    """
+    Fill the store with every amount for every function and regime.
+
+    Returns:
+        Per function and regime: rows looked up, rows already stored
+        (hits) and seconds taken
+    """
+    report = []
+    for function in functions:
+        for regime in regimes:
+            started, hits_before = time.perf_counter(), store.stats.hits
+            for offset in range(0, len(amounts), chunk_size):
+                store.resolve_many(function, engine, amounts[offset:offset + chunk_size], regime)
+            report.append((function, regime, len(amounts), store.stats.hits - hits_before,
+                           time.perf_counter() - started))
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for the store commands."""
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.store",
+        description="Warm and inspect a persistent result store."
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    warm_command = commands.add_parser("warm", help="Store results for every amount of a grid")
+    warm_command.add_argument("path", help="Store database file")
+    warm_command.add_argument("--start", type=Decimal, default=Decimal('1'), help="First amount in lakhs")
+    warm_command.add_argument("--stop", type=Decimal, default=Decimal('200'), help="Last amount in lakhs")
+    warm_command.add_argument("--step-rupees", type=Decimal, default=Decimal('1000'), help="Grid spacing")
+    warm_command.add_argument("--function", action="append",
+                              choices=[function.value for function in StoredFunction],
+                              help="Calculation to warm (repeatable; default: net_salary and "
+                                   "freelancer_tax). gross_for_take_home reads the amounts as monthly "
+                                   "take-home targets")
+    warm_command.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                              help="Only warm this regime")
+    warm_command.add_argument("--assessment-year",
+                              help="Use the shipped rules of this assessment year, e.g. 2025-26")
+    warm_command.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 2 ** 20,
+                              help="Evict least recently used rows beyond this size")
+
+    stats_command = commands.add_parser("stats", help="Show stored rows per function and regime")
+    stats_command.add_argument("path", help="Store database file")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m calculator.store``."""
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "stats":
+            if not os.path.exists(args.path):
+                raise ValueError(f"No store at {args.path}")
+            with ResultStore(args.path, max_bytes=None) as store:
+                for (function, regime), count in store.counts().items():
+                    print(f"{function:<22} {regime:<5} {count:>12,}")
+                print(f"{len(store):,} rows, {store.stats.size / 2 ** 20:.1f} MB")
+            return 0
+
+        engine = TaxEngine(cache_size=0)
+        if args.assessment_year:
+            engine = engine_for(normalise_assessment_year(args.assessment_year))
+        amounts = grid_amounts(args.start, args.stop, args.step_rupees)
+        functions = [StoredFunction(name) for name in args.function or ("net_salary", "freelancer_tax")]
+        regimes = [TaxRegime(args.regime)] if args.regime else list(TaxRegime)
+        with ResultStore(args.path, max_bytes=int(args.max_mb * 2 ** 20)) as store:
+            print(f"{'Function':<22} {'Regime':<7} {'Amounts':>10} {'Hits':>10} {'Hit rate':>9} "
+                  f"{'Seconds':>9}")
+            for function, regime, looked_up, hits, seconds in warm(store, engine, amounts, functions,
+                                                                    regimes):
+                print(f"{function.value:<22} {regime.value:<7} {looked_up:>10,} {hits:>10,} "
+                      f"{hits / looked_up if looked_up else 0:>9.1%} {seconds:>9.2f}")
+            stats = store.stats
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    print(f"✅ Store holds {stats.size / 2 ** 20:.1f} MB; {stats.evictions:,} rows evicted; "
+          f"overall hit rate {stats.hit_rate:.1%}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+"""
+Salary structure optimizer.
+
+``TaxEngine`` splits every gross salary with one ``SalaryStructure``
+(basic 50% of gross, HRA 40% and PF 12% of basic). ``StructureOptimizer``
+instead chooses, per offer, the split within a ``StructurePolicy`` that
+maximizes the annual net salary, and reports the gain over the engine's
+structure.
+
+Search:
+    For a basic salary ``b`` the HRA exemption ``x`` and employee PF ``y``
+    (matched by the employer) give a taxable income of
+    ``gross - standard deduction - x - min(y, 80C limit)`` in the old
+    regime, and a net salary of ``gross - 2y - tax``. Tax never falls as
+    taxable income grows, so ``x`` is always the largest HRA allowed. Net
+    salary is then piecewise linear over the ``(b, y)`` policy polygon,
+    with kinks and the 87A jump where taxable income crosses a tax piece
+    start or ``y`` crosses the 80C limit, so its maximum lies on a vertex
+    of those lines. Only the basic salaries of those vertices are tried
+    (a handful per offer instead of a grid scan), and for each the PF
+    amounts at the ends of its linear pieces. While no slab rate with
+    cess exceeds 2 (PF costs twice what it saves in tax), only the
+    smallest PF and the PF just reaching the 87A rebate can win.
+
+Amounts are whole paise, so a ratio bound can be missed by under a paisa.
+
+Usage:
+    python -m calculator.structure --regime old --output optimal.csv offers.csv
+    python -m calculator.structure --basic 0.4:0.6 --hra 0.4:0.5 --pf 0.12 --workers 8 offers.csv
+"""
+import argparse
+import csv
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from itertools import islice
+from math import ceil, floor
+
+from calculator.batch import BatchStats, MalformedRow, _detect_format, read_rows
+from calculator.engine import SalaryStructure, TaxEngine, TaxRegime
+from calculator.money import PAISE_PER_LAKH, format_rupees, lakhs_to_paise, parse_amount_lakhs, to_paise
+from calculator.results import NetSalaryResult
+from calculator.rulesets import engine_for, normalise_assessment_year
+
+CHUNK_ROWS = 5_000
+RATIO_PLACES = 4
+
+
+@dataclass(frozen=True, slots=True)
+class StructurePolicy:
+    """Inclusive ``(low, high)`` bounds the optimizer may choose each ``SalaryStructure`` ratio within."""
+
+    basic_salary_ratio: tuple[Decimal, Decimal] = (Decimal('0.4'), Decimal('0.6'))
+    hra_ratio: tuple[Decimal, Decimal] = (Decimal('0.4'), Decimal('0.5'))
+    pf_ratio: tuple[Decimal, Decimal] = (Decimal('0.12'), Decimal('0.12'))
+
+    def __post_init__(self) -> None:
+        for name in ("basic_salary_ratio", "hra_ratio", "pf_ratio"):
+            low, high = getattr(self, name)
+            if not 0 <= low <= high:
+                raise ValueError(f"{name} bounds must satisfy 0 <= low <= high")
+        if self.basic_salary_ratio[1] > 1:
+            raise ValueError("basic_salary_ratio cannot exceed 1")
+
+
+DEFAULT_POLICY = StructurePolicy()
+
+
+@dataclass(frozen=True, slots=True)
+class StructureOptimum:
+    """Best split of one offer; amounts are annual, in paise."""
+
+    gross_salary_paise: int
+    regime: TaxRegime
+    basic_salary_paise: int
+    hra_paise: int
+    employee_pf_paise: int
+    net_salary_paise: int
+    # Net salary under the engine's own structure
+    default_net_salary_paise: int
+
+    @property
+    def gain_paise(self) -> int:
+        """ :return net salary gained over the engine's structure """
+        return self.net_salary_paise - self.default_net_salary_paise
+
+    @property
+    def structure(self) -> SalaryStructure:
+        """ :return ratios of the split, rounded to ``RATIO_PLACES`` for display """
+        basic = Decimal(self.basic_salary_paise)
+        return SalaryStructure(
+            round(basic / self.gross_salary_paise, RATIO_PLACES) if self.gross_salary_paise else Decimal(0),
+            round(self.hra_paise / basic, RATIO_PLACES) if basic else Decimal(0),
+            round(self.employee_pf_paise / basic, RATIO_PLACES) if basic else Decimal(0),
+        )
+
+
+def _floor(amount: int, ratio: Fraction) -> int:
+    """ :return amount * ratio rounded down """
+    return amount * ratio.numerator // ratio.denominator
+
+
+def _ceil(amount: int, ratio: Fraction) -> int:
+    """ :return amount * ratio rounded up """
+    return -(-amount * ratio.numerator // ratio.denominator)
+
+
+class _RegimeTerms:
+    """Deduction limits and tax piece starts of one regime, in paise."""
+
+    __slots__ = ("deductible", "standard_deduction", "section_80c_limit", "rebate_target", "targets",
+                 "pf_kinks")
+
+    def __init__(self, engine: TaxEngine, regime: TaxRegime) -> None:
+        rules = engine.rules[regime]
+        table = engine.tax_slabs[regime].compiled
+        # Mirrors TaxEngine._salary_deductions: only the old regime exempts HRA and allows 80C
+        self.deductible = regime == TaxRegime.OLD
+        self.standard_deduction = to_paise(rules.standard_deduction)
+        self.section_80c_limit = to_paise(rules.section_80c_limit)
+        # Tax is zero strictly below the 87A limit, so the rebate needs taxable income one paisa under it
+        self.rebate_target = to_paise(rules.rebate_87a_limit) - 1
+        # Highest taxable income of every linear tax piece: 87A, then each slab edge above it
+        self.targets = (self.rebate_target, *(to_paise(bound) for bound in table.lower_bounds
+                                              if bound > rules.rebate_87a_limit))
+        # Raising PF costs 2 per rupee; it only pays to push taxable income down a piece above that rate
+        self.pf_kinks = max(table.rates) * (1 + engine.cess_percentage) > 2
+
+
+class StructureOptimizer:
+    """Per-offer salary structure search over a policy, for one engine's slabs, cess and deductions."""
+
+    def __init__(self, engine: TaxEngine, policy: StructurePolicy = DEFAULT_POLICY) -> None:
+        """
+        Args:
+            engine: Tax rules to optimize under; its structure is the baseline for the gain
+            policy: Bounds of every ratio
+        """
+        self.engine = engine
+        self.policy = policy
+        self._basic_bounds = tuple(map(Fraction, policy.basic_salary_ratio))
+        self._hra_high = Fraction(policy.hra_ratio[1])
+        self._pf_low, self._pf_high = map(Fraction, policy.pf_ratio)
+        self._default_basic = Fraction(engine.structure.basic_salary_ratio)
+        self._terms = {regime: _RegimeTerms(engine, regime) for regime in engine.tax_slabs}
+        # Lines HRA + PF = reducible income, with PF at either bound: (PF ratio, its rounding, slope)
+        self._pf_lines = [(ratio, pf_at, self._hra_high + ratio) for ratio, pf_at
+                          in ((self._pf_low, _ceil), (self._pf_high, _floor)) if self._hra_high + ratio]
+        # Basic salaries at which either PF bound reaches the 80C limit
+        self._limit_vertices = {
+            regime: sorted({rounding(terms.section_80c_limit / ratio) for ratio in (self._pf_low, self._pf_high)
+                            if ratio for rounding in (floor, ceil)})
+            for regime, terms in self._terms.items()
+        }
+
+    def _basic_candidates(self, gross: int, regime: TaxRegime, terms: _RegimeTerms) -> list[int]:
+        """ :return basic salaries in paise worth trying: the policy ends and every vertex's neighbours """
+        low, high = _ceil(gross, self._basic_bounds[0]), _floor(gross, self._basic_bounds[1])
+        low = min(low, high)
+        candidates = [min(max(_floor(gross, self._default_basic), low), high), low, high]
+        if not terms.deductible:
+            return candidates
+
+        # Integer arithmetic throughout: Fraction operations would dominate the search
+        candidates += self._limit_vertices[regime]
+        hra, limit = self._hra_high, terms.section_80c_limit
+        for target in terms.targets:
+            # HRA plus PF, or HRA alone once 80C is capped, bring taxable income down to a tax piece end
+            reducible = gross - terms.standard_deduction - target
+            if hra:
+                candidates += [(reducible - limit) * hra.denominator // hra.numerator,
+                               -((limit - reducible) * hra.denominator // hra.numerator)]
+            for ratio, pf_at, slope in self._pf_lines:
+                scaled = reducible * slope.denominator
+                if not low * slope.numerator <= scaled <= high * slope.numerator:
+                    continue
+                basic = -(-scaled // slope.numerator)
+                candidates.append(basic - 1)
+                # Whole-paise HRA and PF can fall a paisa or two short of the line; step onto it
+                for _ in range(4):
+                    if basic >= high or _floor(basic, hra) + pf_at(basic, ratio) >= reducible:
+                        break
+                    basic += 1
+                candidates.append(basic)
+        return [basic for basic in candidates if low <= basic <= high]
+
+    def _pf_candidates(self, gross: int, basic: int, hra: int, terms: _RegimeTerms) -> set[int]:
+        """ :return employee PF amounts worth trying for one basic salary """
+        low, high = _ceil(basic, self._pf_low), _floor(basic, self._pf_high)
+        low = min(low, high)
+        candidates = {low}
+        if not terms.deductible:
+            return candidates
+        reachable = min(high, terms.section_80c_limit)
+        targets = terms.targets if terms.pf_kinks else (terms.rebate_target,)
+        for target in targets:
+            needed = gross - terms.standard_deduction - hra - target
+            if low < needed <= reachable:
+                candidates.add(needed)
+        if terms.pf_kinks:
+            candidates.add(max(low, reachable))
+            candidates.add(high)
+        return candidates
+
+    def optimize(self, gross_salary_paise: int, regime: TaxRegime) -> StructureOptimum:
+        """
+        Find the split with the highest net salary for one offer.
+
+        Args:
+            gross_salary_paise: Annual gross salary in paise
+            regime: Tax regime to use
+
+        Returns:
+            Best split found; among equally good splits the one nearest the
+            engine's basic salary ratio wins
+        """
+        gross = gross_salary_paise
+        terms = self._terms[regime]
+        tax = self.engine.paise.calculate_tax
+        best: tuple[int, int, int, int] | None = None
+        tried: set[int] = set()
+        for basic in self._basic_candidates(gross, regime, terms):
+            if basic in tried:
+                continue
+            tried.add(basic)
+            hra = _floor(basic, self._hra_high)
+            for pf in self._pf_candidates(gross, basic, hra, terms):
+                deductions = terms.standard_deduction
+                if terms.deductible:
+                    deductions += hra + min(pf, terms.section_80c_limit)
+                net = gross - 2 * pf - tax(gross - deductions, regime)
+                if best is None or net > best[0]:
+                    best = net, basic, hra, pf
+
+        net, basic, hra, pf = best
+        default = self.engine.paise.calculate_net_salary(gross, regime)["net_salary"]
+        return StructureOptimum(gross, regime, basic, hra, pf, net, default)
+
+    def optimize_batch(self, offers: Iterable[tuple[int, TaxRegime]]) -> list[StructureOptimum]:
+        """ :return ``optimize`` result of every ``(gross_salary_paise, regime)`` offer, in order """
+        return [self.optimize(gross, regime) for gross, regime in offers]
+
+    def result(self, optimum: StructureOptimum) -> NetSalaryResult:
+        """ :return ``calculate_net_salary``-style record of an optimum, computed by the ``Decimal`` engine """
+        return self.engine.calculate_net_salary_for_split(
+            Decimal(optimum.gross_salary_paise) / PAISE_PER_LAKH, Decimal(optimum.basic_salary_paise) / 100,
+            Decimal(optimum.hra_paise) / 100, Decimal(optimum.employee_pf_paise) / 100, optimum.regime
+        )
+
+
+# Optimizer owned by each worker process, created by the pool initializer
+_worker_optimizer: StructureOptimizer | None = None
+
+
+def _init_worker(assessment_year: str | None, policy: StructurePolicy) -> None:
+    """Create the per-process optimizer."""
+    global _worker_optimizer
+    engine = engine_for(assessment_year) if assessment_year else TaxEngine(cache_size=0)
+    _worker_optimizer = StructureOptimizer(engine, policy)
+
+
+def _optimize_chunk(offers: list[tuple[int, TaxRegime]]) -> list[StructureOptimum]:
+    """Optimize a chunk of offers in a worker process."""
+    return _worker_optimizer.optimize_batch(offers)
+
+
+def optimize_offers(
+        offers: Iterable[tuple[int, TaxRegime]],
+        policy: StructurePolicy = DEFAULT_POLICY,
+        workers: int = 1,
+        assessment_year: str | None = None,
+        chunk_rows: int = CHUNK_ROWS
+) -> Iterator[StructureOptimum]:
+    """
+    Optimize many offers, in input order.
+
+    Args:
+        offers: ``(gross_salary_paise, regime)`` pairs
+        policy: Bounds of every ratio
+        workers: Worker processes; above 1 chunks of offers are optimized in parallel
+        assessment_year: Optimize under the shipped rules of this year instead of the defaults
+        chunk_rows: Offers per worker task
+
+    Yields:
+        One ``StructureOptimum`` per offer
+    """
+    offers = iter(offers)
+    if workers <= 1:
+        _init_worker(assessment_year, policy)
+        while chunk := list(islice(offers, chunk_rows)):
+            yield from _optimize_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(assessment_year, policy)) as pool:
+        # A bounded window of chunks in flight keeps memory flat on long inputs
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers and (chunk := list(islice(offers, chunk_rows))):
+                pending.append(pool.submit(_optimize_chunk, chunk))
+            if not pending:
+                break
+            yield from pending.popleft().result()
+
+
+def parse_offer(row: dict, default_regime: TaxRegime) -> tuple[int, TaxRegime]:
+    """
+    Read one offer row.
+
+    Returns:
+        Gross salary in paise and the row's regime (``default_regime`` when it names none)
+
+    Raises:
+        ValueError: If the row could not be read, or its gross salary or regime is invalid
+        KeyError: If the row has no ``gross_salary_lakhs`` column
+    """
+    if isinstance(row, MalformedRow):
+        raise ValueError(row.error)
+    gross = lakhs_to_paise(parse_amount_lakhs(row["gross_salary_lakhs"]))
+    return gross, TaxRegime(str(row["regime"]).strip().lower()) if row.get("regime") else default_regime
+
+
+def _parse_bounds(text: str) -> tuple[Decimal, Decimal]:
+    """ :return ``(low, high)`` from "LOW:HIGH", or a fixed "VALUE" """
+    low, _, high = text.partition(":")
+    try:
+        return Decimal(low), Decimal(high or low)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"invalid bounds '{text}', expected LOW:HIGH or VALUE") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for the structure optimizer."""
+    parser = argparse.ArgumentParser(
+        prog="python -m calculator.structure",
+        description="Find the take-home maximizing basic/HRA/PF split for every offer of a CSV or JSONL file."
+    )
+    parser.add_argument("input", help="Offers with gross_salary_lakhs and optional id and regime columns")
+    parser.add_argument("-o", "--output", default="-", help="Output CSV file ('-' for stdout)")
+    parser.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                        default=TaxRegime.OLD.value, help="Default tax regime")
+    parser.add_argument("--assessment-year",
+                        help="Use the shipped rules of this assessment year, e.g. 2025-26")
+    parser.add_argument("--basic", type=_parse_bounds, default=DEFAULT_POLICY.basic_salary_ratio,
+                        help="Basic salary as a share of gross, LOW:HIGH (default 0.4:0.6)")
+    parser.add_argument("--hra", type=_parse_bounds, default=DEFAULT_POLICY.hra_ratio,
+                        help="HRA as a share of basic, LOW:HIGH (default 0.4:0.5)")
+    parser.add_argument("--pf", type=_parse_bounds, default=DEFAULT_POLICY.pf_ratio,
+                        help="Employee PF as a share of basic, LOW:HIGH (default 0.12)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m calculator.structure``."""
+    args = build_parser().parse_args(argv)
+    regime = TaxRegime(args.regime)
+    try:
+        policy = StructurePolicy(args.basic, args.hra, args.pf)
+        if args.assessment_year:
+            args.assessment_year = normalise_assessment_year(args.assessment_year)
+            engine_for(args.assessment_year)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    stats = BatchStats()
+    ids: deque = deque()
+    offers: list[tuple[int, TaxRegime]] = []
+    try:
+        with open(args.input, newline="", encoding="utf-8") as source:
+            for row_number, row in enumerate(read_rows(source, _detect_format(args.input)), start=1):
+                try:
+                    offers.append(parse_offer(row, regime))
+                except (KeyError, ValueError) as e:
+                    stats.skipped += 1
+                    print(f"Row {row_number}: invalid offer ({e})", file=sys.stderr)
+                    continue
+                ids.append(row.get("id"))
+    except OSError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    total_gain = 0
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.writer(sink)
+        writer.writerow(["id", "regime", "gross_salary", "basic_salary_ratio", "hra_ratio", "pf_ratio",
+                         "basic_salary", "hra", "employee_pf", "net_salary", "default_net_salary", "gain"])
+        for optimum in optimize_offers(offers, policy, args.workers, args.assessment_year):
+            structure = optimum.structure
+            writer.writerow([
+                ids.popleft(), optimum.regime.value, format_rupees(optimum.gross_salary_paise),
+                structure.basic_salary_ratio, structure.hra_ratio, structure.pf_ratio,
+                *map(format_rupees, (optimum.basic_salary_paise, optimum.hra_paise, optimum.employee_pf_paise,
+                                     optimum.net_salary_paise, optimum.default_net_salary_paise,
+                                     optimum.gain_paise)),
+            ])
+            total_gain += optimum.gain_paise
+            stats.rows += 1
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    stats.elapsed_seconds = time.perf_counter() - started
+
+    print(f"Optimized {stats.rows} offers ({stats.skipped} skipped) in {stats.elapsed_seconds:.2f}s — "
+          f"{stats.rows_per_second:,.0f} offers/sec, total gain ₹{format_rupees(total_gain)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so enums match the ones used by worker processes
+    from calculator import structure
+    sys.exit(structure.main())
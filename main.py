@@ -1,10 +1,163 @@
-from menus.main_menu import MainMenu
+"""
+Command-line entry point.
 
+Without a command the interactive menus start. A command runs a single
+calculation and exits, without loading the menus:
 
-def main():
-    app = MainMenu()
+    python main.py net --regime new 12.5
+    python main.py gross --regime old 1.2
+    python main.py freelancer 30 --json
+    python main.py compare 18 --assessment-year 2025-26
+
+Only ``calculator.engine`` is imported for a command; the menus, the
+session wrapper and the rule set loader are imported when first needed.
+
+``--profile`` prints a cProfile summary of the session to stderr and
+``--metrics FILE`` writes per-call engine metrics when it ends (Prometheus
+text for ``.prom`` files, JSON otherwise).
+"""
+import argparse
+import json
+import sys
+from decimal import Decimal
+
+from calculator.engine import NumericBackend, TaxEngine, TaxRegime
+from calculator.money import parse_amount_lakhs
+
+
+def _lakhs(value: str) -> Decimal:
+    """Parse a non-negative amount in lakhs, up to ``MAX_AMOUNT_LAKHS``, for argparse."""
+    try:
+        return parse_amount_lakhs(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _engine(assessment_year: str | None) -> TaxEngine:
+    """ :return engine of the assessment year's rule set, or the built-in rules without one """
+    if not assessment_year:
+        return TaxEngine(cache_size=0)
+    from calculator.rulesets import engine_for, normalise_assessment_year
+    return engine_for(normalise_assessment_year(assessment_year))
+
+
+def _run_command(args: argparse.Namespace) -> dict:
+    """Compute the one-shot command's result as a flat dictionary."""
+    engine = _engine(getattr(args, "assessment_year", None))
+    if args.command == "net":
+        return dict(engine.calculate_net_salary(args.amount, TaxRegime(args.regime)))
+    if args.command == "gross":
+        return dict(engine.find_gross_salary_for_target_take_home(args.amount, TaxRegime(args.regime)))
+    if args.command == "freelancer":
+        return dict(engine.calculate_freelancer_tax(args.amount, TaxRegime(args.regime)))
+
+    comparison = engine.compare_regimes(args.amount)
+    result = {
+        "gross_salary_lakhs": comparison.gross_salary_lakhs,
+        "best_regime": comparison.best_regime.value,
+        "delta_lakhs": comparison.delta_lakhs,
+        "breakeven_gross_lakhs": comparison.breakeven_gross_lakhs,
+    }
+    for compared, breakdown in comparison.breakdowns.items():
+        result[f"{compared.value}_net_salary_lakhs"] = breakdown.net_salary_lakhs
+        result[f"{compared.value}_tax_lakhs"] = breakdown.tax_lakhs
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser for the menus and the one-shot commands."""
+    # Accepted before or after the command; suppressed so a command does not overwrite it with a default
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--assessment-year", default=argparse.SUPPRESS,
+                        help="Use the shipped rules of this assessment year, e.g. 2025-26")
+    common.add_argument("--profile", action="store_true", default=argparse.SUPPRESS,
+                        help="Print a cProfile summary of the session to stderr")
+    common.add_argument("--metrics", metavar="FILE", default=argparse.SUPPRESS,
+                        help="Write engine call metrics on exit (.prom for Prometheus text, else JSON)")
+
+    parser = argparse.ArgumentParser(description="Indian Income Tax Calculator", parents=[common])
+    parser.add_argument("--backend", choices=[backend.value for backend in NumericBackend],
+                        default=NumericBackend.DECIMAL.value,
+                        help="Arithmetic backend of the menus: exact Decimal or integer paise")
+
+    commands = parser.add_subparsers(dest="command", metavar="command",
+                                     help="Run one calculation and exit instead of starting the menus")
+    for name, amount_help, description in (
+            ("net", "Gross annual salary in lakhs", "Net salary for a gross annual salary"),
+            ("gross", "Target monthly take-home in lakhs", "Gross salary for a monthly take-home"),
+            ("freelancer", "Gross annual receipts in lakhs", "Freelancer tax under Section 44ADA"),
+            ("compare", "Gross annual salary in lakhs", "Compare the old and new regimes"),
+    ):
+        command = commands.add_parser(name, parents=[common], help=description, description=description)
+        command.add_argument("amount", type=_lakhs, help=amount_help)
+        if name != "compare":
+            command.add_argument("--regime", choices=[regime.value for regime in TaxRegime],
+                                 default=TaxRegime.OLD.value)
+        command.add_argument("--json", action="store_true", help="Print the result as a JSON object")
+    return parser
+
+
+def _run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Run a one-shot command, or the interactive menus when none is given."""
+    if args.command is not None:
+        try:
+            result = _run_command(args)
+        except (ValueError, ArithmeticError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        if args.json:
+            print(json.dumps(result, default=str))
+        else:
+            for field, value in result.items():
+                print(f"{field}: {'' if value is None else value}")
+        return 0
+
+    assessment_year = getattr(args, "assessment_year", None)
+    if assessment_year:
+        from calculator.rulesets import RuleSetError, engine_for, normalise_assessment_year
+        try:
+            assessment_year = normalise_assessment_year(assessment_year)
+            engine_for(assessment_year)
+        except RuleSetError as e:
+            parser.error(str(e))
+
+    from menus.main_menu import MainMenu
+    app = MainMenu(NumericBackend(args.backend), assessment_year)
     app.run()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse the command line and run the session, profiled or instrumented on request."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    profile, metrics_path = getattr(args, "profile", False), getattr(args, "metrics", None)
+    if not profile and not metrics_path:
+        return _run(args, parser)
+
+    recorder = profiler = None
+    if metrics_path:
+        from calculator.instrumentation import MetricsRecorder, add_hook
+        recorder = MetricsRecorder()
+        add_hook(recorder)
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        return _run(args, parser)
+    finally:
+        # The menus leave through sys.exit, so report in finally
+        if profiler is not None:
+            import pstats
+            profiler.disable()
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+        if recorder is not None:
+            if metrics_path.endswith(".prom"):
+                recorder.write_prometheus(metrics_path)
+            else:
+                recorder.write_json(metrics_path)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,13 @@
+from decimal import Decimal
+
+from calculator.money import paise_to_lakhs
+
+
+def lakhs_view(result_paise: dict[str, int]) -> dict[str, Decimal]:
+    """
+    Convert an integer-paise result to the lakhs mapping the menus display.
+
+    Keys gain the ``_lakhs`` suffix used by the ``Decimal`` calculator so the
+    display code is shared by both numeric backends.
+    """
+    return {f"{key}_lakhs": paise_to_lakhs(amount) for key, amount in result_paise.items()}
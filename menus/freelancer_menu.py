@@ -1,6 +1,9 @@
+from collections.abc import Mapping
 from decimal import Decimal
 from typing import Any
-from calculator.income_tax_calculator import IncomeTaxCalculator
+from calculator.income_tax_calculator import IncomeTaxCalculator, NumericBackend
+from calculator.money import lakhs_to_paise
+from menus.display import lakhs_view
 
 
 class FreelancerMenu:
@@ -47,6 +50,15 @@ class FreelancerMenu:
         print("• Applicable for gross receipts up to ₹75 lakhs")
         print("• Professional services like consultancy, freelancing etc.")
 
+    def _freelancer_tax(self, gross_receipts_lakhs: float) -> Mapping[str, Any]:
+        """Calculate freelancer tax with the selected backend, converting to lakhs for display."""
+        if self.calculator.backend == NumericBackend.PAISE:
+            receipts_paise = lakhs_to_paise(gross_receipts_lakhs)
+            return lakhs_view(
+                self.calculator.paise.calculate_freelancer_tax(receipts_paise, self.calculator.current_regime)
+            )
+        return self.calculator.calculate_freelancer_tax(gross_receipts_lakhs)
+
     def _format_result_row(self, key: str, value: Any) -> str:
         """Format a single result row."""
         key_display = key.replace('_', ' ').title()
@@ -54,7 +66,7 @@ class FreelancerMenu:
             return f"{key_display:<30}: {self._format_currency(value)} Lakhs"
         return f"{key_display:<30}: {value}"
 
-    def _display_results(self, result: dict) -> None:
+    def _display_results(self, result: Mapping[str, Any]) -> None:
         """Display calculation results in a formatted manner."""
         self._print_section_header("Income & Tax Breakdown")
 
@@ -83,7 +95,7 @@ class FreelancerMenu:
 
             # Get input and calculate
             gross_receipts_lakhs = self._get_validated_input()
-            result = self.calculator.calculate_freelancer_tax(gross_receipts_lakhs)
+            result = self._freelancer_tax(gross_receipts_lakhs)
 
             # Display results
             self._display_results(result)
@@ -1,9 +1,9 @@
 from enum import Enum, auto
 import sys
 from typing import NoReturn
-from menus.salary_menu import SalaryMenu
-from menus.freelancer_menu import FreelancerMenu
-from calculator.income_tax_calculator import IncomeTaxCalculator, TaxRegime
+from calculator.income_tax_calculator import IncomeTaxCalculator, NumericBackend, TaxRegime
+
+# Submenus are imported by their handlers, so startup only loads the ones the user opens
 
 
 class MenuChoice(Enum):
@@ -11,6 +11,7 @@ class MenuChoice(Enum):
     NET_SALARY = auto()
     FIND_GROSS = auto()
     FREELANCER = auto()
+    COMPARE_REGIMES = auto()
     CHANGE_REGIME = auto()
     EXIT = auto()
 
@@ -25,12 +26,18 @@ class RegimeChoice(Enum):
 class MainMenu:
     """Main menu handler for the Indian Income Tax Calculator."""
 
-    def __init__(self) -> None:
-        self.calculator = IncomeTaxCalculator()
+    def __init__(
+            self,
+            backend: NumericBackend = NumericBackend.DECIMAL,
+            assessment_year: str | None = None
+    ) -> None:
+        self.calculator = IncomeTaxCalculator(backend=backend)
+        self.calculator.assessment_year = assessment_year
         self._menu_handlers = {
             MenuChoice.NET_SALARY: self._handle_net_salary,
             MenuChoice.FIND_GROSS: self._handle_find_gross,
             MenuChoice.FREELANCER: self._handle_freelancer,
+            MenuChoice.COMPARE_REGIMES: self._handle_compare_regimes,
             MenuChoice.CHANGE_REGIME: self._handle_regime_change,
             MenuChoice.EXIT: self._handle_exit
         }
@@ -53,25 +60,35 @@ class MainMenu:
     def display_main_menu(self) -> None:
         """Display the main options menu."""
         current_regime = self.calculator.current_regime.value.title()
-        self._print_decorated(f"🏦 {current_regime} Tax Regime Options 💼")
+        year = f" (AY {self.calculator.assessment_year})" if self.calculator.assessment_year else ""
+        self._print_decorated(f"🏦 {current_regime} Tax Regime Options{year} 💼")
         print("\n1. Calculate Net Salary")
         print("2. Find Gross Salary for Target Take-Home")
         print("3. Calculate Freelancer Tax (Section 44ADA)")
-        print("4. Change Tax Regime")
-        print("5. Exit")
+        print("4. Compare Old vs New Regime")
+        print("5. Change Tax Regime")
+        print("6. Exit")
 
     def _handle_net_salary(self) -> None:
         """Handle net salary calculation menu."""
+        from menus.salary_menu import SalaryMenu
         SalaryMenu(self.calculator).calculate_net_salary_menu()
 
     def _handle_find_gross(self) -> None:
         """Handle gross salary calculation menu."""
+        from menus.salary_menu import SalaryMenu
         SalaryMenu(self.calculator).find_gross_salary_menu()
 
     def _handle_freelancer(self) -> None:
         """Handle freelancer tax calculation menu."""
+        from menus.freelancer_menu import FreelancerMenu
         FreelancerMenu(self.calculator).calculate_freelancer_tax_menu()
 
+    def _handle_compare_regimes(self) -> None:
+        """Handle regime comparison menu."""
+        from menus.salary_menu import SalaryMenu
+        SalaryMenu(self.calculator).compare_regimes_menu()
+
     def _handle_regime_change(self) -> None:
         """Handle tax regime change."""
         print("\n🔄 Change Tax Regime")
@@ -152,7 +169,7 @@ class MainMenu:
                 # Main menu loop
                 while True:
                     self.display_main_menu()
-                    menu_choice = self._get_user_choice(5)
+                    menu_choice = self._get_user_choice(6)
                     if not self._process_menu_choice(menu_choice):
                         break
 
@@ -1,6 +1,9 @@
+from collections.abc import Mapping
 from decimal import Decimal
 from typing import Any, Callable
-from calculator.income_tax_calculator import IncomeTaxCalculator
+from calculator.income_tax_calculator import IncomeTaxCalculator, NumericBackend, RegimeComparison, TaxRegime
+from calculator.money import lakhs_to_paise, paise_to_lakhs, to_paise
+from menus.display import lakhs_view
 
 
 class SalaryMenu:
@@ -43,7 +46,26 @@ class SalaryMenu:
             return f"{key_display:<30}: {self._format_currency(value)} Lakhs"
         return f"{key_display:<30}: {value}"
 
-    def _display_results(self, result: dict, show_insights: Callable[[dict], None]) -> None:
+    def _net_salary(self, gross_salary_lakhs: float) -> Mapping[str, Any]:
+        """Calculate net salary with the selected backend, converting to lakhs for display."""
+        if self.calculator.backend == NumericBackend.PAISE:
+            gross_paise = lakhs_to_paise(gross_salary_lakhs)
+            return lakhs_view(self.calculator.paise.calculate_net_salary(gross_paise, self.calculator.current_regime))
+        return self.calculator.calculate_net_salary(gross_salary_lakhs)
+
+    def _gross_salary_for_target(self, target_monthly_lakhs: float) -> Mapping[str, Any]:
+        """Solve for gross salary with the selected backend, converting to lakhs for display."""
+        if self.calculator.backend == NumericBackend.PAISE:
+            solution = self.calculator.solve_gross_salary_for_target_take_home(target_monthly_lakhs)
+            gross_paise = to_paise(solution.gross_salary)
+            return lakhs_view(self.calculator.paise.calculate_net_salary(gross_paise, self.calculator.current_regime))
+        return self.calculator.find_gross_salary_for_target_take_home(target_monthly_lakhs)
+
+    def _display_results(
+            self,
+            result: Mapping[str, Any],
+            show_insights: Callable[[Mapping[str, Any]], None]
+    ) -> None:
         """Display calculation results in a formatted manner."""
         print("\n📊 Detailed Breakdown:")
         print("-" * 60)
@@ -55,7 +77,7 @@ class SalaryMenu:
         print("-" * 60)
         show_insights(result)
 
-    def _show_net_salary_insights(self, result: dict) -> None:
+    def _show_net_salary_insights(self, result: Mapping[str, Any]) -> None:
         """Display insights for net salary calculation."""
         gross = Decimal(str(result["gross_salary_lakhs"]))
         tax = Decimal(str(result["tax_lakhs"]))
@@ -69,7 +91,7 @@ class SalaryMenu:
         print(f"• Take Home Percentage: {savings_rate}%")
         print(f"• Monthly Take Home: {self._format_currency(result['monthly_take_home_lakhs'])} Lakhs")
 
-    def _show_gross_salary_insights(self, result: dict) -> None:
+    def _show_gross_salary_insights(self, result: Mapping[str, Any]) -> None:
         """Display insights for gross salary determination."""
         gross = Decimal(str(result["gross_salary_lakhs"]))
         monthly_gross = gross / Decimal('12')
@@ -98,7 +120,7 @@ class SalaryMenu:
                 max_value=1000.0
             )
 
-            result = self.calculator.calculate_net_salary(gross_salary_lakhs)
+            result = self._net_salary(gross_salary_lakhs)
             self._display_results(result, self._show_net_salary_insights)
 
         except Exception as e:
@@ -124,9 +146,72 @@ class SalaryMenu:
             )
 
             print("\n⏳ Calculating required gross salary...")
-            result = self.calculator.find_gross_salary_for_target_take_home(target_monthly_lakhs)
+            result = self._gross_salary_for_target(target_monthly_lakhs)
             self._display_results(result, self._show_gross_salary_insights)
 
         except Exception as e:
             print(f"\n❌ An error occurred: {str(e)}")
-            print("Please try again or contact support if the issue persists.")
\ No newline at end of file
+            print("Please try again or contact support if the issue persists.")
+
+    def _display_comparison(self, comparison: RegimeComparison) -> None:
+        """Display regime breakdowns side by side."""
+        regimes = list(comparison.breakdowns)
+        print("\n📊 Regime Comparison:")
+        print("-" * 60)
+        print(f"{'':<30}" + "".join(f"{regime.value.title() + ' Regime':>15}" for regime in regimes))
+        for key in comparison.breakdowns[regimes[0]]:
+            key_display = key.replace('_lakhs', '').replace('_', ' ').title()
+            values = "".join(f"{self._format_currency(comparison.breakdowns[regime][key]):>15}"
+                             for regime in regimes)
+            print(f"{key_display:<30}{values}")
+        print("-" * 60)
+
+        print("\n📈 Key Insights:")
+        if comparison.delta_lakhs:
+            print(f"• Better Regime: {comparison.best_regime.value.title()} "
+                  f"(+{self._format_currency(comparison.delta_lakhs)} Lakhs net per year)")
+        else:
+            print("• Both regimes leave the same net salary")
+        if comparison.breakeven_gross_lakhs is not None:
+            print(f"• Nearest Breakeven Gross Salary: "
+                  f"{self._format_currency(comparison.breakeven_gross_lakhs)} Lakhs")
+        else:
+            print("• The regimes never swap places for this salary structure")
+
+    def _display_sweep(self, gross_salary_lakhs: float, points: int = 10) -> None:
+        """Show how the regimes compare on a grid up to twice the given salary."""
+        stop_lakhs = Decimal(str(gross_salary_lakhs)) * 2
+        step_rupees = max(1000, int(stop_lakhs * 100000 / points) // 1000 * 1000)
+        sweep = self.calculator.compare_regimes_sweep(step_rupees / Decimal(100000), stop_lakhs, step_rupees)
+        delta = sweep.delta_paise(TaxRegime.OLD, TaxRegime.NEW)
+
+        print("\n📉 Old minus New Net Salary Across Salaries:")
+        for gross_paise, delta_paise in zip(sweep.gross_salary_paise, delta):
+            print(f"{self._format_currency(paise_to_lakhs(gross_paise)):>12} Lakhs: "
+                  f"{self._format_currency(paise_to_lakhs(delta_paise)):>10} Lakhs")
+        if sweep.crossovers_lakhs:
+            crossovers = ", ".join(self._format_currency(point) for point in sweep.crossovers_lakhs)
+            print(f"• Crossovers in this range: {crossovers} Lakhs")
+
+    def compare_regimes_menu(self) -> None:
+        """Handle the regime comparison menu flow."""
+        try:
+            self._print_section_header("Old vs New Regime Comparison")
+
+            print("\n💡 This calculation will:")
+            print("• Compute your net salary under every regime in one pass")
+            print("• Show which regime leaves you more and by how much")
+            print("• Find the salary at which the better regime changes")
+
+            gross_salary_lakhs = self._get_validated_input(
+                "\n💰 Enter Gross Annual Salary (₹ in Lakhs): ",
+                min_value=0.1,
+                max_value=1000.0
+            )
+
+            self._display_comparison(self.calculator.compare_regimes(gross_salary_lakhs))
+            self._display_sweep(gross_salary_lakhs)
+
+        except Exception as e:
+            print(f"\n❌ An error occurred: {str(e)}")
+            print("Please try again or contact support if the issue persists.")
@@ -0,0 +1,36 @@
+"""Invalid invoice rows are skipped by ``schedule_invoices`` while ordering errors still stop the log."""
+import io
+from datetime import date
+
+import pytest
+
+from calculator.advance_tax import AdvanceTaxScheduler, Invoice, InstallmentSchedule, schedule_invoices
+from calculator.batch import RowWriter, read_rows
+
+LOG = """contractor_id,date,amount_lakhs
+A,2024-04-05,5
+B,2024-04-06,-2
+C,2024-04-07,NaN
+D,2024-04-08,1e30
+A,2024-05-05,5
+"""
+
+
+def test_negative_and_invalid_amounts_are_skipped() -> None:
+    scheduler = AdvanceTaxScheduler(schedule=InstallmentSchedule.STANDARD, fiscal_year=2024)
+    sink, errors = io.StringIO(), io.StringIO()
+
+    skipped = schedule_invoices(scheduler, read_rows(io.StringIO(LOG), "csv"), RowWriter(sink, "csv"), errors)
+
+    assert skipped == 3
+    assert scheduler.contractor_count == 1
+    assert "Invoice 2: Amount must not be negative" in errors.getvalue().splitlines()
+
+
+def test_invoice_before_settled_due_date_is_rejected() -> None:
+    scheduler = AdvanceTaxScheduler(schedule=InstallmentSchedule.STANDARD, fiscal_year=2024)
+    list(scheduler.process_log([Invoice("A", date(2024, 4, 5), 10_00_000_00),
+                                Invoice("A", date(2024, 7, 1), 10_00_000_00)]))
+
+    with pytest.raises(ValueError, match="was settled"):
+        scheduler.apply(Invoice("A", date(2024, 6, 1), 1))
@@ -0,0 +1,26 @@
+"""``python -m calculator.aggregate`` reports invalid rows by number instead of failing with a traceback."""
+import pytest
+
+from calculator.aggregate import main, read_distribution
+
+
+@pytest.mark.parametrize(("rows", "message"), [
+    ("gross_salary_lakhs\n10\nabc\n", "row 2: Invalid amount 'abc'"),
+    ("gross_salary_lakhs\n10\n-4\n", "row 2: Amount must not be negative"),
+    ("gross_salary_lakhs,weight\n10,x\n", "row 1: invalid literal"),
+    ("salary\n10\n", "row 1: missing column 'gross_salary_lakhs'"),
+])
+def test_invalid_row_is_named(tmp_path, rows: str, message: str) -> None:
+    path = tmp_path / "population.csv"
+    path.write_text(rows, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        read_distribution(str(path), histogram=False, freelancer=False)
+
+
+def test_main_exits_with_error_instead_of_traceback(tmp_path, capsys) -> None:
+    path = tmp_path / "population.jsonl"
+    path.write_text('{"gross_salary_lakhs": 10}\n{"gross_salary_lakhs": "1e999"}\n', encoding="utf-8")
+
+    assert main([str(path)]) == 2
+    assert "row 2" in capsys.readouterr().err
@@ -0,0 +1,74 @@
+"""Batch runner: invalid rows are reported and skipped, and CSV output keeps one header per mode."""
+import csv
+import io
+import json
+
+import pytest
+
+from calculator.batch import BatchMode, process_stream
+from calculator.engine import TaxRegime
+
+GOOD_ROW = {"id": 1, "gross_salary_lakhs": "12"}
+
+
+def _run(text: str, input_format: str) -> tuple[list[dict], list[str], int, int]:
+    """ :return output rows, error lines, processed and skipped counts of one batch run """
+    sink, errors = io.StringIO(), io.StringIO()
+    stats = process_stream(io.StringIO(text), sink, BatchMode.SALARY, TaxRegime.NEW, input_format, "jsonl",
+                           errors=errors)
+    rows = [json.loads(line) for line in sink.getvalue().splitlines()]
+    return rows, errors.getvalue().splitlines(), stats.rows, stats.skipped
+
+
+@pytest.mark.parametrize(("amount", "message"), [
+    ("NaN", "Invalid amount 'NaN'"),
+    ("Infinity", "Invalid amount 'Infinity'"),
+    ("-Infinity", "Invalid amount '-Infinity'"),
+    ("1e30", "exceeds the limit"),
+    ("-3", "Amount must not be negative"),
+    ("abc", "Invalid amount 'abc'"),
+])
+def test_invalid_csv_amount_is_skipped(amount: str, message: str) -> None:
+    rows, errors, processed, skipped = _run(
+        f"id,gross_salary_lakhs\n1,12\n2,{amount}\n3,15\n", "csv")
+
+    assert [row["id"] for row in rows] == ["1", "3"]
+    assert (processed, skipped) == (2, 1)
+    assert len(errors) == 1 and errors[0].startswith("Row 2:") and message in errors[0]
+
+
+@pytest.mark.parametrize("line", [
+    "{bad json",
+    "[1, 2]",
+    json.dumps({"id": 2, "gross_salary_lakhs": 10, "regime": 5}),
+    json.dumps({"id": 2, "gross_salary_lakhs": 1e30}),
+    json.dumps({"id": 2}),
+])
+def test_invalid_jsonl_line_is_skipped(line: str) -> None:
+    text = "\n".join([json.dumps(GOOD_ROW), line, json.dumps({**GOOD_ROW, "id": 3})]) + "\n"
+
+    rows, errors, processed, skipped = _run(text, "jsonl")
+
+    assert [row["id"] for row in rows] == [1, 3]
+    assert (processed, skipped) == (2, 1)
+    assert len(errors) == 1 and errors[0].startswith("Row 2:")
+
+
+def test_regime_column_is_read_as_text() -> None:
+    rows, errors, _, _ = _run(json.dumps({**GOOD_ROW, "regime": " OLD "}) + "\n", "jsonl")
+
+    assert not errors
+    assert rows[0]["regime"] == TaxRegime.OLD.value
+
+
+def test_csv_output_keeps_optional_columns_of_later_rows() -> None:
+    rows = [GOOD_ROW, {**GOOD_ROW, "id": 2, "assessment_year": "2025-26"}, {**GOOD_ROW, "id": 3}]
+    sink, errors = io.StringIO(), io.StringIO()
+
+    stats = process_stream(io.StringIO("".join(json.dumps(row) + "\n" for row in rows)), sink, BatchMode.SALARY,
+                           TaxRegime.NEW, "jsonl", "csv", errors=errors)
+
+    assert (stats.rows, stats.skipped) == (3, 0) and not errors.getvalue()
+    output = list(csv.DictReader(io.StringIO(sink.getvalue())))
+    assert list(output[0]) == BatchMode.SALARY.output_columns
+    assert [row["assessment_year"] for row in output] == ["", "2025-26", ""]
@@ -0,0 +1,59 @@
+"""One shared ``TaxEngine`` gives every thread the same answers as a private single-threaded engine."""
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.concurrency_stress import _dispatch, build_operations
+from calculator.engine import TaxEngine
+
+THREADS = 8
+ROUNDS = 3
+
+
+@pytest.fixture
+def frequent_switches():
+    """Switch threads every few microseconds so calls interleave mid-computation."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_shared_engine_matches_single_threaded_results(frequent_switches) -> None:
+    operations = build_operations(400, seed=3)
+    reference = TaxEngine(cache_size=0)
+    reference_calls = _dispatch(reference)
+    expected = [reference_calls[name](amount, regime) for name, amount, regime in operations]
+    expected_comparisons = [reference.compare_regimes(amount) for name, amount, _ in operations
+                            if name == "net_salary"]
+
+    # Small cache: entries are evicted and recomputed while other threads read them
+    shared = TaxEngine(cache_size=16)
+    shared_calls = _dispatch(shared)
+    barrier = threading.Barrier(THREADS)
+
+    def worker(index: int) -> list[str]:
+        generator = random.Random(index)
+        order = list(range(len(operations)))
+        mismatches = []
+        barrier.wait()
+        # Every thread starts with comparisons, racing to build the shared engine's lazy curves
+        comparisons = [shared.compare_regimes(amount) for name, amount, _ in operations if name == "net_salary"]
+        if comparisons != expected_comparisons:
+            mismatches.append(f"thread {index}: compare_regimes")
+        for _ in range(ROUNDS):
+            generator.shuffle(order)
+            for position in order:
+                name, amount, regime = operations[position]
+                if shared_calls[name](amount, regime) != expected[position]:
+                    mismatches.append(f"thread {index}: {name}({amount}, {regime.value})")
+        return mismatches
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        mismatches = [mismatch for result in pool.map(worker, range(THREADS)) for mismatch in result]
+
+    assert not mismatches
+    assert shared.cache_stats.evictions > 0
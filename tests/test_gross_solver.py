@@ -0,0 +1,41 @@
+"""The analytic gross-for-take-home solver against the retained bisection search and a paise recomputation."""
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calculator.engine import SolverMethod, TaxEngine, TaxRegime
+from calculator.rulesets import available_assessment_years, engine_for
+
+# Monthly take-home targets in lakhs, from under the 87A limit to the top slab
+TARGETS = [Decimal(hundredths) / 100 for hundredths in range(10, 1000, 7)]
+# The bisection stops within 0.01 lakh and compares net salaries rounded to 0.01 lakh, so it can sit
+# up to about ₹1,000 (interval) plus ₹500 / net slope (rounding) away from the exact answer
+BISECTION_TOLERANCE_RUPEES = 2000
+# 17 halvings of 1 to 1000 lakh down to 0.01 lakh, plus the final calculate_net_salary
+BISECTION_EVALUATIONS = 18
+
+
+@pytest.mark.parametrize("assessment_year", [None, *available_assessment_years()])
+@pytest.mark.parametrize("regime", list(TaxRegime))
+def test_analytic_solver_is_minimal_and_agrees_with_bisection(assessment_year: str | None,
+                                                              regime: TaxRegime) -> None:
+    engine = engine_for(assessment_year) if assessment_year else TaxEngine(cache_size=0)
+    net_salary = engine.paise.calculate_net_salary
+
+    for target in TARGETS:
+        analytic = engine.solve_gross_salary_for_target_take_home(target, regime)
+        bisection = engine.solve_gross_salary_for_target_take_home(target, regime, SolverMethod.BISECTION)
+        target_paise = int(target * 12 * 10_000_000)
+        gross = int(analytic.gross_salary)
+
+        assert analytic.gross_salary == gross, target
+        # Smallest whole rupee reaching the target; paise rounding can lift the rupee below onto it
+        assert net_salary(gross * 100, regime)["net_salary"] >= target_paise, target
+        assert net_salary((gross - 1) * 100, regime)["net_salary"] <= target_paise, target
+        assert abs(analytic.gross_salary - bisection.gross_salary) <= BISECTION_TOLERANCE_RUPEES, target
+
+        _, lookups = engine.net_salary_curve(regime).first_integer_reaching(Fraction(target_paise, 100))
+        assert analytic.evaluations == lookups + 1, target
+        assert analytic.evaluations < bisection.evaluations == BISECTION_EVALUATIONS, target
+        assert analytic.result == engine.calculate_net_salary(analytic.gross_salary / 100_000, regime), target
@@ -0,0 +1,19 @@
+"""One-shot commands reject amounts the engine cannot represent instead of failing with a traceback."""
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("argv", [["net", "1e30"], ["net", "1e20"], ["gross", "1e25"], ["freelancer", "1e28"],
+                                  ["net", "nan"], ["compare", "--", "-5"]])
+def test_out_of_range_amount_is_a_usage_error(argv: list[str], capsys) -> None:
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(argv)
+
+    assert exit_info.value.code == 2
+    assert "argument amount" in capsys.readouterr().err
+
+
+def test_largest_amount_is_computed(capsys) -> None:
+    assert main.main(["net", "--json", "10000000"]) == 0
+    assert '"gross_salary_lakhs": "10000000' in capsys.readouterr().out
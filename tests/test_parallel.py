@@ -0,0 +1,40 @@
+"""The parallel batch runner matches a sequential run, including the row numbers of invalid rows."""
+import io
+
+from calculator.batch import DEFAULT_CHUNK_SIZE, MIN_CHUNK_SIZE, BatchMode, process_stream
+from calculator.engine import TaxRegime
+from calculator.parallel import default_chunk_size, plan_shards, run_parallel
+
+BAD_ROWS = {3, 700, 1499}
+
+
+def test_parallel_matches_sequential_with_file_row_numbers(tmp_path) -> None:
+    path = tmp_path / "payroll.csv"
+    path.write_text("id,gross_salary_lakhs\n" + "".join(
+        f"{index},{'abc' if index in BAD_ROWS else 5 + index % 40}\n" for index in range(1500)
+    ), encoding="utf-8")
+    sequential, sequential_errors = io.StringIO(), io.StringIO()
+    with open(path, newline="", encoding="utf-8") as source:
+        process_stream(source, sequential, BatchMode.SALARY, TaxRegime.NEW, "csv", "csv",
+                       errors=sequential_errors)
+
+    parallel, parallel_errors = io.StringIO(), io.StringIO()
+    stats = run_parallel(str(path), parallel, BatchMode.SALARY, TaxRegime.NEW, "csv", "csv", workers=2,
+                         chunk_size=4096, errors=parallel_errors)
+
+    assert (stats.rows, stats.skipped) == (1500 - len(BAD_ROWS), len(BAD_ROWS))
+    assert parallel.getvalue() == sequential.getvalue()
+    assert parallel_errors.getvalue() == sequential_errors.getvalue()
+    assert parallel_errors.getvalue().splitlines()[1] == "Row 701: Invalid amount 'abc'"
+
+
+def test_default_chunk_size_gives_every_worker_several_shards(tmp_path) -> None:
+    path = tmp_path / "payroll.csv"
+    with open(path, "wb") as stream:
+        stream.truncate(150 * 2 ** 20)  # Sparse: only the size matters
+
+    chunk_size = default_chunk_size(str(path), 0, 32)
+
+    assert len(plan_shards(str(path), 0, chunk_size)) >= 4 * 32
+    assert default_chunk_size(str(path), 0, 1) == DEFAULT_CHUNK_SIZE
+    assert default_chunk_size(str(path), 149 * 2 ** 20, 64) == MIN_CHUNK_SIZE
@@ -0,0 +1,86 @@
+"""Request validation and error reporting of the HTTP service."""
+import asyncio
+import json
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+
+from calculator.server import MAX_BATCH_ITEMS, TaxService
+
+
+def _post(service: TaxService, path: str, payload: Any) -> tuple[HTTPStatus, Any]:
+    """ :return status and response body of one POST request """
+    return asyncio.run(service.dispatch("POST", path, json.dumps(payload).encode("utf-8")))
+
+
+def test_amount_above_limit_is_bad_request() -> None:
+    status, response = _post(TaxService(), "/net-salary", {"gross_salary_lakhs": "1e30"})
+
+    assert status == HTTPStatus.BAD_REQUEST
+    assert "exceeds the limit" in response["error"]
+
+
+def test_batched_request_reports_errors_per_item() -> None:
+    status, response = _post(TaxService(), "/net-salary", [
+        {"gross_salary_lakhs": 12, "regime": "new"},
+        {"gross_salary_lakhs": -1},
+        "not an object",
+        {"gross_salary_lakhs": 1e30},
+        {"gross_salary_lakhs": 15, "regime": "bogus"},
+        {"gross_salary_lakhs": 15, "regime": "old"},
+    ])
+
+    assert status == HTTPStatus.OK
+    assert [("error" in item) for item in response] == [False, True, True, True, True, False]
+    assert response[0]["gross_salary_lakhs"] == Decimal("12")
+    assert response[1]["error"] == "'gross_salary_lakhs': Amount must not be negative"
+
+
+def test_bulk_names_the_invalid_amount() -> None:
+    status, response = _post(TaxService(), "/bulk", {"amounts": [10, "NaN"]})
+
+    assert status == HTTPStatus.BAD_REQUEST
+    assert response["error"].startswith("'amounts[1]'")
+
+
+def test_unexpected_error_is_internal_server_error(capsys) -> None:
+    service = TaxService()
+
+    async def broken(_payload: Any) -> dict:
+        raise RuntimeError("boom")
+
+    service._routes[("POST", "/net-salary")] = broken
+    status, response = _post(service, "/net-salary", {"gross_salary_lakhs": 12})
+
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert response == {"error": "Internal server error"}
+    assert "RuntimeError: boom" in capsys.readouterr().err
+
+
+def test_oversized_batch_is_refused() -> None:
+    batch = [{"gross_salary_lakhs": 12}] * (MAX_BATCH_ITEMS + 1)
+
+    status, response = _post(TaxService(), "/net-salary", batch)
+
+    assert status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert "/bulk" in response["error"]
+
+
+@pytest.mark.parametrize("length", ["-5", "abc"])
+def test_invalid_content_length_is_bad_request(length: str) -> None:
+    async def exchange() -> bytes:
+        server = await asyncio.start_server(TaxService().handle_connection, "127.0.0.1", 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(f"POST /net-salary HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(exchange())
+
+    assert response.startswith(b"HTTP/1.1 400")
+    assert b"Invalid Content-Length" in response
@@ -0,0 +1,8 @@
+"""Command-line startup stays within the import-time budgets of ``benchmarks.startup``."""
+from benchmarks import startup
+
+
+def test_startup_within_budget(capsys) -> None:
+    status = startup.main(["--repeats", "3"])
+
+    assert status == 0, capsys.readouterr().out
@@ -0,0 +1,64 @@
+"""``StructureOptimizer`` against a brute-force scan of basic salaries, and the CLI's handling of bad offers."""
+from fractions import Fraction
+
+import pytest
+
+from calculator import structure
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import paise_to_lakhs
+from calculator.structure import DEFAULT_POLICY, StructureOptimizer, _ceil, _floor
+
+# Offers in rupees: below, at and above the 87A limit, on slab edges and well into the top slab
+GROSS_RUPEES = [300_000, 520_000, 675_000, 690_000, 720_000, 800_000, 1_050_000, 1_200_000, 1_575_000,
+                2_400_000, 5_000_000]
+SCAN_STEPS = 4_000
+
+
+def _scan(engine: TaxEngine, gross: int, regime: TaxRegime) -> tuple[int, int]:
+    """ :return best net salary in paise over an even grid of basic salaries, and the grid step """
+    low = _ceil(gross, Fraction(DEFAULT_POLICY.basic_salary_ratio[0]))
+    high = _floor(gross, Fraction(DEFAULT_POLICY.basic_salary_ratio[1]))
+    hra_ratio, pf_ratio = Fraction(DEFAULT_POLICY.hra_ratio[1]), Fraction(DEFAULT_POLICY.pf_ratio[0])
+    rules = engine.rules[regime]
+    standard, limit = rules.standard_deduction * 100, rules.section_80c_limit * 100
+    step = max(1, (high - low) // SCAN_STEPS)
+    best = None
+    for basic in [*range(low, high, step), high]:
+        pf = _floor(basic, pf_ratio)
+        deductions = standard + (_floor(basic, hra_ratio) + min(pf, limit) if regime == TaxRegime.OLD else 0)
+        net = gross - 2 * pf - engine.paise.calculate_tax(gross - int(deductions), regime)
+        best = net if best is None else max(best, net)
+    return best, step
+
+
+@pytest.mark.parametrize("regime", list(TaxRegime))
+def test_optimizer_matches_basic_ratio_scan(regime: TaxRegime) -> None:
+    engine = TaxEngine(cache_size=0)
+    optimizer = StructureOptimizer(engine)
+
+    for gross in (rupees * 100 for rupees in GROSS_RUPEES):
+        optimum = optimizer.optimize(gross, regime)
+        scanned, step = _scan(engine, gross, regime)
+
+        # Net salary moves by under half a paisa per paisa of basic, so the grid can trail by half a step
+        assert 0 <= optimum.net_salary_paise - scanned <= step // 2, gross
+        assert optimum.gain_paise >= 0, gross
+        assert optimizer.result(optimum)["net_salary_lakhs"] == paise_to_lakhs(optimum.net_salary_paise), gross
+
+
+def test_bad_offers_are_skipped(tmp_path, capsys) -> None:
+    offers = tmp_path / "offers.csv"
+    offers.write_text("id,gross_salary_lakhs\na,12\nb,-5\nc,NaN\nd,1e12\ne,18\n", encoding="utf-8")
+    output = tmp_path / "optimal.csv"
+
+    assert structure.main([str(offers), "--output", str(output)]) == 0
+
+    assert [line.split(",")[0] for line in output.read_text(encoding="utf-8").splitlines()] == ["id", "a", "e"]
+    errors = capsys.readouterr().err
+    assert "Row 2: invalid offer (Amount must not be negative)" in errors
+    assert "(3 skipped)" in errors
+
+
+def test_missing_input_file_is_reported(tmp_path, capsys) -> None:
+    assert structure.main([str(tmp_path / "missing.csv")]) == 2
+    assert capsys.readouterr().err.startswith("❌")
@@ -0,0 +1,36 @@
+"""Equivalence of the integer-paise ``calculate_tax_batch`` with the scalar ``Decimal`` ``calculate_tax``."""
+from decimal import Decimal
+
+import pytest
+
+from calculator.engine import TaxEngine, TaxRegime
+from calculator.money import to_paise
+from calculator.rulesets import available_assessment_years, engine_for
+
+PAISA = Decimal('0.01')
+
+
+def _edge_grid(engine: TaxEngine, regime: TaxRegime) -> list[Decimal]:
+    """ :return every paisa within ₹20 and every rupee within ₹2,000 of each slab edge and the 87A limit """
+    edges = {engine.rules[regime].rebate_87a_limit, *engine.tax_slabs[regime].compiled.lower_bounds}
+    grid: set[Decimal] = set()
+    for edge in edges:
+        grid.update(edge + PAISA * step for step in range(-2000, 2001))
+        grid.update(edge + step for step in range(-2000, 2001))
+    return sorted(income for income in grid if income >= 0)
+
+
+@pytest.mark.parametrize("assessment_year", [None, *available_assessment_years()])
+@pytest.mark.parametrize("regime", list(TaxRegime))
+def test_batch_matches_scalar_around_every_edge(assessment_year: str | None, regime: TaxRegime) -> None:
+    engine = engine_for(assessment_year) if assessment_year else TaxEngine(cache_size=0)
+    incomes = _edge_grid(engine, regime)
+    rebate_limit = engine.rules[regime].rebate_87a_limit
+    slabs = engine.tax_slabs[regime].compiled
+
+    taxes, cesses, totals = engine.calculate_tax_batch(incomes, regime)
+
+    for income, tax, cess, total in zip(incomes, taxes, cesses, totals, strict=True):
+        assert total == to_paise(engine.calculate_tax(income, regime)), income
+        assert tax == (0 if income < rebate_limit else to_paise(slabs.slab_tax(income))), income
+        assert tax + cess == total, income
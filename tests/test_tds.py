@@ -0,0 +1,37 @@
+"""Invalid payroll events are skipped by ``schedule_events`` without disturbing the rest of the year."""
+import io
+
+import pytest
+
+from calculator.batch import RowWriter, read_rows
+from calculator.tds import TdsScheduler, schedule_events
+
+HEADER = "employee_id,month,kind,amount_lakhs,regime\n"
+VALID = ["E1,1,salary,12,new\n", "E2,Apr,salary,18,old\n", "E1,5,bonus,1.5,\n", "E2,Dec,salary,20,\n"]
+
+
+def _schedule(lines: list[str]) -> tuple[TdsScheduler, int, str]:
+    """ :return scheduler after the whole log, skipped events and error output """
+    scheduler, errors = TdsScheduler(), io.StringIO()
+    rows = read_rows(io.StringIO(HEADER + "".join(lines)), "csv")
+    skipped = schedule_events(scheduler, rows, RowWriter(io.StringIO(), "csv"), errors)
+    return scheduler, skipped, errors.getvalue()
+
+
+@pytest.mark.parametrize(("bad_line", "message"), [
+    ("E1,6,bonus,-5,\n", "Amount must not be negative"),
+    ("E1,6,bonus,nan,\n", "Invalid amount 'nan'"),
+    ("E1,6,arrears,1e30,\n", "exceeds the limit"),
+    ("E1,6,bonus,abc,\n", "Invalid amount 'abc'"),
+    ("E1,6,salary,10,both\n", "is not a valid TaxRegime"),
+])
+def test_bad_row_mid_year_is_skipped(bad_line: str, message: str) -> None:
+    expected, _, _ = _schedule(VALID)
+
+    scheduler, skipped, errors = _schedule(VALID[:3] + [bad_line] + VALID[3:])
+
+    assert skipped == 1
+    assert errors.startswith("Event 4:") and message in errors
+    for employee_id in ("E1", "E2"):
+        assert scheduler.schedule(employee_id) == expected.schedule(employee_id)
+        assert all(tds >= 0 for tds in scheduler.schedule(employee_id))